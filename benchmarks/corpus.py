@@ -0,0 +1,393 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Generates synthetic Flare projects for measuring FlareLint.
+
+The generated project has the layout of a real one: topics and
+snippets under Content, Capture properties files next to their
+images, the stylesheet and table style that the topics link to, and
+TOCs, targets, and a variable set under Project.  The content is random but
+reproducible for a given seed.  A fraction of the blocks, set by
+defects, deliberately break the standard rules so that the report has
+something in it.
+
+Usage:
+
+  python benchmarks/corpus.py OUTDIR [--topics N] [--seed N] ...
+
+Run with --help for all of the options.
+
+"""
+
+import argparse
+import os
+import random
+import sys
+from xml.sax.saxutils import escape, quoteattr
+
+_MADCAP = 'http://www.madcapsoftware.com/Schemas/MadCap.xsd'
+
+_WORDS = """patient study image series report worklist viewer exam
+physician radiologist modality archive window level measure annotate
+compare prior current display monitor workstation server client
+configure select open close save print export import search filter
+sort column row preference layout protocol hanging order schedule
+result critical finding template dictation signature reading queue
+network storage retrieve query send receive route rule user role
+permission group audit log error warning status progress"""
+
+_WORDS = _WORDS.split()
+
+_NAMES = ['Workstation', 'Viewer', 'Archive', 'Portal', 'Console']
+
+# The styles that topics use.  h3 headings are defects, but still have
+# a style.
+_STYLES = """h1 { font-size: 24pt; }
+h2.Section, h3.Section { font-size: 16pt; }
+span.UI { font-weight: bold; }
+"""
+
+_TABLE_STYLE = """.TableStyle-Standard { border-collapse: collapse; }
+.TableStyle-Standard .Body-Body1 { border-bottom: 1px solid; }
+"""
+
+_VARIABLES = {'ProductName': 'Synthetic Imaging Suite', 'CompanyName': 'Example Medical'}
+
+class Options:
+    """Knobs for the size and shape of a generated project."""
+
+    def __init__(self, topics=100, snippets=10, tocs=1, targets=2, props=20,
+                 sections=4, listwidth=4, depth=2, tablerows=4, tablecols=3,
+                 languages=('en-us',), conditions=('Default.Print', 'Default.Internal'),
+                 defects=0.05, seed=1):
+        self.topics = topics
+        self.snippets = snippets
+        self.tocs = tocs
+        self.targets = targets
+        self.props = props
+        self.sections = sections
+        self.listwidth = listwidth
+        self.depth = depth
+        self.tablerows = tablerows
+        self.tablecols = tablecols
+        self.languages = list(languages)
+        self.conditions = list(conditions)
+        self.defects = defects
+        self.seed = seed
+
+class _Writer:
+    """Builds the content of one file and counts its elements."""
+
+    def __init__(self, rnd, options):
+        self.rnd = rnd
+        self.options = options
+        self.parts = []
+        self.elements = 0
+
+    def open(self, tag, attrs=None, empty=False):
+        self.elements += 1
+        text = ''.join(' {0}={1}'.format(k, quoteattr(v)) for k, v in (attrs or {}).items())
+        self.parts.append('<{0}{1}{2}>'.format(tag, text, ' /' if empty else ''))
+
+    def close(self, tag):
+        self.parts.append('</{0}>'.format(tag))
+
+    def element(self, tag, text='', attrs=None):
+        self.open(tag, attrs)
+        self.parts.append(escape(text))
+        self.close(tag)
+
+    def text(self, text):
+        self.parts.append(escape(text))
+
+    def defect(self):
+        return self.rnd.random() < self.options.defects
+
+    def words(self, low, high):
+        return ' '.join(self.rnd.choice(_WORDS) for i in range(self.rnd.randint(low, high)))
+
+    def sentence(self):
+        s = self.words(4, 18)
+        return s[0].upper() + s[1:] + '.'
+
+    def conditions(self):
+        if self.options.conditions and self.rnd.random() < 0.1:
+            return {'MadCap:conditions': self.rnd.choice(self.options.conditions)}
+        return {}
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+def _paragraph(w):
+    if w.defect():
+        w.element('p', '', w.conditions())
+        return
+
+    w.open('p', w.conditions())
+    w.text(w.sentence() + ' ')
+    if w.rnd.random() < 0.1:
+        name = 'General.Missing' if w.defect() else 'General.ProductName'
+        w.open('MadCap:variable', {'name': name}, empty=True)
+        w.text(' ')
+    if w.rnd.random() < 0.2:
+        w.element('span', w.words(1, 3), {'class': 'UI'})
+        w.text(' ')
+    if w.defect():
+        w.element('b', w.words(1, 2))
+    w.text(w.sentence())
+    w.close('p')
+
+def _list(w, depth):
+    tag = 'ul' if w.rnd.random() < 0.7 else 'ol'
+    width = 1 if w.defect() else max(2, w.options.listwidth + w.rnd.randint(-1, 1))
+    w.open(tag)
+    for i in range(width):
+        w.open('li', w.conditions())
+        w.element('p', w.words(3, 8))
+        if depth > 1 and w.rnd.random() < 0.3:
+            _list(w, depth - 1)
+        w.close('li')
+    w.close(tag)
+
+def _table(w):
+    attrs = {} if w.defect() else {'style': 'mc-table-style: url(\'../Resources/TableStyles/Standard.css\');'}
+    w.open('table', attrs)
+    w.open('tbody')
+    for r in range(w.options.tablerows):
+        w.open('tr')
+        for c in range(w.options.tablecols):
+            w.open('td')
+            w.element('p', w.words(1, 5))
+            w.close('td')
+        w.close('tr')
+    w.close('tbody')
+    w.close('table')
+
+def _body(w, topic, topics, snippets):
+    if not w.defect():
+        w.element('h1', ' '.join([w.rnd.choice(_NAMES), w.words(1, 4)]))
+    _paragraph(w)
+
+    for s in range(w.options.sections):
+        w.element('h3' if w.defect() else 'h2', w.words(2, 5).capitalize(), {'class': 'Section'})
+        for block in range(w.rnd.randint(1, 4)):
+            choice = w.rnd.random()
+            if choice < 0.45:
+                _paragraph(w)
+            elif choice < 0.7:
+                _list(w, w.options.depth)
+            elif choice < 0.8:
+                _table(w)
+            elif choice < 0.9 and snippets:
+                w.open('MadCap:snippetBlock', {'src': '../Resources/Snippets/{0}'.format(
+                    w.rnd.choice(snippets))}, empty=True)
+            else:
+                w.open('p')
+                w.element('img', '', {'src': '../Resources/Images/Image{0}.{1}'.format(
+                    w.rnd.randint(0, 999), 'gif' if w.defect() else 'png')})
+                w.close('p')
+
+    w.open('p')
+    w.text('See ')
+    w.element('MadCap:xref', w.words(2, 4) + ('.' if w.defect() else ''),
+              {'href': w.rnd.choice(topics) + ('#anchor' if w.defect() else '')})
+    w.text('.')
+    w.close('p')
+
+def _html(w, lang, body):
+    attrs = {'xmlns:MadCap': _MADCAP}
+    if lang != w.options.languages[0]:
+        attrs['xml:lang'] = lang
+    w.parts.append('<?xml version="1.0" encoding="utf-8"?>\n')
+    w.open('html', attrs)
+    w.open('head')
+    w.element('title', '')
+    w.open('link', {'href': '../Resources/Stylesheets/Styles.css',
+                    'rel': 'stylesheet', 'type': 'text/css'}, empty=True)
+    w.close('head')
+    w.open('body')
+    body()
+    w.close('body')
+    w.close('html')
+
+def _toc(w, topics):
+    w.parts.append('<?xml version="1.0" encoding="utf-8"?>\n')
+    w.open('CatapultToc', {'Version': '1'})
+    maxlevel = w.options.depth + 1
+    level = 0
+    opened = 0
+    for t in topics:
+        move = w.rnd.random()
+        if opened and move < 0.3 and level < maxlevel:
+            level += 1
+        elif move < 0.5 and level > 0:
+            level -= 1
+        while opened > level:
+            w.close('TocEntry')
+            opened -= 1
+        w.open('TocEntry', {'Title': '[%=System.LinkedTitle%]',
+                            'Link': '/Content/Topics/' + t})
+        opened += 1
+    for i in range(opened):
+        w.close('TocEntry')
+    w.close('CatapultToc')
+
+def _target(w, n):
+    pdf = n % 2 == 0
+    attrs = {'Type': 'PDF' if pdf else 'WebHelp2',
+             'PatchHeadingLevels': 'false' if w.defect() else 'true'}
+    if w.options.conditions:
+        attrs['ConditionTagExpression'] = 'exclude[{0}]'.format(w.options.conditions[-1])
+    w.parts.append('<?xml version="1.0" encoding="utf-8"?>\n')
+    w.open('CatapultTarget', attrs)
+    w.close('CatapultTarget')
+
+def _props(w):
+    w.parts.append('<?xml version="1.0" encoding="utf-8"?>\n')
+    w.open('Properties')
+    w.open('Shapes')
+    for i in range(w.rnd.randint(0, 4)):
+        w.element('Shape', r'{\rtf1 ' + w.words(1, 3) + '}' if w.defect() else w.words(1, 3),
+                  {'FontSize': '12pt' if w.defect() else '16pt'})
+    w.close('Shapes')
+    w.close('Properties')
+
+def _variables(w):
+    w.parts.append('<?xml version="1.0" encoding="utf-8"?>\n')
+    w.open('CatapultVariableSet')
+    for name, value in sorted(_VARIABLES.items()):
+        w.element('Variable', value, {'Name': name, 'EvaluatedDefinition': value})
+    w.close('CatapultVariableSet')
+
+def _save(path, w):
+    _savetext(path, w.getvalue())
+
+def _savetext(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def generate(directory, options=None):
+    """Writes a synthetic Flare project to directory. Returns the path to
+    the project file and a dictionary of counts."""
+
+    options = options or Options()
+    rnd = random.Random(options.seed)
+    counts = {'files': 0, 'elements': 0}
+
+    def save(path, w):
+        _save(os.path.join(directory, path), w)
+        counts['files'] += 1
+        counts['elements'] += w.elements
+
+    topics = ['Topic{0:05}.htm'.format(i) for i in range(options.topics)]
+    snippets = ['Snippet{0:04}.flsnp'.format(i) for i in range(options.snippets)]
+
+    for name in snippets:
+        w = _Writer(rnd, options)
+        _html(w, options.languages[0], lambda: [_paragraph(w), _list(w, options.depth)])
+        save(os.path.join('Content', 'Resources', 'Snippets', name), w)
+
+    for name in topics:
+        w = _Writer(rnd, options)
+        lang = rnd.choice(options.languages)
+        _html(w, lang, lambda: _body(w, name, topics, snippets))
+        save(os.path.join('Content', 'Topics', name), w)
+
+    for i in range(options.props):
+        w = _Writer(rnd, options)
+        _props(w)
+        save(os.path.join('Content', 'Resources', 'Images', 'Image{0}.props'.format(i)), w)
+
+    for i in range(options.tocs):
+        w = _Writer(rnd, options)
+        _toc(w, topics)
+        save(os.path.join('Project', 'TOCs', 'Toc{0}.fltoc'.format(i)), w)
+
+    for i in range(options.targets):
+        w = _Writer(rnd, options)
+        _target(w, i)
+        save(os.path.join('Project', 'Targets', 'Target{0}.fltar'.format(i)), w)
+
+    w = _Writer(rnd, options)
+    _variables(w)
+    save(os.path.join('Project', 'VariableSets', 'General.flvar'), w)
+
+    for path, text in [(('Stylesheets', 'Styles.css'), _STYLES),
+                       (('TableStyles', 'Standard.css'), _TABLE_STYLE)]:
+        _savetext(os.path.join(directory, 'Content', 'Resources', *path), text)
+        counts['files'] += 1
+
+    projectpath = os.path.join(directory, 'Synthetic.flprj')
+    with open(projectpath, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n'
+                '<CatapultProject xml:lang="{0}" />\n'.format(options.languages[0]))
+
+    return projectpath, counts
+
+def parseargs(parser, args):
+    """Adds the generator's options to an argparse parser, then parses
+    args. Returns the namespace and an Options object."""
+
+    d = Options()
+    parser.add_argument('--topics', type=int, default=d.topics)
+    parser.add_argument('--snippets', type=int, default=d.snippets)
+    parser.add_argument('--tocs', type=int, default=d.tocs)
+    parser.add_argument('--targets', type=int, default=d.targets)
+    parser.add_argument('--props', type=int, default=d.props)
+    parser.add_argument('--sections', type=int, default=d.sections,
+                        help='h2 sections per topic')
+    parser.add_argument('--list-width', type=int, default=d.listwidth,
+                        help='typical items per list')
+    parser.add_argument('--depth', type=int, default=d.depth,
+                        help='maximum nesting of lists and TOC entries')
+    parser.add_argument('--table-rows', type=int, default=d.tablerows)
+    parser.add_argument('--table-cols', type=int, default=d.tablecols)
+    parser.add_argument('--languages', default=','.join(d.languages),
+                        help='comma-separated; the first is the project language')
+    parser.add_argument('--conditions', default=','.join(d.conditions),
+                        help='comma-separated condition tags')
+    parser.add_argument('--defects', type=float, default=d.defects,
+                        help='fraction of blocks that break a rule')
+    parser.add_argument('--seed', type=int, default=d.seed)
+    ns = parser.parse_args(args)
+
+    options = Options(
+        topics=ns.topics, snippets=ns.snippets, tocs=ns.tocs,
+        targets=ns.targets, props=ns.props, sections=ns.sections,
+        listwidth=ns.list_width, depth=ns.depth, tablerows=ns.table_rows,
+        tablecols=ns.table_cols,
+        languages=[l for l in ns.languages.split(',') if l] or d.languages,
+        conditions=[c for c in ns.conditions.split(',') if c],
+        defects=ns.defects, seed=ns.seed)
+
+    return ns, options
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Generate a synthetic Flare project.')
+    parser.add_argument('outdir')
+    ns, options = parseargs(parser, args)
+    projectpath, counts = generate(ns.outdir, options)
+    print('{0}: {1} files, {2} elements'.format(projectpath, counts['files'], counts['elements']))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,180 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Measures the latency of the lint server under concurrent clients.
+
+Starts "python -m flarelint serve" on a free port of localhost, for
+an existing project (--project) or a synthetic project generated with
+the options of corpus.py.  Then, for each level of concurrency, as
+many clients each send --requests lintFile requests for topics of the
+project, one at a time, and the script reports requests per second
+and the latency percentiles.
+
+The first level runs against a cold tree cache; later levels find
+most trees already parsed.  Use --buffer to send lintBuffer requests
+with each topic's text instead, which parses every time.
+
+Usage:
+
+  python benchmarks/serverload.py [--project FLPRJ] [--concurrency 1,4,16]
+                                  [--requests N] [--workers N] [--buffer]
+                                  [corpus options]
+
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+
+import corpus
+
+def _start(projectpath, workers, env):
+    server = subprocess.Popen([sys.executable, '-m', 'flarelint', 'serve', projectpath,
+                               '--port', '0', '--workers', str(workers)],
+                              cwd=_ROOT, env=env, stdout=subprocess.PIPE)
+    line = server.stdout.readline().decode()
+    host, port = line.split()[-1].rsplit(':', 1)
+    return server, (host, int(port))
+
+class _Client:
+    def __init__(self, address):
+        self._socket = socket.create_connection(address)
+        self._file = self._socket.makefile('rwb')
+        self._id = 0
+
+    def call(self, method, params=None):
+        self._id += 1
+        self._file.write((json.dumps({'id': self._id, 'method': method,
+                                      'params': params or {}}) + '\n').encode('utf-8'))
+        self._file.flush()
+        response = json.loads(self._file.readline())
+        if 'error' in response:
+            raise RuntimeError(response['error']['message'])
+        return response['result']
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+def _topics(projectpath):
+    projectdir = os.path.dirname(projectpath)
+    topics = []
+    for dirpath, dirnames, filenames in os.walk(os.path.join(projectdir, 'Content')):
+        topics.extend(os.path.relpath(os.path.join(dirpath, f), projectdir)
+                      for f in filenames if f.endswith('.htm'))
+    return sorted(topics)
+
+def _load(address, projectpath, topics, clients, requests, buffer):
+    """Runs the clients at once. Returns the latencies in seconds and the
+    elapsed time."""
+
+    projectdir = os.path.dirname(projectpath)
+    texts = {}
+    if buffer:
+        for t in topics:
+            with open(os.path.join(projectdir, t), encoding='utf-8') as f:
+                texts[t] = f.read()
+
+    latencies = []
+    lock = threading.Lock()
+    ready = threading.Barrier(clients + 1)
+
+    def run(n):
+        client = _Client(address)
+        mine = []
+        ready.wait()
+        for i in range(requests):
+            topic = topics[(n * requests + i) % len(topics)]
+            start = time.perf_counter()
+            if buffer:
+                client.call('lintBuffer', {'path': topic, 'text': texts[topic]})
+            else:
+                client.call('lintFile', {'path': topic})
+            mine.append(time.perf_counter() - start)
+        client.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(clients)]
+    for t in threads:
+        t.start()
+    ready.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def main(args):
+    parser = argparse.ArgumentParser(description='Measure lint server latency.')
+    parser.add_argument('--project', help='existing project to lint instead of a synthetic one')
+    parser.add_argument('--concurrency', default='1,4,16')
+    parser.add_argument('--requests', type=int, default=100, help='requests per client')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--buffer', action='store_true', help='send lintBuffer requests')
+    ns, options = corpus.parseargs(parser, args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, APPDATA=os.path.join(tmp, 'AppData'),
+                   USERNAME=os.environ.get('USERNAME', 'benchmark'))
+
+        projectpath = ns.project
+        if projectpath is None:
+            projectpath, counts = corpus.generate(os.path.join(tmp, 'Project'), options)
+        projectpath = os.path.abspath(projectpath)
+        topics = _topics(projectpath)
+        print('Project: {0}\nTopics: {1}\n'.format(projectpath, len(topics)))
+
+        server, address = _start(projectpath, ns.workers, env)
+        try:
+            for clients in [int(c) for c in ns.concurrency.split(',')]:
+                latencies, elapsed = _load(address, projectpath, topics, clients,
+                                           ns.requests, ns.buffer)
+                print('clients {0:3}  requests/s {1:8.1f}  p50 {2:7.2f} ms  '
+                      'p95 {3:7.2f} ms  p99 {4:7.2f} ms  max {5:7.2f} ms'.format(
+                          clients, len(latencies) / elapsed,
+                          1000 * statistics.median(latencies),
+                          1000 * _percentile(latencies, 95),
+                          1000 * _percentile(latencies, 99),
+                          1000 * max(latencies)))
+            client = _Client(address)
+            client.call('shutdown')
+            client.close()
+        finally:
+            server.wait(timeout=10)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
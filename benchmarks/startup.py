@@ -0,0 +1,100 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Measures how long FlareLint takes to start.
+
+Each measurement runs in a fresh interpreter, so it includes Python's
+own start-up.  The stages are:
+
+  python     An empty interpreter, for reference.
+  import     import flarelint
+  rules      import flarelint, then load the rules.
+  lint       Lint a project with a single topic, without a browser.
+
+The rules stage runs once against an empty rule folder to prime the
+rule bundle, then against the primed bundle.
+
+Usage:
+
+  python benchmarks/startup.py [repeat]
+
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_TOPIC = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns:MadCap="http://www.madcapsoftware.com/Schemas/MadCap.xsd">
+  <head><title></title></head>
+  <body><h1>Title</h1><p>Text.</p></body>
+</html>
+"""
+
+_STAGES = [
+    ('python', "pass"),
+    ('import', "import flarelint"),
+    ('rules', "import flarelint; flarelint.rule.load()"),
+    ('lint', "import flarelint; flarelint.main([{project!r}, '--max-results', '1'])"),
+]
+
+def _makeproject(directory):
+    os.makedirs(os.path.join(directory, 'Content'))
+    os.makedirs(os.path.join(directory, 'Project'))
+    with open(os.path.join(directory, 'Content', 'Topic.htm'), 'w') as f:
+        f.write(_TOPIC)
+    project = os.path.join(directory, 'Startup.flprj')
+    with open(project, 'w') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?><CatapultProject />')
+    return project
+
+def _run(code, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], env=env, cwd=_ROOT,
+                   stdout=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+def main(args):
+    repeat = int(args[0]) if args else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ,
+                   APPDATA=os.path.join(tmp, 'AppData'),
+                   USERNAME=os.environ.get('USERNAME', 'benchmark'))
+        project = _makeproject(os.path.join(tmp, 'Project'))
+
+        print('Cold rule bundle: {0:.1f} ms'.format(
+            1000 * _run(_STAGES[2][1], env)))
+
+        for name, code in _STAGES:
+            code = code.format(project=project)
+            times = [_run(code, env) for i in range(repeat)]
+            print('{0:8} median {1:6.1f} ms  min {2:6.1f} ms'.format(
+                name, 1000 * statistics.median(times), 1000 * min(times)))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
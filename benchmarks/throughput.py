@@ -0,0 +1,190 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Measures how fast report.build lints a project.
+
+Lints either an existing project (--project) or a synthetic project
+generated with the options of corpus.py, and reports files per second,
+elements per second, the time in each phase, and peak memory (RSS).
+
+The modes are:
+
+  cold     A fresh process and an empty rule folder for each run, so
+           rules are installed and compiled every time.
+  warm     A fresh process for each run, with the rule bundle primed.
+  repeat   One process that loads the rules once and builds the
+           report for every run.  Peak RSS is for the whole process.
+
+Usage:
+
+  python benchmarks/throughput.py [--project FLPRJ] [--repeat N]
+                                  [--modes cold,warm,repeat] [corpus options]
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+sys.path.insert(0, _ROOT)
+
+import corpus
+
+_PHASES = ['load', 'scan', 'format', 'write']
+
+def _peakrss():
+    """Returns the peak resident set size of this process in MiB, or None
+    where the resource module is unavailable."""
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _build(projectpath, timings):
+    from flarelint import report
+
+    reportpath = os.path.join(os.path.dirname(projectpath), 'FlareLintReport.html')
+    start = time.perf_counter()
+    stats = report.build(projectpath, reportpath, timings=timings)
+    timings['total'] = timings['load'] + time.perf_counter() - start
+    return stats
+
+def _runs(projectpath, repeat):
+    """Lints the project repeat times in this process. Returns a list of
+    timings."""
+
+    from flarelint import rule
+
+    runs = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        rule.load()
+        load = time.perf_counter() - start
+        for i in range(repeat):
+            timings = {'load': load if i == 0 else 0.0}
+            _build(projectpath, timings)
+            runs.append(timings)
+
+    return runs
+
+def _child(projectpath):
+    """Entry point for one run in a separate process."""
+
+    timings = _runs(projectpath, 1)[0]
+    timings['rss'] = _peakrss()
+    print(json.dumps(timings))
+
+def _spawn(projectpath, appdata):
+    env = dict(os.environ, APPDATA=appdata, USERNAME=os.environ.get('USERNAME', 'benchmark'))
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', projectpath],
+                         env=env, cwd=_ROOT, stdout=subprocess.PIPE, check=True)
+    return json.loads(out.stdout.decode().splitlines()[-1])
+
+def _count(projectpath):
+    """Returns the number of files that have rules, and their elements."""
+
+    from flarelint import rule
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        rule.load()
+    extensions = rule.extensions()
+
+    files = 0
+    elements = 0
+    projectdir = os.path.dirname(projectpath)
+    for sub in ['Content', 'Project']:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(projectdir, sub)):
+            for f in filenames:
+                if os.path.splitext(f)[1] not in extensions:
+                    continue
+                files += 1
+                try:
+                    elements += sum(1 for e in ET.parse(os.path.join(dirpath, f)).iter())
+                except ET.ParseError:
+                    pass
+
+    return files, elements
+
+def _summarize(mode, runs, files, elements):
+    median = {p: statistics.median(r[p] for r in runs) for p in _PHASES + ['total']}
+    scan = median['scan'] or float('nan')
+    rss = [r['rss'] for r in runs if r.get('rss') is not None]
+
+    print('{0:7} runs {1:3}  total {2:7.3f} s  files/s {3:9.1f}  elements/s {4:11.1f}  peak RSS {5}'.format(
+        mode, len(runs), median['total'], files / scan, elements / scan,
+        '{0:.1f} MiB'.format(max(rss)) if rss else 'n/a'))
+    print('        ' + '  '.join('{0} {1:.3f} s'.format(p, median[p]) for p in _PHASES))
+
+def main(args):
+    if args[:1] == ['--child']:
+        _child(args[1])
+        return
+
+    parser = argparse.ArgumentParser(description='Measure FlareLint throughput.')
+    parser.add_argument('--project', help='existing project to lint instead of a synthetic one')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--modes', default='cold,warm,repeat')
+    ns, options = corpus.parseargs(parser, args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['APPDATA'] = os.path.join(tmp, 'AppData')
+        os.environ.setdefault('USERNAME', 'benchmark')
+
+        projectpath = ns.project
+        if projectpath is None:
+            projectpath, counts = corpus.generate(os.path.join(tmp, 'Project'), options)
+        projectpath = os.path.abspath(projectpath)
+
+        files, elements = _count(projectpath)
+        print('Project: {0}\nFiles: {1}\nElements: {2}\n'.format(projectpath, files, elements))
+
+        for mode in ns.modes.split(','):
+            if mode == 'cold':
+                runs = [_spawn(projectpath, os.path.join(tmp, 'Cold{0}'.format(i)))
+                        for i in range(ns.repeat)]
+            elif mode == 'warm':
+                runs = [_spawn(projectpath, os.environ['APPDATA'])
+                        for i in range(ns.repeat)]
+            elif mode == 'repeat':
+                runs = _runs(projectpath, ns.repeat)
+                for r in runs:
+                    r['rss'] = _peakrss()
+            else:
+                parser.error('unknown mode: ' + mode)
+            _summarize(mode, runs, files, elements)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -31,24 +31,49 @@ rules then generates a report. This report lists files in your project
 that break the rules.  For example, FlareLint reports when a topic
 does not start with an h1 element.
 
+To lint content from Python, see lint_bytes(), lint_tree(), and
+lint_project() in flarelint/api.py, and for asyncio, lint_files_async()
+and lint_project_async() in flarelint/asyncapi.py.
+
 For more information, see doc\index.html
 
 """
 
-import webbrowser
 import os
 import glob
 import sys
+import time
+import contextlib
 
 from flarelint import report
 from flarelint import resources
 from flarelint import rule
 
+# Names that come from modules imported only when first used, so that
+# the command line starts quickly.  The command line itself imports
+# each module only for the options that need it.
+_LAZY = {
+    'lint_bytes': 'api',
+    'lint_tree': 'api',
+    'lint_project': 'api',
+    'load_rules': 'api',
+    'lint_files_async': 'asyncapi',
+    'lint_project_async': 'asyncapi',
+}
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    import importlib
+    return getattr(importlib.import_module('flarelint.' + module), name)
+
 def _rename_previous_report(path):
     newpath = path
     base, ext = os.path.splitext(path)
     count = 0
-    while os.path.isfile(newpath):
+    while os.path.exists(newpath):
         count = count + 1
         newpath = base + "-%i" % count + ext
 
@@ -63,17 +88,186 @@ def _defaultproject():
     else:
         return None
 
+# Exit status when limits are set.
+_EXIT_ERRORS = 2
+_EXIT_WARNINGS = 3
+
+def _count(option, args):
+    """Returns the whole number that follows an option."""
+
+    value = next(args, '')
+    if not value.isdigit():
+        print(resources.BAD_COUNT.format(option))
+        sys.exit(1)
+
+    return int(value)
+
+def _names(option, args):
+    """Returns the comma-separated names that follow an option."""
+
+    names = [n.strip() for n in next(args, '').split(',') if n.strip()]
+    if not names:
+        print(resources.BAD_ARG)
+        sys.exit(1)
+
+    return names
+
+def _level(args):
+    levels = {l.casefold(): l for l in [resources.ERROR_LEVEL, resources.WARNING_LEVEL]}
+    level = levels.get(next(args, '').casefold())
+    if level is None:
+        print(resources.BAD_LEVEL)
+        sys.exit(1)
+
+    return level
+
+def _format(args):
+    from flarelint import formats
+
+    fmt = next(args, '')
+    if fmt not in formats.FORMATS:
+        print(resources.BAD_FORMAT.format(', '.join(sorted(formats.FORMATS))))
+        sys.exit(1)
+
+    return fmt
+
+def _exitstatus(statistics):
+    if statistics[resources.ERROR_LEVEL]:
+        return _EXIT_ERRORS
+    if statistics[resources.WARNING_LEVEL]:
+        return _EXIT_WARNINGS
+    return 0
+
+def _serve(args):
+    """Entry point for python -m flarelint serve."""
+
+    from flarelint import server
+
+    projectpath = None
+    socketpath = None
+    port = 0
+    workers = 4
+
+    args = iter(args)
+    for a in args:
+        if a == '--socket':
+            socketpath = next(args, '')
+            if not socketpath:
+                print(resources.BAD_ARG)
+                sys.exit(1)
+        elif a == '--port':
+            port = _count(a, args)
+        elif a == '--workers':
+            workers = max(1, _count(a, args))
+        elif a.startswith('-') or projectpath:
+            print(resources.BAD_ARG)
+            sys.exit(1)
+        else:
+            projectpath = a
+
+    projectpath = projectpath or _defaultproject()
+    if projectpath is None:
+        print(resources.MISSING_PROJECT)
+        sys.exit(1)
+
+    try:
+        server.serve(projectpath, socketpath, port, workers)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+def _lsp(args):
+    """Entry point for python -m flarelint lsp."""
+
+    from flarelint import lsp
+
+    debounce = 150
+    args = iter(args)
+    for a in args:
+        if a == '--debounce':
+            debounce = _count(a, args)
+        else:
+            print(resources.BAD_ARG)
+            sys.exit(1)
+
+    lsp.serve(debounce / 1000)
+
 def main(args):
     """Main entry point for FlareLint."""
 
-    print(resources.WELCOME)
+    if args[:1] == ['serve']:
+        _serve(args[1:])
+        return
+    if args[:1] == ['lsp']:
+        _lsp(args[1:])
+        return
 
     verbose = False
     projectpath = None
-    
+    limits = report.Limits()
+    select = []
+    ignore = []
+    level = None
+    fmt = None
+    outputpath = '-'
+    writehtml = True
+    shardhtml = False
+    baselinepath = None
+    writebaseline = False
+    statspath = None
+    metricspath = None
+    prefilter = True
+    expandsnippets = False
+    targetnames = []
+
+    args = iter(args)
     for a in args:
         if a == '-v':
             verbose = True
+        elif a == '--fail-fast':
+            limits.failfast = True
+        elif a == '--max-results':
+            limits.maxresults = _count(a, args)
+        elif a == '--max-results-per-rule':
+            limits.maxperrule = _count(a, args)
+        elif a == '--exact-counts':
+            limits.exactcounts = True
+        elif a == '--select':
+            select.extend(_names(a, args))
+        elif a == '--ignore':
+            ignore.extend(_names(a, args))
+        elif a == '--level':
+            level = _level(args)
+        elif a == '--format':
+            fmt = _format(args)
+        elif a == '--output':
+            outputpath = next(args, '') or '-'
+        elif a == '--no-html':
+            writehtml = False
+        elif a == '--sharded':
+            shardhtml = True
+        elif a == '--baseline':
+            baselinepath = next(args, '')
+            if not baselinepath:
+                print(resources.BAD_ARG)
+                sys.exit(1)
+        elif a in ['--stats', '--metrics']:
+            path = next(args, '')
+            if not path:
+                print(resources.BAD_ARG)
+                sys.exit(1)
+            if a == '--stats':
+                statspath = path
+            else:
+                metricspath = path
+        elif a == '--baseline-write':
+            writebaseline = True
+        elif a == '--no-prefilter':
+            prefilter = False
+        elif a == '--expand-snippets':
+            expandsnippets = True
+        elif a == '--target':
+            targetnames.extend(_names(a, args))
         elif a == '--help':
             print(resources.HELP)
             sys.exit(0)
@@ -90,14 +284,92 @@ def main(args):
         print(resources.MISSING_PROJECT)
         sys.exit(1)
 
+    outputs = []
+    if fmt:
+        from flarelint import formats
+        outputs.append(formats.open_output(fmt, outputpath))
+
+    known = None
+    if writebaseline:
+        from flarelint import baseline
+        baselinepath = baselinepath or os.path.join(os.path.dirname(projectpath),
+                                                    resources.BASELINE_FILE)
+        outputs.append(baseline.BaselineWriter(baselinepath, os.path.dirname(projectpath)))
+    elif baselinepath:
+        from flarelint import baseline
+        try:
+            known = baseline.load(baselinepath, os.path.dirname(projectpath))
+        except (OSError, ValueError, KeyError):
+            print(resources.BAD_BASELINE.format(baselinepath))
+            sys.exit(1)
+
+    targets = None
+    if targetnames:
+        from flarelint import conditions
+        try:
+            targets = conditions.load(os.path.dirname(os.path.abspath(projectpath)), targetnames)
+        except KeyError as e:
+            print(resources.BAD_TARGET.format(e.args[0]))
+            sys.exit(1)
+        except ValueError as e:
+            print(resources.BAD_TARGET_EXPRESSION.format(e.args[0]))
+            sys.exit(1)
+
+    # Keep standard output for the results when they go there.
+    progress = sys.stderr if fmt and outputpath == '-' else sys.stdout
+    with contextlib.redirect_stdout(progress):
+        aggregate = None
+        if statspath or metricspath:
+            from flarelint import metrics
+            aggregate = metrics.Aggregate(os.path.abspath(projectpath))
+        statistics = _run(projectpath, verbose=verbose, limits=limits, select=select,
+                          ignore=ignore, level=level, outputs=outputs, writehtml=writehtml,
+                          shardhtml=shardhtml, known=known, aggregate=aggregate,
+                          prefilter=prefilter, expandsnippets=expandsnippets, targets=targets)
+        if statspath:
+            aggregate.writejson(statspath)
+        if metricspath:
+            aggregate.writeopenmetrics(metricspath)
+
+    if limits.active():
+        sys.exit(_exitstatus(statistics))
+
+def _run(projectpath, *, verbose, limits, select, ignore, level, outputs, writehtml, shardhtml,
+         known, aggregate, prefilter, expandsnippets, targets):
+    print(resources.WELCOME)
+
     projectdir, projectfile = os.path.split(projectpath)
-    reportpath = os.path.join(projectdir, resources.REPORT_FILE)
+    reportpath = None
+    openpath = None
+    if writehtml and shardhtml:
+        shardpath = os.path.join(projectdir, resources.SHARDED_DIR)
+        _rename_previous_report(shardpath)
+        from flarelint import sharded
+        outputs = outputs + [sharded.ShardedReport(shardpath, projectpath)]
+        openpath = os.path.join(shardpath, resources.SHARDED_INDEX_FILE)
+    elif writehtml:
+        reportpath = openpath = os.path.join(projectdir, resources.REPORT_FILE)
 
     print(resources.PROGRESS_PROJECT.format(projectdir, projectfile))
-    rule.load(verbose)
-    _rename_previous_report(reportpath)
-    report.build(projectpath, reportpath, verbose)
-    webbrowser.open(reportpath)
+    start = time.perf_counter()
+    rule.load(verbose, select, ignore, level)
+    if aggregate is not None:
+        aggregate.timings['load'] = time.perf_counter() - start
+    if not rule.extensions():
+        print(resources.NO_RULES)
+        sys.exit(1)
+    if reportpath:
+        _rename_previous_report(reportpath)
+    statistics = report.build(projectpath, reportpath, verbose=verbose, limits=limits,
+                              outputs=outputs, baseline=known, aggregate=aggregate,
+                              prefilter=prefilter, expandsnippets=expandsnippets,
+                              targets=targets)
+    if openpath and not limits.active():
+        import webbrowser
+        webbrowser.open(openpath)
 
-    print(resources.PROGRESS_REPORT.format(resources.REPORT_FILE))
+    if openpath:
+        print(resources.PROGRESS_REPORT.format(os.path.relpath(openpath, projectdir)))
     print(resources.PROGRESS_DONE)
+
+    return statistics
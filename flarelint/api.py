@@ -0,0 +1,128 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Lint content from Python, without the report or the command line.
+
+  import flarelint
+
+  for result in flarelint.lint_bytes(data, '.htm', 'en-us'):
+      print(result.line, result.ruleid, result.context)
+
+Each function is a generator of rule.Result objects, which hold the
+path, level, message, rule ID, tag, context, line, and column of a
+result.  formats.record() converts one to a dictionary.  Results come
+one at a time as the rules find them, so a caller can stop early.
+Only lint_project() applies project rules, which compare elements
+across all of the files of a project.  Their results come last.
+
+Unless rules are loaded already, the first call loads the rules that
+come with FlareLint, from the package itself.  To use other rules,
+call load_rules() first with a folder of rule modules.  Neither reads
+USERNAME or APPDATA from the environment, nor writes to the folder of
+rules.
+
+lint_bytes() without a path, and lint_tree() with an Element, read no
+files.  Content with a path in a project, given to lint_bytes() or as
+a Node that flarenode.parse() or fromstring() made with a path, is
+judged in its project: rules read the project's variable sets,
+stylesheets, and images, and check the files that TOC entries and
+table styles refer to.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+from flarelint import flarenode
+from flarelint import report
+from flarelint import rule
+
+DEFAULT_LANG = flarenode._FLARE_LANG_DEFAULT
+
+_loaded = {'folder': None}
+
+def load_rules(folder=None, select=None, ignore=None, level=None):
+    """Loads the rule modules in a folder, by default those that come with
+    FlareLint.  See rule.load() for select, ignore, and level."""
+
+    folder = folder or rule.defaultfolder()
+    rule.load(False, select, ignore, level, folder, bundle=False)
+    _loaded['folder'] = folder
+
+def _rules():
+    """Loads the default rules unless some rules are loaded already."""
+
+    if _loaded['folder'] is None and not rule.extensions():
+        load_rules()
+
+def _lint(root, path, lang):
+    rules = rule.getrules(os.path.splitext(path)[1])
+    if rules is None:
+        return
+
+    scan = report._Scan(lang)
+    for node in root.iter():
+        yield from report._applyrules(rules, path, node, scan)
+
+def lint_tree(element, extension, lang=DEFAULT_LANG, path=None, positions=None):
+    """Yields the results for a parsed file: the root ElementTree Element,
+    or a flarenode.Node.  The extension, like '.htm', chooses the rules.
+    The path, if any, goes in the results.  The optional positions are
+    a dictionary of elements and their (line, column)."""
+
+    _rules()
+    path = path or 'untitled' + extension
+    if isinstance(element, flarenode.Node):
+        root = element
+    else:
+        parents = {c:p for p in element.iter() for c in p}
+        root = flarenode.Node(element, parents, lang, positions)
+    yield from _lint(root, path, lang)
+
+def lint_bytes(data, extension, lang=DEFAULT_LANG, path=None):
+    """Yields the results for the contents of a file, as bytes or a
+    string.  If a path is given, rules may look for the files that the
+    content links to.  Content that is not well-formed XML gives a
+    single result with the rule ID rule.PARSE_ERROR_ID."""
+
+    _rules()
+    if rule.getrules(extension) is None:
+        return
+
+    try:
+        root = flarenode.fromstring(data, lang, path)
+    except ET.ParseError as e:
+        yield from report._parseerror(path or 'untitled' + extension, e, report._Scan(lang))
+        return
+    yield from _lint(root, path or 'untitled' + extension, lang)
+
+def lint_project(projectpath):
+    """Yields the results for each file of a Flare project, in the order
+    of the report.  Reads each file only when the results of the files
+    before it have been used."""
+
+    _rules()
+    scan = report._Scan(flarenode.get_project_lang(projectpath), projectrules=True)
+    for f in report.projectfiles(projectpath):
+        yield from report._lintfile(f, scan)
+    for path, results in sorted(report._finish(scan).items()):
+        yield from results
@@ -0,0 +1,116 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Lint from asyncio code without blocking the event loop.
+
+  results = await flarelint.lint_project_async(projectpath)
+
+  async with contextlib.aclosing(flarelint.lint_files_async(paths)) as results:
+      async for result in results:
+          ...
+
+Files are read in the event loop's default executor, and parsed and
+linted in the executor given as the executor argument, or the default
+one.  A process pool works too; its workers load the rules that come
+with FlareLint unless its initializer calls api.load_rules().
+
+At most concurrency files are read or linted at once, and at most
+backlog files of results wait for the caller, so a slow caller slows
+the linting rather than filling memory.  Results of a file come
+together, but files come in the order they finish.  Cancelling the
+caller, or closing the generator, stops the files that have not
+started.  Because files may be linted in other processes, project
+rules, which compare elements across files, are not applied; use
+api.lint_project() for them.
+"""
+
+import asyncio
+import os
+
+from flarelint import api
+from flarelint import flarenode
+from flarelint import report
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _lintdata(data, path, lang):
+    return list(api.lint_bytes(data, os.path.splitext(path)[1], lang, path))
+
+async def lint_files_async(paths, lang=api.DEFAULT_LANG, executor=None, concurrency=4,
+                           backlog=None):
+    """Yields the results for files, as rule.Result objects."""
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, api._rules)
+
+    queue = asyncio.Queue(maxsize=backlog or concurrency)
+    paths = iter(paths)
+
+    async def worker():
+        for path in paths:
+            data = await loop.run_in_executor(None, _read, path)
+            results = await loop.run_in_executor(executor, _lintdata, data, path, lang)
+            if results:
+                await queue.put(results)
+
+    async def run():
+        workers = [asyncio.ensure_future(worker()) for i in range(max(1, concurrency))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                w.cancel()
+
+    runner = asyncio.ensure_future(run())
+    try:
+        while True:
+            if queue.empty() and runner.done():
+                runner.result()
+                return
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait([getter, runner], return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                continue
+            for result in getter.result():
+                yield result
+    finally:
+        runner.cancel()
+
+async def lint_project_async(projectpath, executor=None, concurrency=4):
+    """Returns the results for each file of a Flare project, as a list of
+    rule.Result objects in the order of the report."""
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, api._rules)
+    lang = await loop.run_in_executor(None, flarenode.get_project_lang, projectpath)
+    files = await loop.run_in_executor(None, lambda: list(report.projectfiles(projectpath)))
+
+    # Results for other files, like stylesheets, come after the files
+    # that the scan visits.
+    order = {f: i for i, f in enumerate(files)}
+    results = [r async for r in lint_files_async(files, lang, executor, concurrency)]
+    results.sort(key=lambda r: order.get(r.path, len(order)))
+    return results
@@ -0,0 +1,106 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Baselines: the known issues of a project, so that reports show only
+new ones.
+
+A baseline is a JSON file that counts results by fingerprint.  A
+fingerprint is a hash of:
+
+  - the rule ID,
+  - the path of the file, relative to the project folder,
+  - the tag names of the element and its ancestors, like
+    "html/body/ul/li", and
+  - the element's context, with spaces and letter case normalized.
+
+None of these change when you edit other parts of the file, so a
+known issue keeps its fingerprint.  Because the structural path has
+no positions, two issues can share a fingerprint, so the baseline
+keeps a count for each and lets that many through.
+
+"""
+
+import hashlib
+import json
+import os
+
+_VERSION = 1
+
+def fingerprint(result, projectdir):
+    """Returns the fingerprint of a rule.Result as a hexadecimal string."""
+
+    relpath = os.path.relpath(result.path, projectdir).replace(os.sep, '/')
+    context = ' '.join(result.context.split()).casefold()
+    key = '\0'.join([result.ruleid or '', relpath.casefold(), result.tagpath, context])
+
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+class Baseline:
+    """The known issues that a scan skips."""
+
+    def __init__(self, projectdir, counts):
+        self._projectdir = projectdir
+        self._counts = counts
+        self.skipped = 0
+
+    def known(self, result):
+        """Returns True if the result is a known issue.  Each known issue
+        matches only as many results as it had when the baseline was
+        written."""
+
+        fp = fingerprint(result, self._projectdir)
+        count = self._counts.get(fp, 0)
+        if not count:
+            return False
+
+        self._counts[fp] = count - 1
+        self.skipped += 1
+        return True
+
+def load(path, projectdir):
+    """Reads a baseline file."""
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    if data.get('version') != _VERSION:
+        raise ValueError(path)
+
+    return Baseline(projectdir, data['fingerprints'])
+
+class BaselineWriter:
+    """An output that writes all of the results to a baseline file."""
+
+    def __init__(self, path, projectdir):
+        self._path = path
+        self._projectdir = projectdir
+        self._counts = {}
+
+    def file(self, path, results):
+        for r in results:
+            fp = fingerprint(r, self._projectdir)
+            self._counts[fp] = self._counts.get(fp, 0) + 1
+
+    def close(self, statistics):
+        with open(self._path, 'w', encoding='utf-8') as f:
+            json.dump({'version': _VERSION, 'fingerprints': self._counts}, f,
+                      sort_keys=True, separators=(',', ':'))
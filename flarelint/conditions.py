@@ -0,0 +1,301 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Condition tags and the targets that include or exclude them.
+
+An element has condition tags in its MadCap:conditions attribute, or
+for a TocEntry, its Conditions attribute, like
+"Default.Internal,Default.PrintOnly".  A target's condition tag
+expression, in the ConditionTagExpression attribute of its .fltar
+file, says which tagged content goes in its output.  A basic
+expression lists tags to include and tags to exclude:
+
+  include[Default.PrintOnly] exclude[Default.Internal or Default.ScreenOnly]
+
+Content that has any excluded tag is left out.  An advanced expression
+is a Boolean expression of tags with "and", "or", "not", and
+parentheses, which is true for content that goes in:
+
+  Default.PrintOnly and not Default.Internal
+
+Either way, content without tags always goes in, and content that is
+left out is left out with everything in it.
+
+Expressions are evaluated once for each distinct set of tags, because
+a project uses few distinct sets.
+"""
+
+import glob
+import os
+import re
+import xml.etree.ElementTree as ET
+
+_CONDITIONS = '{http://www.madcapsoftware.com/Schemas/MadCap.xsd}conditions'
+
+_EMPTY = frozenset()
+
+# Condition attribute values and their sets of tags.
+_tagsets = {}
+
+def tags(value):
+    """Returns the set of tags in the value of a condition attribute."""
+
+    found = _tagsets.get(value)
+    if found is None:
+        found = frozenset(t.strip() for t in value.split(',') if t.strip())
+        found = _tagsets.setdefault(value, found or _EMPTY)
+    return found
+
+def elementtags(elem):
+    """Returns the set of tags of an ElementTree element itself."""
+
+    value = elem.get(_CONDITIONS)
+    if value is None and elem.tag == 'TocEntry':
+        value = elem.get('Conditions')
+    return tags(value) if value else _EMPTY
+
+def effective(root):
+    """Returns a dictionary of the elements of a tree that have tags, or
+    whose ancestors have tags, and the union of those tags."""
+
+    result = {}
+    stack = [(root, _EMPTY)]
+    while stack:
+        elem, inherited = stack.pop()
+        own = elementtags(elem)
+        current = inherited | own if own else inherited
+        if current:
+            result[elem] = current
+        stack.extend((child, current) for child in elem)
+    return result
+
+def of(node):
+    """Returns the set of tags that apply to a flarenode.Node: its own
+    and those of its ancestors, like {"Default.Internal"}.  The sets
+    for a whole document are computed the first time."""
+
+    elem = node.element()
+    if elem is None:
+        return _EMPTY
+    document = node.document()
+    found = document.get('conditions')
+    if found is None:
+        found = document['conditions'] = effective(node.root().element())
+    return found.get(elem, _EMPTY)
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|([^\s()\[\],]+))')
+_BASIC = re.compile(r'\s*(include|exclude)\s*\[([^\]]*)\]\s*', re.I)
+
+class Expression:
+    """A condition tag expression."""
+
+    def __init__(self, text):
+        self.text = text or ''
+        self._cache = {}
+        if not self.text.strip() or _BASIC.match(self.text):
+            self._test = self._basic(self.text)
+        else:
+            self._tokens = self._tokenize(self.text)
+            self._test = self._or()
+            if self._tokens:
+                raise ValueError(self.text)
+
+    def _basic(self, text):
+        lists = {'include': set(), 'exclude': set()}
+        pos = 0
+        while pos < len(text):
+            m = _BASIC.match(text, pos)
+            if m is None:
+                raise ValueError(text)
+            words = [w for w in m.group(2).replace(',', ' ').split() if w.lower() != 'or']
+            lists[m.group(1).lower()].update(words)
+            pos = m.end()
+        excluded = frozenset(lists['exclude'])
+        return lambda tagset: tagset.isdisjoint(excluded)
+
+    def _tokenize(self, text):
+        tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            m = _TOKEN.match(text, pos)
+            if m is None or m.end() == pos:
+                raise ValueError(text)
+            tokens.append(m.group(m.lastindex))
+            pos = m.end()
+        return tokens
+
+    def _next(self):
+        if not self._tokens:
+            raise ValueError(self.text)
+        return self._tokens.pop(0)
+
+    def _peek(self):
+        return self._tokens[0].lower() if self._tokens else None
+
+    def _or(self):
+        terms = [self._and()]
+        while self._peek() == 'or':
+            self._next()
+            terms.append(self._and())
+        return terms[0] if len(terms) == 1 else lambda s: any(t(s) for t in terms)
+
+    def _and(self):
+        terms = [self._not()]
+        while self._peek() == 'and':
+            self._next()
+            terms.append(self._not())
+        return terms[0] if len(terms) == 1 else lambda s: all(t(s) for t in terms)
+
+    def _not(self):
+        if self._peek() == 'not':
+            self._next()
+            term = self._not()
+            return lambda s: not term(s)
+        return self._atom()
+
+    def _atom(self):
+        token = self._next()
+        if token == '(':
+            term = self._or()
+            if self._next() != ')':
+                raise ValueError(self.text)
+            return term
+        if token == ')' or token.lower() in ('and', 'or', 'not'):
+            raise ValueError(self.text)
+        return lambda s: token in s
+
+    def includes(self, tagset):
+        """Returns True if content with this set of tags goes in."""
+
+        if not tagset:
+            return True
+        found = self._cache.get(tagset)
+        if found is None:
+            found = self._cache[tagset] = bool(self._test(tagset))
+        return found
+
+class Target:
+    """A target of a project, and its condition tag expression."""
+
+    def __init__(self, name, path, expression):
+        self.name = name
+        self.path = path
+        self.expression = expression
+
+    def __repr__(self):
+        return 'Target({0!r}, {1!r})'.format(self.name, self.expression.text)
+
+def readtarget(path):
+    """Returns the Target of a .fltar file.  Raises OSError,
+    ET.ParseError, or ValueError for a bad expression."""
+
+    root = ET.parse(path).getroot()
+    name = os.path.splitext(os.path.basename(path))[0]
+    return Target(name, path, Expression(root.get('ConditionTagExpression', '')))
+
+def targetpaths(projectdir):
+    """Returns the .fltar files of a project by target name."""
+
+    pattern = os.path.join(glob.escape(os.path.join(projectdir, 'Project', 'Targets')), '*.fltar')
+    return {os.path.splitext(os.path.basename(p))[0]: p for p in sorted(glob.glob(pattern))}
+
+def load(projectdir, names):
+    """Returns the Targets of a project with these names, ignoring
+    letter case.  Raises KeyError with the name of a target that does
+    not exist, and ValueError with the name of a target that cannot be
+    read."""
+
+    paths = {name.casefold(): p for name, p in targetpaths(projectdir).items()}
+    targets = []
+    for name in names:
+        path = paths.get(name.casefold())
+        if path is None:
+            raise KeyError(name)
+        try:
+            targets.append(readtarget(path))
+        except (OSError, ET.ParseError, ValueError):
+            raise ValueError(name) from None
+    return targets
+
+def prune(root, expression):
+    """Returns a copy of an ElementTree tree without the elements that an
+    Expression leaves out, and a dictionary of the copies and their
+    originals.  Returns (root, None) if it leaves out nothing, and
+    (None, None) if it leaves out the root."""
+
+    if not expression.includes(elementtags(root)):
+        return None, None
+    if all(expression.includes(elementtags(e)) for e in root.iter()):
+        return root, None
+
+    originals = {}
+
+    def copy(elem):
+        new = ET.Element(elem.tag, elem.attrib)
+        new.text = elem.text
+        new.tail = elem.tail
+        originals[new] = elem
+        for child in elem:
+            if expression.includes(elementtags(child)):
+                new.append(copy(child))
+            elif child.tail:
+                # Keep the text that follows the left out element.
+                if len(new):
+                    new[-1].tail = (new[-1].tail or '') + child.tail
+                else:
+                    new.text = (new.text or '') + child.tail
+        return new
+
+    return copy(root), originals
+
+def view(node, target):
+    """Returns the root node of the content of a flarenode.Node's
+    document that a Target includes, or None if the target leaves out
+    the whole document.  If the target leaves out nothing, the root
+    node is of the same document.  Otherwise, it is of a copy, and
+    Node.original() returns the element that an element of the copy
+    came from."""
+
+    root, copies = prune(node.root().element(), target.expression)
+    if root is None:
+        return None
+    if copies is None:
+        return node.root()
+
+    document = node.document()
+    new = {k: v for k, v in document.items() if k not in ('toc', 'conditions')}
+    originals = new['originals'] = {}
+    origins = document.get('origins')
+    if origins:
+        new['origins'] = {}
+    # A view of a view refers to the elements of the first document.
+    source = document.get('originals', {})
+    sources = {}
+    for copy, old in copies.items():
+        originals[copy] = source.get(old, old)
+        sources[copy] = (node, old)
+        if origins and old in origins:
+            new['origins'][copy] = origins[old]
+
+    return node.copy(root, sources, new)
@@ -29,19 +29,23 @@ attribute for an element. In this module, we use the former; "style"
 here means a combination of the element's tag and class attribute. For
 more information, see the style() method.
 
-For examples of using this interface and to test this module, see
-class TestNode.
+For examples of using this interface, see class TestNode in
+tests/test_flarenode.py.
 
 """
 
 import xml.etree.ElementTree as ET
-import unittest
+import xml.parsers.expat
+import io
 import os
 
+from flarelint import links
+
 _FLARE_LANG_DEFAULT = "en-us"
 
 _FLARE_NAMESPACE_URI = 'http://www.madcapsoftware.com/Schemas/MadCap.xsd'
 _FLARE_PREFIX = 'MadCap'
+_CONDITIONS = '{' + _FLARE_NAMESPACE_URI + '}conditions'
 _NAMESPACES = {
     _FLARE_PREFIX : _FLARE_NAMESPACE_URI,
     'xml': 'http://www.w3.org/XML/1998/namespace'}
@@ -49,7 +53,8 @@ _NAMESPACES = {
 class Node:
     """A Flare-friendly representation of a node in an XML file."""
 
-    def __init__(self, element, parents, projectlang=_FLARE_LANG_DEFAULT):
+    def __init__(self, element, parents, projectlang=_FLARE_LANG_DEFAULT, positions=None,
+                 document=None):
         """Initialize an instance.
 
         The argument 'element' is an 'Element' object from
@@ -63,20 +68,36 @@ class Node:
 
         parents = {c:p for p in root.iter() for c in p}
 
+        The optional 'positions' argument gives the (line, column) of
+        elements in the source file through its get() method, like a
+        dictionary.  parse() finds them only when they are needed.
+
+        The optional 'document' argument is a dictionary shared by the
+        nodes of a document: its 'path', if known, and models of the
+        whole document, like the TOC model, computed once.  See
+        document().
+
         """
 
         self._elem = element
         self._parents = parents
         self._projectlang = projectlang
+        self._positions = positions
+        self._document = document if document is not None else {}
         self._position = 0
 
+    def _node(self, element):
+        """Returns a Node for another element in the same document."""
+
+        return Node(element, self._parents, self._projectlang, self._positions, self._document)
+
     def iter(self):
         """Iterate over the Node and its children, recursively."""
 
         yield self
         children = list(self._elem)
         for e in children:
-            yield from Node(e, self._parents).iter()
+            yield from self._node(e).iter()
 
     def _isempty(self):
         return self == EMPTY
@@ -108,7 +129,7 @@ class Node:
     def _matchsibling(self, siblings, name, predicate):
         pos = 0
         for c in siblings:
-            n = Node(c, self._parents)
+            n = self._node(c)
             if n._namematches(name):
                 n._position = pos
                 pos = pos + 1
@@ -117,7 +138,7 @@ class Node:
         return EMPTY
 
     def _matchancestor(self, start, name, predicate):
-        a = Node(start, self._parents)
+        a = self._node(start)
         pos = 0
         while a._elem is not None:
             if a._namematches(name):
@@ -125,12 +146,12 @@ class Node:
                 pos = pos + 1
                 if predicate(a):
                     return a
-            a = Node(self._parents.get(a._elem, None), self._parents)
+            a = self._node(self._parents.get(a._elem, None))
         return EMPTY
 
     def _matchdescendant(self, start, name, predicate, pos):
         for c in start:
-            n = Node(c, self._parents)
+            n = self._node(c)
             if n._namematches(name):
                 n._position = pos
                 pos = pos + 1
@@ -155,17 +176,22 @@ class Node:
     def lang(self, tag):
         """Returns True if the node or its nearest ancestor has an xml:lang
         attribute that matches tag, ingoring letter case.  If there is
-        no attribute then use Flare's default, "en-us".
+        no attribute then use the project's language, which every node
+        of a document shares, or else Flare's default, "en-us".
 
         See https://www.w3.org/International/articles/language-tags/
         for details.
 
         """
 
-        langnode = self.ancestor_or_self('*', lambda n: n.attribute("xml:lang"))
-        langattr = langnode.attribute("xml:lang") if langnode else self._projectlang
+        return self.language().casefold().startswith(tag.casefold())
+
+    def language(self):
+        """Returns the language tag of the node: the xml:lang attribute of
+        the node or its nearest ancestor, or Flare's default."""
 
-        return langattr.casefold().startswith(tag.casefold())
+        langnode = self.ancestor_or_self('*', lambda n: n.attribute("xml:lang"))
+        return langnode.attribute("xml:lang") if langnode else self._projectlang
 
     def name(self):
         """Returns tag name of the node."""
@@ -177,6 +203,36 @@ class Node:
 
         return n
 
+    def tagpath(self):
+        """Returns the tag names of the node's ancestors and itself,
+        from the root, separated by slashes.  For example,
+        "html/body/ul/li".  The empty node has the empty path."""
+
+        names = []
+        e = self._elem
+        while e is not None:
+            names.append(self._node(e).name())
+            e = self._parents.get(e, None)
+
+        return '/'.join(reversed(names))
+
+    def origin(self):
+        """Returns the (path, element) of the snippet file and element that
+        an element of a tree with expanded snippets came from, or None if
+        it came from the document itself."""
+
+        origins = self._document.get('origins')
+        return origins.get(self._elem) if origins and not self._isempty() else None
+
+    def sourceposition(self):
+        """Returns the (line, column) of the element's start tag in its
+        source file, both counting from 1, or (0, 0) if unknown."""
+
+        if self._isempty() or not self._positions:
+            return (0, 0)
+
+        return self._positions.get(self._elem, (0, 0))
+
     def text(self):
         """Returns the text in an element, ignoring text in descendant elements."""
 
@@ -290,7 +346,7 @@ class Node:
         if self._isempty() or self._parents.get(self._elem, None) is None:
             return EMPTY
 
-        parent = Node(self._parents[self._elem], self._parents)
+        parent = self._node(self._parents[self._elem])
 
         if parent._namematches(name) and predicate(parent):
             return parent
@@ -419,11 +475,82 @@ class Node:
         return tagmatch and classmatch
 
     def hascondition(self, cond):
-        """Returns true if self has a condition, 'cond'."""
-        condNode = self.ancestor_or_self("*",
-                                         lambda n:
-                                         cond in n.attribute("MadCap:conditions"))
-        return bool(condNode)
+        """Returns true if self has a condition, 'cond', itself or through
+        an ancestor.  The condition is either a full tag name, like
+        "Default.Internal", or a tag name without its condition tag
+        set, like "Internal".  See also conditions.of()."""
+
+        e = self._elem
+        while e is not None:
+            value = e.get(_CONDITIONS)
+            if value is None and e.tag == 'TocEntry':
+                value = e.get('Conditions')
+            if value:
+                for c in value.split(','):
+                    c = c.strip()
+                    if c and (c == cond or c.rpartition('.')[2] == cond):
+                        return True
+            e = self._parents.get(e)
+        return False
+
+    def element(self):
+        """Returns the xml.etree.ElementTree element of the node, or None
+        for EMPTY."""
+
+        return self._elem
+
+    def document(self):
+        """Returns the dictionary that the nodes of a document share: its
+        'path', if known, and whatever other modules compute once for
+        the whole document, like the TOC model of toc.of()."""
+
+        return self._document
+
+    def root(self):
+        """Returns the node of the document's root element."""
+
+        if self._isempty():
+            return EMPTY
+        e = self._elem
+        while e in self._parents:
+            e = self._parents[e]
+        return self._node(e)
+
+    def path(self):
+        """Returns the path of the file that the node came from: its
+        snippet, or else its document, or None if unknown."""
+
+        origin = self.origin()
+        return origin[0] if origin else self._document.get('path')
+
+    def copy(self, root, copies, document):
+        """Returns the root node of a tree of copied elements, like a view
+        of the document for a target or a topic with its snippets
+        expanded.  The argument 'copies' maps each element of the
+        tree to the (node, element) that it copies, where the node is
+        any node of that element's document, for sourceposition().
+        The argument 'document' is the new tree's shared dictionary.
+        If it has 'originals', a dictionary of copies and the elements
+        they came from, original() returns those."""
+
+        parents = {c:p for p in root.iter() for c in p}
+        return Node(root, parents, self._projectlang, _CopiedPositions(copies), document)
+
+    def original(self):
+        """Returns the element that the node's element came from, in a view
+        of a document for a target, or else the element itself."""
+
+        if self._isempty():
+            return None
+        originals = self._document.get('originals')
+        return originals.get(self._elem, self._elem) if originals else self._elem
+
+    def resolve(self, link):
+        """Returns the path of the file that a link in the node's file
+        refers to, or None if the link is not to a file of the project
+        or the path of the node's file is unknown."""
+
+        return links.resolve(link, self.path())
 
     def toclevel(self):
         """Returns the depth of a TocEntry in a TOC. Level 0 is the top level."""
@@ -458,15 +585,129 @@ def whenself(tag):
     testing and matching.
     """
 
-    return lambda n: n.iselement(tag)
+    match = lambda n: n.iselement(tag)
+    match.tags = [tag]
+    return match
+
+def _qualify(name):
+    """Converts an expat namespace-qualified name to ElementTree's."""
+
+    return '{' + name if '}' in name else name
+
+def _parsepositions(source):
+    """Parse XML like ET.parse() but also note where each element
+    starts.  Returns the root element and a dictionary of elements and
+    their (line, column).  The source is a file object open in binary
+    mode."""
+
+    builder = ET.TreeBuilder()
+    parser = xml.parsers.expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    positions = {}
+
+    def start(tag, attrs):
+        elem = builder.start(_qualify(tag), {_qualify(k): v for k, v in attrs.items()})
+        positions[elem] = (parser.CurrentLineNumber, parser.CurrentColumnNumber + 1)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = lambda tag: builder.end(_qualify(tag))
+    parser.CharacterDataHandler = builder.data
+
+    try:
+        parser.ParseFile(source)
+    except xml.parsers.expat.ExpatError as e:
+        raise _parseerror(e) from None
+
+    return builder.close(), positions
+
+def _parseerror(e):
+    """Converts an expat error to the ET.ParseError that parse() raises."""
+
+    err = ET.ParseError(xml.parsers.expat.ErrorString(e.code))
+    err.code = e.code
+    err.position = (e.lineno, e.offset + 1)
+    return err
+
+def wellformed(path):
+    """Raises ET.ParseError like parse() if a file is not well-formed
+    XML.  Builds no tree, so it costs much less than parse()."""
+
+    parser = xml.parsers.expat.ParserCreate(namespace_separator='}')
+    with open(path, 'rb') as f:
+        try:
+            parser.ParseFile(f)
+        except xml.parsers.expat.ExpatError as e:
+            raise _parseerror(e) from None
+
+class _Positions:
+    """The (line, column) of each element of a tree parsed by parse() or
+    fromstring().  The C parser does not report them, so the source is
+    parsed again, with expat, the first time one is needed: usually
+    only for files that have results."""
+
+    def __init__(self, root, source):
+        self._root = root
+        self._source = source
+        self._found = None
+
+    def _find(self):
+        try:
+            if isinstance(self._source, bytes):
+                other, positions = _parsepositions(io.BytesIO(self._source))
+            else:
+                with open(self._source, 'rb') as f:
+                    other, positions = _parsepositions(f)
+        except (ET.ParseError, OSError):
+            return {}
+        # Both parsers build the same elements, in the same order.
+        return {e: positions[o] for e, o in zip(self._root.iter(), other.iter())}
+
+    def get(self, element, default=None):
+        if self._found is None:
+            self._found = self._find()
+        return self._found.get(element, default)
+
+class _CopiedPositions:
+    """The positions of copied elements: a dictionary of each copy and
+    the (node, element) it came from."""
+
+    def __init__(self, copies):
+        self._copies = copies
+
+    def get(self, element, default=None):
+        found = self._copies.get(element)
+        if not found or not found[0]._positions:
+            return default
+        return found[0]._positions.get(found[1], default)
+
+def _rootnode(root, source, projectlang, path=None):
+    parents = {c:p for p in root.iter() for c in p}
+    return Node(root, parents, projectlang, _Positions(root, source), {'path': path})
+
+def _parse(source):
+    """Parse XML with the C parser, with error positions that count
+    columns from 1, like _parsepositions()."""
+
+    try:
+        return ET.parse(source).getroot()
+    except ET.ParseError as e:
+        e.position = (e.position[0], e.position[1] + 1)
+        raise
 
 def parse(path, projectlang=_FLARE_LANG_DEFAULT):
     """Parse an XML-based Flare project file and return its root node,
     ready to iterate."""
 
-    root = ET.parse(path).getroot()
-    parents = {c:p for p in root.iter() for c in p}
-    return Node(root, parents, projectlang)
+    return _rootnode(_parse(path), path, projectlang, path)
+
+def fromstring(data, projectlang=_FLARE_LANG_DEFAULT, path=None):
+    """Like parse(), but parse the contents of a file, as bytes or a
+    string, instead of reading it.  The optional path is where the
+    contents belong, to resolve links to other files."""
+
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return _rootnode(_parse(io.BytesIO(data)), data, projectlang, path)
 
 def get_project_lang(path):
     """Get the language specified in a project file."""
@@ -475,241 +716,3 @@ def get_project_lang(path):
     project = parse(path)
     langattr = project.attribute("xml:lang")
     return langattr.casefold() if langattr else _FLARE_LANG_DEFAULT
-
-class TestNode(unittest.TestCase):
-    """Test the Node class."""
-
-    root = ET.fromstring("<root xmlns:"
-                         + _FLARE_PREFIX
-                         + "='" + _FLARE_NAMESPACE_URI
-                         + """'>
-  <a xml:lang="fr-ca" MadCap:a = 'Alligator' b = 'Buffalo'>
-    Ant
-    <b>Bonobo</b>
-    eater
-    <b>Bee</b>
-    <b>Bandicoot</b>
-  </a>
-
-  <d>Dog</d>
-
-  <e e = 'Caterpillar'>
-  </e>
-
-  <a c = 'Crawfish'>
-    <b>Banshee<c>Cat</c><c>Crocodile</c></b>
-    <MadCap:b>Bobcat</MadCap:b>
-  </a>
-</root>
-""")
-
-    parents = {c:p for p in root.iter() for c in p}
-
-    def normalize_words(text):
-        return ' '.join(text.split())
-
-    def test_name(self):
-        n = Node(self.root, self.parents)
-        self.assertEqual(n.name(), 'root')
-
-        n = Node(self.root.find('.//MadCap:b', _NAMESPACES), self.parents)
-        self.assertEqual(n.name(), 'MadCap:b')
-
-    def test_text(self):
-        n = Node(self.root.find('.//a/b/c'), self.parents)
-        self.assertEqual(n.text(), 'Cat')
-        n = Node(self.root.find('.//a'), self.parents)
-        self.assertEqual(n.text().split(), ['Ant', 'eater'])
-        self.assertEqual(n.valueof().split(),
-                         ['Ant', 'Bonobo', 'eater', 'Bee', 'Bandicoot'])
-        n = Node(self.root.find('.//a/b'), self.parents)
-        self.assertEqual(n.parent('a').text().split(),
-                         ['Ant',  'eater'])
-        self.assertEqual(n.parent('a').valueof().split(),
-                         ['Ant', 'Bonobo', 'eater', 'Bee', 'Bandicoot'])
-
-
-    def test_tttribute(self):
-        n = Node(self.root.find('.//a'), self.parents)
-        self.assertEqual(n.attribute('MadCap:a'), 'Alligator')
-        self.assertEqual(n.attribute('b'), 'Buffalo')
-        self.assertEqual(n.attribute('c'), '')
-
-    def test_indexof(self):
-        n = Node(self.root, self.parents)
-        self.assertTrue(n.indexof() == 0)
-
-        e = n.child('z') # Empty element.
-        self.assertTrue(e.indexof() == -1)
-
-        a1 = n.child('a')
-        d2 = a1.followingsibling('d')
-        a3 = a1.followingsibling('a')
-        self.assertTrue(a1.indexof() == 0)
-        self.assertTrue(d2.indexof() == 1)
-        self.assertTrue(a3.indexof() == 3)
-
-    def test_child(self):
-        n = Node(self.root, self.parents)
-        self.assertTrue(n.child('a'))
-        self.assertFalse(n.child('b'))
-        self.assertTrue(n.child('a', lambda n: n.attribute('b') == 'Buffalo'))
-        self.assertFalse(n.child('a', lambda n: n.attribute('c') == 'Buffalo'))
-        self.assertTrue(n.child('a', lambda n: n.child('b')))
-        self.assertFalse(n.child('a', lambda n: n.child('c')))
-        self.assertEqual(n.child('*').name(), 'a')
-        self.assertTrue(n.child('a', lambda n: n.position() == 0))
-        self.assertTrue(n.child('d', lambda n: n.position() == 0))
-        self.assertTrue(n.child('a', lambda n: n.position() == 1))
-        self.assertTrue(n.child('*', lambda n: n.position() == 0 and n.name() == 'a'))
-        self.assertTrue(n.child('*', lambda n: n.position() == 1 and n.name() == 'd'))
-        self.assertTrue(n.child('*', lambda n: n.position() == 3
-                                and n.name() == 'a'))
-        self.assertTrue(n.child('a', lambda n: n.position() == 0
-                                and n.attribute('MadCap:a') == 'Alligator'))
-        self.assertTrue(n.child('a', lambda n: n.position() == 1
-                                and n.attribute('c') == 'Crawfish'))
-
-    def test_iselement(self):
-        n = Node(self.root.find('.//a'), self.parents)
-        self.assertTrue(n.iselement('a'))
-        self.assertFalse(n.iselement('b'))
-        self.assertTrue(n.iselement('a', lambda n: n.attribute('MadCap:a') == 'Alligator'))
-
-    def test_parent(self):
-        n = Node(self.root.find('.//a'), self.parents)
-
-        self.assertTrue(n.parent('root'))
-        self.assertFalse(n.parent('z'))
-
-    def test_ancestor_or_self(self):
-        n = Node(self.root.find('.//c'), self.parents)
-        self.assertTrue(n.ancestor_or_self('c'))
-        self.assertTrue(n.ancestor_or_self('b'))
-        self.assertTrue(n.ancestor_or_self('a'))
-        self.assertTrue(n.ancestor_or_self('root'))
-
-        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 0 and n.name() == 'c'))
-        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 1 and n.name() == 'b'))
-        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 2 and n.name() == 'a'))
-        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 3 and n.name() == 'root'))
-
-        self.assertTrue(n.ancestor_or_self('c', lambda n: n.position() == 0))
-        self.assertTrue(n.ancestor_or_self('b', lambda n: n.position() == 0))
-        self.assertFalse(n.ancestor_or_self('b', lambda n: n.position() == 1))
-        self.assertTrue(n.ancestor_or_self('a', lambda n: n.position() == 0))
-        self.assertFalse(n.ancestor_or_self('a', lambda n: n.position() == 2))
-        self.assertTrue(n.ancestor_or_self('root', lambda n: n.position() == 0))
-        self.assertFalse(n.ancestor_or_self('root', lambda n: n.position() == 3))
-        self.assertFalse(n.ancestor_or_self('d'))
-
-    def test_ancestor(self):
-        n = Node(self.root.find('.//c'), self.parents)
-        self.assertFalse(n.ancestor('c'))
-        self.assertTrue(n.ancestor('b'))
-        self.assertTrue(n.ancestor('a'))
-        self.assertTrue(n.ancestor('root'))
-
-        self.assertFalse(n.ancestor('*', lambda n: n.position() == 0 and n.name() == 'c'))
-        self.assertTrue(n.ancestor('*', lambda n: n.position() == 0 and n.name() == 'b'))
-        self.assertTrue(n.ancestor('*', lambda n: n.position() == 1 and n.name() == 'a'))
-        self.assertTrue(n.ancestor('*', lambda n: n.position() == 2 and n.name() == 'root'))
-
-        self.assertTrue(n.ancestor('b', lambda n: n.position() == 0))
-        self.assertFalse(n.ancestor('b', lambda n: n.position() == 1))
-        self.assertTrue(n.ancestor('a', lambda n: n.position() == 0))
-        self.assertFalse(n.ancestor('a', lambda n: n.position() == 2))
-        self.assertTrue(n.ancestor('root', lambda n: n.position() == 0))
-        self.assertFalse(n.ancestor('root', lambda n: n.position() == 3))
-        self.assertFalse(n.ancestor('d'))
-
-    def test_descendant_or_self(self):
-        n = Node(self.root, self.parents)
-        self.assertTrue(n.descendant_or_self('root'))
-        self.assertTrue(n.descendant_or_self('a'))
-        self.assertTrue(n.descendant_or_self('a', lambda n: n.position() == 0))
-        self.assertTrue(n.descendant_or_self('d', lambda n: n.position() == 0))
-        self.assertTrue(n.descendant_or_self('a', lambda n: n.position() == 1))
-
-        self.assertTrue(
-            n.descendant_or_self('*', lambda n: n.position() == 0 and n.name() == 'root'))
-        self.assertTrue(
-            n.descendant_or_self('*', lambda n: n.position() == 1 and n.name() == 'a'))
-        self.assertTrue(
-            n.descendant_or_self('*', lambda n: n.position() == 2 and n.name() == 'b'))
-        self.assertTrue(
-            n.descendant_or_self('*', lambda n: n.position() == 3 and n.name() == 'b'))
-        self.assertTrue(
-            n.descendant_or_self('*', lambda n: n.position() == 5 and n.name() == 'd'))
-
-    def test_descendant(self):
-        n = Node(self.root, self.parents)
-        self.assertFalse(n.descendant('root'))
-        self.assertTrue(n.descendant('a'))
-        self.assertTrue(n.descendant('a', lambda n: n.position() == 0))
-        self.assertTrue(n.descendant('a', lambda n: n.position() == 1))
-
-        self.assertTrue(n.descendant('*', lambda n: n.position() == 0 and n.name() == 'a'))
-        self.assertTrue(n.descendant('*', lambda n: n.position() == 1 and n.name() == 'b'))
-        self.assertTrue(n.descendant('*', lambda n: n.position() == 2 and n.name() == 'b'))
-        self.assertTrue(n.descendant('*', lambda n: n.position() == 4 and n.name() == 'd'))
-
-    def test_precedingsibling(self):
-        n = Node(self.root.find('.//a'), self.parents)
-        n = n.child('b', lambda n: n.position() == 2)
-        self.assertTrue(n.precedingsibling('b'))
-        self.assertTrue(
-            n.precedingsibling('b', lambda n: n.position() == 0 and n.text() == 'Bee'))
-        self.assertTrue(
-            n.precedingsibling('b', lambda n: n.position() == 1 and n.text() == 'Bonobo'))
-        self.assertFalse(n.precedingsibling('a'))
-
-        n = Node(self.root.find('.//d'), self.parents)
-        self.assertTrue(n.precedingsibling('a'))
-        self.assertFalse(n.precedingsibling('root'))
-
-    def test_previousandnextsibling(self):
-        n = Node(self.root.find('.//e'), self.parents)
-        self.assertTrue(n.previoussibling('d'))
-        self.assertTrue(n.nextsibling('a', lambda n: n.attribute('c') == 'Crawfish'))
-
-    def test_followingsibling(self):
-        n = Node(self.root.find('.//a'), self.parents)
-        self.assertTrue(n.followingsibling('d'))
-        self.assertTrue(n.followingsibling('a'))
-        self.assertFalse(n.followingsibling('b'))
-
-        self.assertTrue(n.followingsibling('*', lambda n: n.iselement('d') and n.position() == 0))
-        self.assertTrue(n.followingsibling('*', lambda n: n.iselement('a') and n.position() == 2))
-
-    def test_chaining(self):
-        n = Node(self.root, self.parents)
-        self.assertTrue(n.iselement('root').child('a'))
-        self.assertFalse(n.iselement('z').child('a'))
-        self.assertFalse(n.iselement('z').iselement('a'))
-        self.assertFalse(n.iselement('z').ancestor_or_self('a'))
-        self.assertFalse(n.iselement('z').ancestor('a'))
-        self.assertFalse(n.iselement('z').descendant_or_self('a'))
-        self.assertFalse(n.iselement('z').descendant('a'))
-        self.assertFalse(n.iselement('z').followingsibling('a'))
-        self.assertFalse(n.iselement('z').precedingsibling('a'))
-        self.assertFalse(n.iselement('z').parent('*'))
-        self.assertFalse(n.iselement('z').name())
-        self.assertFalse(n.iselement('z').text())
-        self.assertFalse(n.iselement('z').attribute('a'))
-        self.assertFalse(n.iselement('z').position())
-        self.assertTrue(n.iselement('z').indexof() == -1)
-
-    def test_lang(self):
-        n = Node(self.root, self.parents)
-        self.assertTrue(n.lang('en-us'))
-        self.assertTrue(n.lang('en'))
-        self.assertTrue(n.lang('EN'))
-        self.assertTrue(n.child('a').lang('fr'))
-        self.assertFalse(n.child('a').lang('en-us'))
-        self.assertTrue(n.child('a').child('b').lang('fr-ca'))
-        self.assertFalse(n.child('a').child('b').lang('fr-ca-DURP'))
-        self.assertFalse(n.child('a').child('b').lang('en'))
-
-if __name__ == '__main__':
-    unittest.main()
@@ -0,0 +1,195 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Machine-readable outputs for dashboards and continuous integration.
+
+Like report.HtmlReport, each output receives the results of a file as
+soon as the scan finishes it, through its file() method, and writes
+them right away.  The close() method receives the final statistics and
+finishes the output.
+
+The formats are:
+
+  jsonl   JSON Lines: one JSON object per result.
+  sarif   SARIF 2.1.0, for code scanning tools.
+  junit   JUnit XML, one test suite per file and one failing test
+          case per result.
+
+"""
+
+import html
+import json
+import os
+import pathlib
+import sys
+from xml.sax.saxutils import escape, quoteattr
+
+from flarelint import resources
+
+# Rules have few distinct messages, so convert each one only once.
+_plainmessages = {}
+
+def plainmessage(msg):
+    """Returns a rule message as plain text: character references
+    replaced, and lines of each paragraph joined. The markdown-like
+    formatting characters are kept."""
+
+    plain = _plainmessages.get(msg)
+    if plain is None:
+        paragraphs = html.unescape(msg).split('\n\n')
+        plain = _plainmessages[msg] = '\n\n'.join(
+            ' '.join(p.split()) for p in paragraphs if p.strip())
+    return plain
+
+def record(r):
+    """Returns a dictionary of the fields of a result."""
+
+    return {
+        'file': r.path,
+        'level': r.level,
+        'rule': r.ruleid,
+        'tag': r.tag,
+        'context': r.context,
+        'message': plainmessage(r.message),
+        'line': r.line,
+        'column': r.column,
+    }
+
+class _Output:
+    """Base class for outputs that write to a text stream."""
+
+    def __init__(self, stream, owned=False):
+        self._stream = stream
+        self._owned = owned
+
+    def file(self, path, results):
+        pass
+
+    def close(self, statistics):
+        if self._owned:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+class JsonLines(_Output):
+    """One JSON object per line for each result."""
+
+    def file(self, path, results):
+        for r in results:
+            self._stream.write(json.dumps(record(r)))
+            self._stream.write('\n')
+        if results:
+            self._stream.flush()
+
+class Sarif(_Output):
+    """A SARIF log with a single run.
+
+    SARIF is a single JSON document, so this output writes the opening
+    of the document, then each result as it comes, then the tool
+    description with the rules that were broken.
+    """
+
+    _LEVELS = {resources.ERROR_LEVEL: 'error', resources.WARNING_LEVEL: 'warning'}
+
+    def __init__(self, stream, owned=False):
+        super().__init__(stream, owned)
+        self._rules = {}
+        self._first = True
+        self._stream.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+                           '"version": "2.1.0", "runs": [{"results": [\n')
+
+    def _result(self, r):
+        location = {'artifactLocation': {'uri': pathlib.Path(os.path.abspath(r.path)).as_uri()}}
+        if r.line:
+            location['region'] = {'startLine': r.line, 'startColumn': r.column or 1}
+        self._rules.setdefault(r.ruleid, r.message)
+
+        return {
+            'ruleId': r.ruleid,
+            'level': self._LEVELS.get(r.level, 'note'),
+            'message': {'text': plainmessage(r.message)},
+            'locations': [{'physicalLocation': location}],
+            'properties': {'tag': r.tag, 'context': r.context},
+        }
+
+    def file(self, path, results):
+        for r in results:
+            if not self._first:
+                self._stream.write(',\n')
+            self._first = False
+            self._stream.write(json.dumps(self._result(r)))
+        if results:
+            self._stream.flush()
+
+    def close(self, statistics):
+        driver = {
+            'name': 'FlareLint',
+            'version': resources.VERSION,
+            'rules': [{'id': i, 'shortDescription': {'text': plainmessage(m).split('. ')[0]}}
+                      for i, m in sorted(self._rules.items(), key=lambda i: str(i[0]))],
+        }
+        self._stream.write('\n], "tool": {"driver": ' + json.dumps(driver) + '}}]}\n')
+        super().close(statistics)
+
+class JUnit(_Output):
+    """JUnit XML with a test suite for each file that has results."""
+
+    def __init__(self, stream, owned=False):
+        super().__init__(stream, owned)
+        self._stream.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites name="FlareLint">\n')
+
+    def file(self, path, results):
+        if not results:
+            return
+
+        self._stream.write('  <testsuite name={0} tests="{1}" failures="{1}">\n'.format(
+            quoteattr(path), len(results)))
+        for r in results:
+            name = '{0} {1}'.format(r.ruleid, r.tag)
+            if r.line:
+                name += ' line {0}'.format(r.line)
+            self._stream.write('    <testcase classname={0} name={1}>\n'.format(
+                quoteattr(path), quoteattr(name)))
+            self._stream.write('      <failure type={0} message={1}>{2}</failure>\n'.format(
+                quoteattr(r.level), quoteattr(r.context), escape(plainmessage(r.message))))
+            self._stream.write('    </testcase>\n')
+        self._stream.write('  </testsuite>\n')
+        self._stream.flush()
+
+    def close(self, statistics):
+        self._stream.write('</testsuites>\n')
+        super().close(statistics)
+
+FORMATS = {
+    'jsonl': JsonLines,
+    'sarif': Sarif,
+    'junit': JUnit,
+}
+
+def open_output(fmt, path):
+    """Returns an output in the named format that writes to path, or to
+    standard output if path is '-'."""
+
+    if path == '-':
+        return FORMATS[fmt](sys.stdout)
+
+    return FORMATS[fmt](open(path, 'w', encoding='utf-8', newline='\n'), owned=True)
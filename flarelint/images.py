@@ -0,0 +1,260 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""An inventory of a project's images, from their headers alone.
+
+Rules that check images by the extension in an img element's src
+cannot tell a GIF named .png, or a screenshot too wide for the page.
+of() returns the facts about the image that an img element refers
+to:
+
+  format    'png', 'jpeg', 'gif', or 'svg', from the file's content, or
+            None for other formats.
+  width     Pixels, or None if unknown.
+  height    Pixels, or None if unknown.
+  dpi       Horizontal resolution in dots per inch, for PNG and JPEG
+            files that record it, or None.
+  size      Bytes.
+
+The first call for a project probes every image under its Content
+folder, in parallel, reading only the first bytes of each file.  After
+that, only new and changed images are probed; projectcache.py says
+when the inventory looks for them.
+"""
+
+import os
+import re
+import struct
+
+from flarelint import links
+from flarelint import projectcache
+
+# Extensions of the files that the inventory probes.
+EXTENSIONS = frozenset(['.png', '.jpg', '.jpeg', '.gif', '.svg', '.bmp', '.tif', '.tiff'])
+
+# Bytes of an SVG file to search for the svg element.
+_SVG_HEAD = 4096
+
+_WORKERS = 8
+
+class Image:
+    """The facts about an image file."""
+
+    __slots__ = ['format', 'width', 'height', 'dpi', 'size']
+
+    def __init__(self, format, width, height, dpi, size):
+        self.format = format
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self.size = size
+
+    def __repr__(self):
+        return 'Image({0!r}, {1}, {2}, {3}, {4})'.format(
+            self.format, self.width, self.height, self.dpi, self.size)
+
+def _png(f):
+    f.seek(16)
+    width, height = struct.unpack('>II', f.read(8))
+    # Skip the rest of IHDR and its CRC.
+    f.seek(33)
+    dpi = None
+    # Walk the chunk headers up to the image data, for pHYs.
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, kind = struct.unpack('>I4s', header)
+        if kind in (b'IDAT', b'IEND'):
+            break
+        if kind == b'pHYs' and length >= 9:
+            x, y, unit = struct.unpack('>IIB', f.read(9))
+            if unit == 1:
+                dpi = round(x * 0.0254)
+            break
+        f.seek(length + 4, 1)
+    return 'png', width, height, dpi
+
+# JPEG start-of-frame markers, which hold the dimensions.
+_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _jpeg(f):
+    f.seek(2)
+    dpi = None
+    while True:
+        byte = f.read(1)
+        while byte == b'\xff':
+            marker = f.read(1)
+            if marker != b'\xff':
+                break
+        else:
+            return 'jpeg', None, None, dpi
+        marker = ord(marker) if marker else 0xD9
+        if marker == 0xD9 or marker == 0xDA:
+            return 'jpeg', None, None, dpi
+        if 0xD0 <= marker <= 0xD8 or marker == 0x01:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        if marker in _SOF:
+            height, width = struct.unpack('>xHH', f.read(5))
+            return 'jpeg', width, height, dpi
+        if marker == 0xE0 and length >= 16:
+            data = f.read(12)
+            if data[:5] == b'JFIF\0':
+                units, x = struct.unpack('>BH', data[7:10])
+                dpi = x if units == 1 else round(x * 2.54) if units == 2 else None
+            f.seek(length - 2 - 12, 1)
+        else:
+            f.seek(length - 2, 1)
+
+def _gif(f):
+    f.seek(6)
+    width, height = struct.unpack('<HH', f.read(4))
+    return 'gif', width, height, None
+
+_SVG = re.compile(rb'<svg\b[^>]*>', re.I)
+_ATTRIBUTE = rb'''\b%s\s*=\s*["']\s*([0-9.]+)\s*(?:px)?\s*["']'''
+_WIDTH = re.compile(_ATTRIBUTE % b'width')
+_HEIGHT = re.compile(_ATTRIBUTE % b'height')
+_VIEWBOX = re.compile(rb'''\bviewBox\s*=\s*["']\s*[-0-9.]+[\s,]+[-0-9.]+[\s,]+([0-9.]+)[\s,]+([0-9.]+)''')
+
+def _svg(head):
+    tag = _SVG.search(head)
+    if not tag:
+        return None
+    width = _WIDTH.search(tag.group())
+    height = _HEIGHT.search(tag.group())
+    if width and height:
+        size = width.group(1), height.group(1)
+    else:
+        box = _VIEWBOX.search(tag.group())
+        size = box.groups() if box else (None, None)
+    return ('svg',) + tuple(round(float(s)) if s else None for s in size) + (None,)
+
+def probe(path):
+    """Returns the Image for a file, reading only its header, or None if
+    the file cannot be read."""
+
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(_SVG_HEAD)
+            try:
+                if head.startswith(b'\x89PNG\r\n\x1a\n'):
+                    facts = _png(f)
+                elif head.startswith(b'\xff\xd8'):
+                    facts = _jpeg(f)
+                elif head[:6] in (b'GIF87a', b'GIF89a'):
+                    facts = _gif(f)
+                else:
+                    facts = _svg(head)
+            except struct.error:
+                facts = None
+    except OSError:
+        return None
+
+    return Image(*(facts or (None, None, None, None)), size=size)
+
+class Inventory(projectcache.ProjectCache):
+    """The images under a project's Content folder, by path."""
+
+    def __init__(self, projectdir):
+        super().__init__(projectdir)
+        self._dir = os.path.join(projectdir, 'Content')
+        self._images = {}
+
+    def refresh(self):
+        """Probes the images that are new or changed, in parallel."""
+
+        paths = [os.path.join(dirpath, f)
+                 for dirpath, dirnames, filenames in os.walk(self._dir)
+                 for f in filenames if os.path.splitext(f)[1].lower() in EXTENSIONS]
+        images = {}
+        changed = []
+        for p in paths:
+            key = projectcache.key(p)
+            stamp = projectcache.stamp(p)
+            cached = self._images.get(key)
+            if cached is not None and cached[0] == stamp:
+                images[key] = cached
+            else:
+                changed.append((key, p, stamp))
+
+        # Imported here, because it takes long to import and few scans
+        # need it.
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor(_WORKERS) as pool:
+            for (key, p, stamp), image in zip(changed, pool.map(probe, [c[1] for c in changed])):
+                images[key] = (stamp, image)
+
+        self._images = images
+
+    def get(self, path):
+        """Returns the Image for a file, or None if it does not exist."""
+
+        self.current()
+        key = projectcache.key(path)
+        cached = self._images.get(key)
+        if cached is None:
+            # Outside the Content folder, or new since the refresh.
+            stamp = projectcache.stamp(path)
+            if stamp is None:
+                return None
+            found = (stamp, probe(path))
+            with self._lock:
+                cached = self._images.setdefault(key, found)
+        return cached[1]
+
+_inventories = projectcache.Registry(Inventory)
+
+def inventory(projectdir):
+    """Returns the Inventory of a project, the same one each time."""
+
+    return _inventories.get(projectdir)
+
+def invalidate():
+    """Makes each inventory look for new and changed images the next time
+    it is used."""
+
+    _inventories.invalidate()
+
+def image(src, path):
+    """Returns the Image that src refers to from the file at path, or None
+    if there is no such image."""
+
+    target = links.resolve(src, path)
+    if target is None:
+        return None
+    projdir = links.projectdir(target) or links.projectdir(path)
+    if projdir is None:
+        return probe(target) if os.path.isfile(target) else None
+    return inventory(projdir).get(target)
+
+def of(node):
+    """Returns the Image of the file that a flarenode.Node's src attribute
+    refers to, or None if there is no such file or the path of the
+    node's file is unknown."""
+
+    if node.element() is None:
+        return None
+    return image(node.attribute('src'), node.path())
@@ -0,0 +1,66 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Where the links in a Flare project file lead.
+
+Links in Flare files are URLs: either relative to the file, like
+"../Resources/Images/a.png", or from the project folder, like
+"/Content/Topics/a.htm".  These functions find the file that a link
+refers to from the path of the file that contains it.
+"""
+
+import os
+import urllib.parse
+
+# The folders of a project that hold its files.
+_FOLDERS = ('Content', 'Project')
+
+def projectdir(path):
+    """Returns the project folder of a file in its Content or Project
+    folder, or None."""
+
+    d = os.path.dirname(os.path.abspath(path))
+    while os.path.basename(d) not in _FOLDERS:
+        parent = os.path.dirname(d)
+        if parent == d:
+            return None
+        d = parent
+    return os.path.dirname(d)
+
+def resolve(link, path, projdir=None):
+    """Returns the file that a link in the file at path refers to, or
+    None if it is not a link to a file of the project.  Give projdir if
+    it is already known."""
+
+    if not link or not path:
+        return None
+    parts = urllib.parse.urlsplit(link)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+
+    target = urllib.parse.unquote(parts.path).replace('/', os.sep)
+    if not target.startswith(os.sep):
+        return os.path.normpath(os.path.join(os.path.dirname(path), target))
+
+    projdir = projdir or projectdir(path)
+    return os.path.normpath(projdir + target) if projdir else None
@@ -0,0 +1,302 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""A Language Server Protocol server, for lint results as you type.
+
+Start it from an editor's language client with:
+
+  python -m flarelint lsp [--debounce MS]
+
+The server speaks LSP over standard input and output.  It finds the
+Flare project (.flprj) in the workspace folder or the closest folder
+above it, loads the rules once, and then lints each open document
+from the editor's buffer, not from disk:
+
+  - when a document opens or is saved, right away,
+  - when a document changes, once the edits pause for --debounce
+    milliseconds (150 by default).  Only the changed document is
+    linted again.
+
+Results become diagnostics whose range covers the element's start
+tag name.  Like the lint server, the language server keeps the
+project's language and list of files, which it refreshes when the
+editor reports that files were created or deleted.
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+import traceback
+import urllib.parse
+import urllib.request
+
+from flarelint import resources
+from flarelint import rule
+from flarelint import server
+
+# Wait this many seconds after the last edit before linting.
+_DEBOUNCE = 0.15
+
+_SEVERITY = {resources.ERROR_LEVEL: 1, resources.WARNING_LEVEL: 2}
+
+# textDocumentSync: the client sends the whole document on each change.
+_SYNC_FULL = 1
+
+# workspace/didChangeWatchedFiles change types.
+_CREATED = 1
+_DELETED = 3
+
+# window/logMessage types.
+_LOG_ERROR = 1
+
+def _uripath(uri):
+    return urllib.request.url2pathname(urllib.parse.urlparse(uri).path)
+
+def _findproject(folder):
+    """Returns the project file in folder or the closest folder above it,
+    or None."""
+
+    while folder:
+        found = sorted(glob.glob(os.path.join(folder, '*.flprj')))
+        if found:
+            return found[0]
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+    return None
+
+def _utf16(text, column):
+    """Converts a column counted in characters to LSP's UTF-16 code
+    units."""
+
+    prefix = text[:column]
+    return column + sum(1 for c in prefix if ord(c) > 0xFFFF)
+
+def diagnostic(record, lines):
+    """Returns the LSP diagnostic for a result, from formats.record(),
+    given the lines of the document."""
+
+    line = max(record['line'] - 1, 0)
+    text = lines[line] if line < len(lines) else ''
+    start = max(record['column'] - 1, 0)
+    # Cover "<tag", or one character for a parse error.
+    end = start + (len(record['tag']) + 1 if record['tag'] else 1)
+
+    return {
+        'range': {'start': {'line': line, 'character': _utf16(text, start)},
+                  'end': {'line': line, 'character': _utf16(text, end)}},
+        'severity': _SEVERITY.get(record['level'], 3),
+        'code': record['rule'],
+        'source': 'flarelint',
+        'message': record['message'],
+    }
+
+class _Document:
+    def __init__(self, path, text, version):
+        self.path = path
+        self.text = text
+        self.version = version
+        self.timer = None
+
+class LanguageServer:
+    """Handles LSP messages.  Call run() to read them from a stream."""
+
+    def __init__(self, output, debounce=_DEBOUNCE):
+        self._output = output
+        self._debounce = debounce
+        self._writelock = threading.Lock()
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._linter = None
+        self._shutdown = False
+
+    def _send(self, message):
+        message['jsonrpc'] = '2.0'
+        body = json.dumps(message).encode('utf-8')
+        with self._writelock:
+            self._output.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+            self._output.flush()
+
+    def _publish(self, uri, diagnostics, version=None):
+        params = {'uri': uri, 'diagnostics': diagnostics}
+        if version is not None:
+            params['version'] = version
+        self._send({'method': 'textDocument/publishDiagnostics', 'params': params})
+
+    def _log(self, message, kind=_LOG_ERROR):
+        self._send({'method': 'window/logMessage', 'params': {'type': kind, 'message': message}})
+
+    def lint(self, uri):
+        """Lints the current text of an open document and publishes the
+        diagnostics, unless the document changed meanwhile.  If linting
+        fails, logs the error to the editor and publishes no
+        diagnostics."""
+
+        with self._lock:
+            doc = self._documents.get(uri)
+            if doc is None:
+                return
+            path, text, version = doc.path, doc.text, doc.version
+
+        found = []
+        try:
+            if rule.getrules(os.path.splitext(path)[1]) is not None:
+                lines = text.splitlines()
+                found = [diagnostic(r, lines)
+                         for r in self._linter.lintbuffer(path, text)['results']]
+        except Exception:
+            # lint() runs on a timer's thread, where an error would
+            # otherwise go unseen and leave the old diagnostics.
+            self._log(resources.LSP_LINT_FAILED.format(path, traceback.format_exc()))
+            found = []
+
+        with self._lock:
+            doc = self._documents.get(uri)
+            if doc is None or doc.version != version:
+                return
+        self._publish(uri, found, version)
+
+    def _schedule(self, uri, delay):
+        with self._lock:
+            doc = self._documents[uri]
+            if doc.timer is not None:
+                doc.timer.cancel()
+            doc.timer = threading.Timer(delay, self.lint, [uri])
+            doc.timer.daemon = True
+            doc.timer.start()
+
+    def initialize(self, params):
+        folders = params.get('workspaceFolders') or []
+        root = params.get('rootUri')
+        if folders:
+            root = folders[0]['uri']
+        projectpath = _findproject(_uripath(root)) if root else None
+
+        rule.load()
+        self._linter = server.Linter(projectpath)
+        return {'capabilities': {'textDocumentSync': {'openClose': True, 'change': _SYNC_FULL,
+                                                      'save': {'includeText': True}}},
+                'serverInfo': {'name': 'FlareLint', 'version': resources.VERSION}}
+
+    def didopen(self, params):
+        doc = params['textDocument']
+        with self._lock:
+            self._documents[doc['uri']] = _Document(_uripath(doc['uri']), doc['text'],
+                                                    doc.get('version'))
+        self._schedule(doc['uri'], 0)
+
+    def didchange(self, params):
+        uri = params['textDocument']['uri']
+        with self._lock:
+            doc = self._documents.get(uri)
+            if doc is None or not params['contentChanges']:
+                return
+            doc.text = params['contentChanges'][-1]['text']
+            doc.version = params['textDocument'].get('version')
+        self._schedule(uri, self._debounce)
+
+    def didsave(self, params):
+        uri = params['textDocument']['uri']
+        with self._lock:
+            doc = self._documents.get(uri)
+            if doc is None:
+                return
+            if 'text' in params:
+                doc.text = params['text']
+        self._schedule(uri, 0)
+
+    def didclose(self, params):
+        uri = params['textDocument']['uri']
+        with self._lock:
+            doc = self._documents.pop(uri, None)
+            if doc is not None and doc.timer is not None:
+                doc.timer.cancel()
+        self._publish(uri, [])
+
+    def didchangewatchedfiles(self, params):
+        rewalk = False
+        for change in params.get('changes', []):
+            self._linter.invalidate(_uripath(change['uri']))
+            rewalk = rewalk or change.get('type') in (_CREATED, _DELETED)
+        if rewalk:
+            self._linter.invalidate()
+
+    def handle(self, message):
+        """Handles one message. Returns False after the exit
+        notification."""
+
+        method = message.get('method')
+        params = message.get('params') or {}
+        notifications = {
+            'textDocument/didOpen': self.didopen,
+            'textDocument/didChange': self.didchange,
+            'textDocument/didSave': self.didsave,
+            'textDocument/didClose': self.didclose,
+            'workspace/didChangeWatchedFiles': self.didchangewatchedfiles,
+        }
+
+        if method == 'exit':
+            return False
+        if 'id' not in message:
+            if method in notifications and self._linter is not None:
+                notifications[method](params)
+            return True
+
+        if method == 'initialize':
+            self._send({'id': message['id'], 'result': self.initialize(params)})
+        elif method == 'shutdown':
+            self._shutdown = True
+            self._send({'id': message['id'], 'result': None})
+        else:
+            self._send({'id': message['id'],
+                        'error': {'code': -32601, 'message': resources.SERVER_BAD_METHOD.format(method)}})
+        return True
+
+    def run(self, stream):
+        """Reads and handles messages until exit or the end of the stream.
+        Returns the exit status."""
+
+        while True:
+            length = None
+            for line in iter(stream.readline, b''):
+                line = line.strip()
+                if not line:
+                    break
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'content-length':
+                    length = int(value)
+            if length is None:
+                return 0 if self._shutdown else 1
+            if not self.handle(json.loads(stream.read(length))):
+                return 0 if self._shutdown else 1
+
+def serve(debounce=_DEBOUNCE):
+    """Serves LSP on standard input and output."""
+
+    output = sys.stdout.buffer
+    # Rules that print must not corrupt the protocol.
+    sys.stdout = sys.stderr
+    sys.exit(LanguageServer(output, debounce).run(sys.stdin.buffer))
@@ -0,0 +1,181 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Statistics about a scan, for tracking lint debt and run time.
+
+An Aggregate counts as the scan goes: results by rule, level, file
+name extension, and folder, as well as files scanned, elements
+visited, files that could not be parsed, and files skipped without
+parsing.  It also keeps the readability.Counts of the paragraphs of
+topics and snippets, for the percentiles of sentence, paragraph, and
+topic lengths and the reading ease of each topic.  After the scan, it
+also holds the duration of each phase.
+
+Write an Aggregate as JSON with writejson(), or as OpenMetrics text
+with writeopenmetrics(), for example for the textfile collector of the
+Prometheus node exporter.
+
+"""
+
+import json
+import os
+import time
+
+from flarelint import readability
+
+class Aggregate:
+    """Counts from one scan of a project."""
+
+    def __init__(self, projectpath):
+        self.project = projectpath
+        self._projectdir = os.path.dirname(projectpath)
+        self.files = 0
+        self.elements = 0
+        self.parsefailures = 0
+        self.skipped = 0
+        self.byrule = {}
+        self.bylevel = {}
+        self.byextension = {}
+        self.bydirectory = {}
+        self.timings = {}
+        self.readability = readability.Table()
+        self.timestamp = time.time()
+
+    def directory(self, path):
+        """Returns the folder that a file counts in: the project's Content
+        or Project folder and the folder under it, like
+        "Content/Topics"."""
+
+        parts = os.path.relpath(os.path.dirname(path), self._projectdir).split(os.sep)
+        return '/'.join(parts[0:2])
+
+    def file(self, elements):
+        """Counts a scanned file and its elements."""
+
+        self.files += 1
+        self.elements += elements
+
+    def paragraph(self, path, counts):
+        """Counts the readability.Counts of a paragraph in a file."""
+
+        if counts.sentences:
+            self.readability.add(path, counts)
+
+    def result(self, result, extension):
+        """Counts a result."""
+
+        for table, key in [(self.byrule, (result.ruleid or '', result.level)),
+                           (self.bylevel, result.level),
+                           (self.byextension, (extension, result.level)),
+                           (self.bydirectory, (self.directory(result.path), result.level))]:
+            table[key] = table.get(key, 0) + 1
+
+    def asdict(self):
+        """Returns the statistics as a dictionary, ready for JSON."""
+
+        def rows(table, *names):
+            return [dict(zip(names, key), count=count) for key, count in sorted(table.items())]
+
+        text = self.readability.summary()
+        text['byTopic'] = [
+            {'path': os.path.relpath(path, self._projectdir).replace(os.sep, '/'),
+             'words': words, 'sentences': sentences,
+             'readingEase': None if ease is None else round(ease, 2)}
+            for path, words, sentences, ease in self.readability.topics()]
+
+        return {
+            'project': self.project,
+            'timestamp': self.timestamp,
+            'files': self.files,
+            'elements': self.elements,
+            'parseFailures': self.parsefailures,
+            'skipped': self.skipped,
+            'levels': dict(sorted(self.bylevel.items())),
+            'rules': rows(self.byrule, 'rule', 'level'),
+            'extensions': rows(self.byextension, 'extension', 'level'),
+            'directories': rows(self.bydirectory, 'directory', 'level'),
+            'readability': text,
+            'timings': dict(self.timings),
+        }
+
+    def writejson(self, path):
+        _replace(path, json.dumps(self.asdict(), indent=2) + '\n')
+
+    def writeopenmetrics(self, path):
+        _replace(path, openmetrics(self))
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _metric(lines, name, help, samples):
+    lines.append('# TYPE flarelint_{0} gauge'.format(name))
+    lines.append('# HELP flarelint_{0} {1}'.format(name, help))
+    for labels, value in samples:
+        text = ','.join('{0}="{1}"'.format(k, _label(v)) for k, v in labels)
+        lines.append('flarelint_{0}{1} {2}'.format(name, '{' + text + '}' if text else '', value))
+
+def openmetrics(aggregate):
+    """Returns the statistics in the OpenMetrics text format."""
+
+    project = ('project', aggregate.project)
+    lines = []
+    _metric(lines, 'files_scanned', 'Files that rules were applied to.',
+            [([project], aggregate.files)])
+    _metric(lines, 'elements_visited', 'Elements that rules were applied to.',
+            [([project], aggregate.elements)])
+    _metric(lines, 'parse_failures', 'Files that are not well-formed XML.',
+            [([project], aggregate.parsefailures)])
+    _metric(lines, 'files_skipped', 'Files skipped because no rule applies to them.',
+            [([project], aggregate.skipped)])
+    _metric(lines, 'results', 'Results by level.',
+            [([project, ('level', l)], c) for l, c in sorted(aggregate.bylevel.items())])
+    _metric(lines, 'rule_results', 'Results by rule.',
+            [([project, ('rule', r), ('level', l)], c)
+             for (r, l), c in sorted(aggregate.byrule.items())])
+    _metric(lines, 'extension_results', 'Results by file name extension.',
+            [([project, ('extension', e), ('level', l)], c)
+             for (e, l), c in sorted(aggregate.byextension.items())])
+    _metric(lines, 'directory_results', 'Results by folder.',
+            [([project, ('directory', d), ('level', l)], c)
+             for (d, l), c in sorted(aggregate.bydirectory.items())])
+    percentiles = aggregate.readability.summary()['percentiles']
+    _metric(lines, 'readability', 'Percentiles of words per sentence, paragraph, and topic, '
+            'and of the reading ease of topics.',
+            [([project, ('measure', m), ('percentile', p)], v)
+             for m, values in sorted(percentiles.items())
+             for p, v in values.items() if v is not None])
+    _metric(lines, 'phase_seconds', 'Duration of each phase of the last run.',
+            [([project, ('phase', p)], '{0:.6f}'.format(t))
+             for p, t in sorted(aggregate.timings.items())])
+    _metric(lines, 'last_run_timestamp_seconds', 'When the last run started.',
+            [([project], '{0:.3f}'.format(aggregate.timestamp))])
+    lines.append('# EOF')
+
+    return '\n'.join(lines) + '\n'
+
+def _replace(path, text):
+    """Writes a file all at once, so that a collector never reads half of
+    it."""
+
+    with open(path + '.tmp', 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,144 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Find groups of nearly identical texts without comparing every pair.
+
+A text's shingles are its runs of three words, and two texts are alike
+in proportion to the shingles they share (their Jaccard similarity).
+A MinHash signature is a short, fixed-size summary of a text's
+shingles, such that two signatures agree in about that proportion of
+their places.
+
+Locality-sensitive hashing (LSH) then splits each signature into
+bands and puts texts whose band is the same into the same bucket.
+Only texts that share a bucket are compared, and only with one member
+of each group already in the bucket, so finding the groups takes time
+in proportion to the number of texts, rather than its square, even
+when thousands of them are the same.  Buckets are built one band at a
+time, so memory is the signatures plus one band's buckets.
+
+For speed in Python, signature() hashes each shingle once and keeps
+the least hash in each of a few bins (one-permutation hashing), then
+fills empty bins from their neighbours, rather than hashing each
+shingle once for each place of the signature.
+"""
+
+import array
+import re
+import zlib
+
+# Places in a signature, and the bands that LSH splits it into.  With
+# 8 bands of 4, texts that share 80% of their shingles become
+# candidates 98% of the time; texts that share 30%, under 7%.
+SIZE = 32
+BANDS = 8
+
+_WORD = re.compile(r'\w+')
+
+# For filling empty bins: far apart from any hash in a bin.
+_OFFSET = 0x9E3779B1
+
+def words(text):
+    """Returns the words of a text, in lowercase, without punctuation."""
+
+    return _WORD.findall(text.casefold())
+
+def signature(wordlist, size=SIZE):
+    """Returns the MinHash signature of a list of words, as an array of
+    unsigned 32-bit integers."""
+
+    bins = [None] * size
+    for i in range(max(1, len(wordlist) - 2)):
+        data = ' '.join(wordlist[i:i + 3]).encode('utf-8')
+        h = zlib.crc32(data) | zlib.crc32(data, _OFFSET) << 32
+        b = h % size
+        value = (h // size) & 0xFFFFFFFF
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+
+    filled = [i for i in range(size) if bins[i] is not None]
+    if not filled:
+        return array.array('I', [0] * size)
+    # Each empty bin takes the value of the next full one, changed by
+    # the distance, so texts agree on empty bins only if they agree on
+    # the full one.
+    result = array.array('I', bins if len(filled) == size else [0] * size)
+    if len(filled) < size:
+        nxt = filled[0] + size
+        for i in range(size - 1, -1, -1):
+            if bins[i] is not None:
+                nxt = i
+                result[i] = bins[i]
+            else:
+                result[i] = (bins[nxt % size] + (nxt - i) * _OFFSET) & 0xFFFFFFFF
+    return result
+
+def similarity(a, b):
+    """Returns the estimated Jaccard similarity of two signatures."""
+
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+def clusters(signatures, threshold, bands=BANDS):
+    """Returns the groups of the indexes of signatures whose texts are
+    alike, as lists of two or more indexes.  In each group, each
+    signature has at least the threshold similarity to another."""
+
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    if not signatures:
+        return []
+    rows = len(signatures[0]) // bands
+    for band in range(bands):
+        buckets = {}
+        for i, sig in enumerate(signatures):
+            # A collision only adds a candidate, which is checked below.
+            key = hash(sig[band * rows:(band + 1) * rows].tobytes())
+            # A bucket keeps one member of each group in it, so that many
+            # copies of the same text cost one comparison each.
+            members = buckets.setdefault(key, [])
+            joined = False
+            for j in members:
+                a, b = find(j), find(i)
+                if a == b:
+                    joined = True
+                elif similarity(signatures[j], sig) >= threshold:
+                    parent[b] = a
+                    joined = True
+            if not joined:
+                members.append(i)
+            elif len(members) > 1:
+                roots = {}
+                for j in members:
+                    roots.setdefault(find(j), j)
+                members[:] = roots.values()
+
+    groups = {}
+    for i in range(len(signatures)):
+        groups.setdefault(find(i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
@@ -0,0 +1,125 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Facts about some files of a project, kept up to date.
+
+Rules ask about a project's variable sets, stylesheets, and images for
+every element, so each of those modules reads the files once and keeps
+what it learns in a ProjectCache.  A cache looks at the files again
+before answering when they may have changed: after invalidate(), or
+when its last look is more than RECHECK seconds old.  refresh() then
+reads only the files whose stamp() changed.
+
+A scan asks thousands of times a second, so it looks at the files only
+now and then.  A server, an editor, or a program that uses the API
+sees a changed file a moment after the change.
+"""
+
+import os
+import threading
+import time
+
+from flarelint import links
+
+# Seconds for which a cache trusts its last look at the files.
+RECHECK = 2.0
+
+def stamp(path):
+    """Returns what changes when a file changes, its modification time and
+    size, or None if there is no such file."""
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def key(path):
+    """Returns the same key for every spelling of a file's path."""
+
+    return os.path.normcase(os.path.abspath(path))
+
+class ProjectCache:
+    """Facts about some files of a project.  A subclass reads the files
+    in refresh(), and calls current() before each use of the facts."""
+
+    def __init__(self, projectdir):
+        self.projectdir = projectdir
+        self._lock = threading.Lock()
+        self._checked = None
+
+    def refresh(self):
+        """Reads the files that are new or changed since the last call."""
+
+        raise NotImplementedError
+
+    def current(self):
+        """Refreshes the facts, unless the last look at the files is
+        recent."""
+
+        with self._lock:
+            if self._checked is None or time.monotonic() - self._checked > RECHECK:
+                self.refresh()
+                self._checked = time.monotonic()
+
+    def invalidate(self):
+        """Makes the next current() look at the files."""
+
+        self._checked = None
+
+class Registry:
+    """The caches of one kind, one for each project."""
+
+    def __init__(self, cls):
+        self._cls = cls
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def get(self, projectdir):
+        """Returns the cache of a project, the same one each time."""
+
+        with self._lock:
+            cache = self._caches.get(projectdir)
+            if cache is None:
+                cache = self._caches[projectdir] = self._cls(projectdir)
+            return cache
+
+    def forpath(self, path):
+        """Returns the cache of the project of the file at path, or None if
+        the file is not in a project."""
+
+        projdir = links.projectdir(path) if path else None
+        return self.get(projdir) if projdir else None
+
+    def invalidate(self):
+        """Makes each cache look at its files the next time it is used."""
+
+        with self._lock:
+            for cache in self._caches.values():
+                cache.invalidate()
+
+    def forget(self, projectdir):
+        """Drops the cache of a project."""
+
+        with self._lock:
+            self._caches.pop(projectdir, None)
@@ -0,0 +1,252 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Readability: the lengths of sentences, paragraphs, and topics, and
+how easy topics are to read.
+
+counts() counts the words, sentences, and syllables in the text of a
+paragraph, and of() in the text of an element, with the values of
+variables in place.  A Table holds the Counts of many paragraphs in columns,
+arrays of integers, with the topic of each, so that the statistics of
+a whole project are computed in one batch: with NumPy if it is
+installed, and in plain Python otherwise, with the same results.
+
+The reading ease of a topic is its Flesch reading ease score:
+
+  206.835 - 1.015 * words / sentences - 84.6 * syllables / words
+
+Higher is easier: plain English scores 60 to 70, and dense technical
+text 30 or less.  Syllables are estimated with English spelling rules,
+so the score means little for other languages.
+"""
+
+import array
+import functools
+import re
+
+from flarelint import variables
+
+_numpy = {}
+
+def _np():
+    """Returns the numpy module, or None if it is not installed.  It is
+    imported only when first needed, because it takes long to import."""
+
+    if 'module' not in _numpy:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy['module'] = numpy
+    return _numpy['module']
+
+_WORD = re.compile(r"\w+(?:['’.-]\w+)*")
+
+# The end of a sentence: punctuation, maybe with a closing quotation
+# mark or parenthesis, then the end of the text or space and something
+# other than a lowercase letter, so that "e.g. this" is one sentence.
+_SENTENCE_END = re.compile(r'[.!?]+["”’)\]]*(?=\s+[^\sa-z]|\s*$)')
+
+_VOWELS = re.compile(r'[aeiouy]+')
+
+# The percentiles in summary().
+PERCENTILES = [50, 90, 99]
+
+_VARIABLE = '{http://www.madcapsoftware.com/Schemas/MadCap.xsd}variable'
+
+@functools.lru_cache(maxsize=65536)
+def _syllables(word):
+    """Returns an estimate of the number of syllables in an English word
+    in lowercase."""
+
+    count = len(_VOWELS.findall(word))
+    if word.endswith('e') and not word.endswith(('le', 'ee')) and count > 1:
+        count -= 1
+    return max(count, 1)
+
+class Counts:
+    """The words in each sentence of a paragraph, and its syllables."""
+
+    __slots__ = ['sentences', 'syllables']
+
+    def __init__(self, sentences, syllables):
+        self.sentences = sentences
+        self.syllables = syllables
+
+    @property
+    def words(self):
+        return sum(self.sentences)
+
+    @property
+    def longest(self):
+        return max(self.sentences, default=0)
+
+def counts(text):
+    """Returns the Counts of a paragraph's text."""
+
+    sentences = []
+    syllables = 0
+    for sentence in _SENTENCE_END.split(text):
+        words = _WORD.findall(sentence.lower())
+        if words:
+            sentences.append(len(words))
+            syllables += sum(map(_syllables, words))
+
+    return Counts(sentences, syllables)
+
+def of(node):
+    """Returns the Counts of the text of a flarenode.Node's element and
+    its descendants, with the value of each variable in place, as
+    Flare shows it.  The text of each element is counted only once."""
+
+    elem = node.element()
+    cache = node.document().setdefault('readability', {})
+    found = cache.get(elem)
+    if found is None:
+        found = cache[elem] = counts(''.join(_text(elem, node)))
+    return found
+
+def _text(elem, node):
+    """Yields the text of an element like itertext(), but with the
+    values of variables, or their names if the values are unknown."""
+
+    if elem.tag == _VARIABLE:
+        name = elem.get('name', '')
+        index = variables.of(node)
+        variable = index.get(name) if index is not None else None
+        yield variable.value if variable is not None else name
+        return
+
+    if elem.text:
+        yield elem.text
+    for child in elem:
+        yield from _text(child, node)
+        if child.tail:
+            yield child.tail
+
+def readingease(words, sentences, syllables):
+    """Returns the Flesch reading ease score of text with these counts,
+    or None for text without words."""
+
+    if not words or not sentences:
+        return None
+    return 206.835 - 1.015 * words / sentences - 84.6 * syllables / words
+
+def _sums(keys, values, size):
+    """Returns a list of the sums of values by key, for keys 0 to size - 1."""
+
+    numpy = _np()
+    if numpy is not None:
+        return numpy.bincount(numpy.frombuffer(keys, dtype=numpy.uint32),
+                              weights=numpy.frombuffer(values, dtype=numpy.uint32),
+                              minlength=size).astype(numpy.int64).tolist()
+
+    sums = [0] * size
+    for k, v in zip(keys, values):
+        sums[k] += v
+    return sums
+
+def percentiles(values, ps=PERCENTILES):
+    """Returns the percentiles ps of a sequence of numbers, interpolated
+    like numpy.percentile(), or None for each if there are no values."""
+
+    if not len(values):
+        return [None] * len(ps)
+    numpy = _np()
+    if numpy is not None:
+        return [float(v) for v in numpy.percentile(numpy.asarray(values, dtype=float), ps)]
+
+    ordered = sorted(values)
+    result = []
+    for p in ps:
+        rank = (len(ordered) - 1) * p / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        result.append(float(ordered[low] + (ordered[high] - ordered[low]) * (rank - low)))
+    return result
+
+class Table:
+    """The Counts of the paragraphs of many topics, in columns."""
+
+    def __init__(self):
+        self.paths = []
+        self._topics = {}
+        self.topic = array.array('I')
+        self.words = array.array('I')
+        self.sentences = array.array('I')
+        self.longest = array.array('I')
+        self.syllables = array.array('I')
+        # The words of every sentence, of every paragraph.
+        self.sentencewords = array.array('I')
+
+    def __len__(self):
+        return len(self.topic)
+
+    def add(self, path, c):
+        """Adds the Counts of a paragraph of the topic at path."""
+
+        topic = self._topics.get(path)
+        if topic is None:
+            topic = self._topics[path] = len(self.paths)
+            self.paths.append(path)
+
+        self.topic.append(topic)
+        self.words.append(sum(c.sentences))
+        self.sentences.append(len(c.sentences))
+        self.longest.append(max(c.sentences, default=0))
+        self.syllables.append(c.syllables)
+        self.sentencewords.extend(c.sentences)
+
+    def topics(self):
+        """Returns a list of (path, words, sentences, reading ease) for each
+        topic."""
+
+        size = len(self.paths)
+        words = _sums(self.topic, self.words, size)
+        sentences = _sums(self.topic, self.sentences, size)
+        syllables = _sums(self.topic, self.syllables, size)
+
+        return [(path, w, s, readingease(w, s, y))
+                for path, w, s, y in zip(self.paths, words, sentences, syllables)]
+
+    def summary(self):
+        """Returns the counts and percentiles of the table as a dictionary,
+        ready for JSON."""
+
+        topics = self.topics()
+
+        def stats(values):
+            return {str(p): None if v is None else round(v, 2)
+                    for p, v in zip(PERCENTILES, percentiles(values))}
+
+        return {
+            'topics': len(topics),
+            'paragraphs': len(self),
+            'sentences': len(self.sentencewords),
+            'words': sum(t[1] for t in topics),
+            'percentiles': {
+                'sentenceWords': stats(self.sentencewords),
+                'paragraphWords': stats(self.words),
+                'topicWords': stats([t[1] for t in topics]),
+                'readingEase': stats([t[3] for t in topics if t[3] is not None]),
+            },
+        }
@@ -48,151 +48,629 @@ import xml.etree.ElementTree as ET
 import datetime
 import html
 import pathlib
+import time
+import codecs
+import mmap
 
 from flarelint import rule
 from flarelint import flarenode
 from flarelint import resources
+from flarelint import snippets
+from flarelint import conditions
+from flarelint import readability
 
 # Parts for assembling the report
 
-def _firstfewwords(text):
-    return (' '.join(text.split()[0:8]))[0:50]
+def _describecontext(result):
 
-def _describecontext(node):
+    if not result.context:
+        return ''
+    if result.quoted:
+        return "&#8220;" + html.escape(result.context) + "&#8230;&#8221;"
 
-    context = node.valueof().strip() \
-              or node.attribute('alt').strip() \
-              or node.attribute('title').strip() \
-              or node.attribute('Title').strip() \
-              or node.attribute('Comment').strip()
+    return "<code>" + html.escape(result.context) + "</code>"
 
-    if context:
-        context = "&#8220;" + html.escape(_firstfewwords(context)) + "&#8230;&#8221;"
-    else:
-        context = node.attribute('href').strip() \
-        or node.attribute('src').strip() \
-        or node.attribute('Link').strip()
+# Rule messages may contain character references, like rule.LDQUO,
+# but any other markup characters are text.
+_MARKUP_CHARS = [
+    (re.compile(r'&(?!#?\w+;)'), '&amp;'),
+    (re.compile(r'<'), '&lt;'),
+    (re.compile(r'>'), '&gt;')]
 
-        if context:
-            context = "<code>" + html.escape(context) + "</code>"
-
-    return context
+_MESSAGE_FORMATS = [
+    (re.compile(r"(?<!\\)[{0}]([^{0}]+)(?<!\\)[{0}]".format(re.escape(char))),
+     "<{0}>\\1</{0}>".format(tag),
+     re.compile(r"\\" + re.escape(char)),
+     char)
+    for char, tag in [('*', 'b'), ('`', 'code')]]
 
 def _formatmessage(msg):
-    formats = [
-        (r'*', 'b'),
-        (r'`', 'code')]
+    for regex, repl in _MARKUP_CHARS:
+        msg = regex.sub(repl, msg)
 
-    for char, tag in formats:
-        formatRegex = "(?<!\\\\)[{0}]([^{0}]+)(?<!\\\\)[{0}]".format(char)
-        formatRepl = "<{0}>\\1</{0}>".format(tag)
-        escapeRegex = "\\\\\\{0}".format(char)
-        msg = re.sub(formatRegex, formatRepl, msg)
-        msg = re.sub(escapeRegex, char, msg)
+    for formatRegex, formatRepl, escapeRegex, char in _MESSAGE_FORMATS:
+        msg = formatRegex.sub(formatRepl, msg)
+        msg = escapeRegex.sub(char, msg)
 
     return msg
 
-def _formatresults(results):
-
-    groupedFiles = {}
-    for r in results:
-        if groupedFiles.get(r.path, None) is None:
-            groupedFiles[r.path] = []
-        groupedFiles[r.path].append(r)
-
-    resultsText = '\n'.join(string.Template(resources.FILE_TEMPLATE).substitute(
-        fileuri=html.escape(pathlib.Path(f).as_uri()),
-        fullpath=html.escape(f),
-        results='\n'.join(string.Template(resources.RESULT_TEMPLATE).substitute(
-            level=r.level,
-            tag=r.node.name(),
-            context=_describecontext(r.node),
-            message=_formatmessage(r.message)) for r in groupedFiles[f])
-    ) for f in sorted(groupedFiles, key=str.lower))
-
-    return resultsText
-
-def _applyrules(rules, path, node, stats):
+# Rules have few distinct messages, so format each one only once.
+_formattedmessages = {}
+
+def _formattedmessage(msg):
+    formatted = _formattedmessages.get(msg)
+    if formatted is None:
+        formatted = _formattedmessages[msg] = _formatmessage(msg)
+    return formatted
+
+_RESULT_TEMPLATE = string.Template(resources.RESULT_TEMPLATE)
+_FILE_TEMPLATE = string.Template(resources.FILE_TEMPLATE)
+_READABILITY_TEMPLATE = string.Template(resources.READABILITY_TEMPLATE)
+_READABILITY_ROW_TEMPLATE = string.Template(resources.READABILITY_ROW_TEMPLATE)
+
+def _formatresult(r):
+    return _RESULT_TEMPLATE.substitute(
+        level=r.level,
+        tag=r.tag,
+        context=_describecontext(r),
+        position=resources.POSITION.format(r.line) if r.line else '',
+        message=_formattedmessage(r.message))
+
+def _formatfile(path, results):
+    return _FILE_TEMPLATE.substitute(
+        fileuri=html.escape(pathlib.Path(os.path.abspath(path)).as_uri()),
+        fullpath=html.escape(path),
+        results='\n'.join(_formatresult(r) for r in results))
+
+def _formatease(ease):
+    return '' if ease is None else '{0:.0f}'.format(ease)
+
+def _formatreadability(table):
+    topics = table.topics()
+    # Topics without sentences have no reading ease; they go last.
+    topics.sort(key=lambda t: (t[3] is None, t[3]))
+    rows = [_READABILITY_ROW_TEMPLATE.substitute(
+                path=html.escape(path), words=words, sentences=sentences,
+                ease=_formatease(ease))
+            for path, words, sentences, ease in topics]
+    median = table.summary()['percentiles']['readingEase']['50']
+    return _READABILITY_TEMPLATE.substitute(
+        topics=len(topics), median=_formatease(median), rows='\n'.join(rows))
+
+class HtmlReport:
+    """Writes the HTML report a file at a time, as the scan finishes
+    each one.
+
+    The error and warning counts at the top of the report are not known
+    until the end, so the header leaves room for them and close()
+    fills them in.
+
+    The optional readability argument is a readability.Table.  If it
+    has any paragraphs, close() lists the reading ease of each topic
+    after the results.
+    """
+
+    _COUNT_WIDTH = 12
+
+    def __init__(self, reportpath, projectpath, readability=None):
+        self._file = open(reportpath, 'wb')
+        self._empty = True
+        self._readability = readability
+
+        slots = [s.ljust(self._COUNT_WIDTH) for s in ['\0E', '\0W']]
+        header = string.Template(resources.REPORT_HEADER).substitute(
+            errorLabel=resources.ERROR_LEVEL,
+            warningLabel=resources.WARNING_LEVEL,
+            project=html.escape(projectpath),
+            date=datetime.datetime.now().strftime(resources.DATE_FORMAT),
+            user=html.escape(os.environ['USERNAME']),
+            errorCount=slots[0],
+            warningCount=slots[1]).encode('utf-8')
+
+        self._slots = [header.index(s.encode('utf-8')) for s in slots]
+        for s in slots:
+            header = header.replace(s.encode('utf-8'), b' ' * self._COUNT_WIDTH)
+        self._file.write(header)
+
+    def file(self, path, results):
+        """Adds the results for a file."""
+
+        self._file.write(_formatfile(path, results).encode('utf-8'))
+        self._empty = False
+
+    def close(self, statistics):
+        """Finishes the report with the final counts."""
+
+        if self._empty:
+            self._file.write(resources.REPORT_NO_ISSUES.encode('utf-8'))
+        if self._readability:
+            self._file.write(_formatreadability(self._readability).encode('utf-8'))
+        self._file.write(resources.REPORT_FOOTER.encode('utf-8'))
+
+        counts = [statistics[resources.ERROR_LEVEL], statistics[resources.WARNING_LEVEL]]
+        for offset, count in zip(self._slots, counts):
+            self._file.seek(offset)
+            self._file.write(str(count).ljust(self._COUNT_WIDTH).encode('utf-8'))
+        self._file.close()
+
+class Limits:
+    """Caps on how much of a project to lint.
+
+    With failfast, the scan stops at the first error. With
+    maxresults or maxperrule, results beyond the cap are dropped and
+    rules that reach their cap are no longer evaluated, so the
+    statistics become lower bounds. Set exactcounts to keep
+    evaluating capped rules, for counting only.
+
+    """
+
+    def __init__(self, failfast=False, maxresults=None, maxperrule=None, exactcounts=False):
+        self.failfast = failfast
+        self.maxresults = maxresults
+        self.maxperrule = maxperrule
+        self.exactcounts = exactcounts
+        self.stopped = False
+        self._kept = 0
+        self._perrule = {}
+
+    def active(self):
+        """Returns True if any limit is set."""
+
+        return self.failfast or self.maxresults is not None or self.maxperrule is not None
+
+    def _rulecapped(self, r):
+        return self.maxperrule is not None and self._perrule.get(r, 0) >= self.maxperrule
+
+    def _allcapped(self):
+        return self.maxresults is not None and self._kept >= self.maxresults
+
+    def rules(self, rules):
+        """Returns the rules that are still worth evaluating."""
+
+        if self.exactcounts:
+            return rules
+        if self._allcapped():
+            self.stopped = True
+            return []
+        if self.maxperrule is None:
+            return rules
+        return [r for r in rules if not self._rulecapped(r)]
+
+    def keep(self, r, result):
+        """Returns True if a result from rule r goes in the report."""
+
+        if self.failfast and result.level == resources.ERROR_LEVEL:
+            self.stopped = True
+        if self._rulecapped(r) or self._allcapped():
+            return False
+        self._perrule[r] = self._perrule.get(r, 0) + 1
+        self._kept += 1
+        return True
+
+class _Scan:
+    """The state of a scan: the statistics and whatever shapes the
+    scan, passed along to each file.
+
+    The parse argument is the function that parses a file, like
+    flarenode.parse(), for callers that keep parsed files in a cache.
+    If prefilter is True, files whose bytes show that no rule can match
+    are only checked for being well-formed, not parsed; see _mayapply().
+
+    If projectrules is True, the scan collects elements for project
+    rules, and _finish() gets their results after the scan.  Only a
+    scan of all of a project's content should: a project rule that
+    sees part of it reports wrong results, like styles as unused
+    because the files that use them were not scanned.
+    """
+
+    def __init__(self, projectlang, verbose=False, limits=None, outputs=(), timings=None,
+                 baseline=None, aggregate=None, parse=flarenode.parse, prefilter=True,
+                 projectrules=False):
+        self.projectlang = projectlang
+        self.verbose = verbose
+        self.limits = limits if limits is not None else Limits()
+        self.outputs = outputs
+        self.timings = timings if timings is not None else {'format': 0.0}
+        self.baseline = baseline
+        self.aggregate = aggregate
+        self.parse = parse
+        self.prefilter = prefilter
+        self.projectrules = projectrules
+        self.skipped = 0
+        self.snippets = None
+        self.targets = None
+        self.reported = set()
+        self.collected = {}
+        self._needles = {}
+        self.stats = {resources.ERROR_LEVEL : 0,
+                      resources.WARNING_LEVEL : 0}
+
+    def add(self, r, result):
+        """Counts a result. Returns True if it goes in the report."""
+
+        if self.baseline is not None and self.baseline.known(result):
+            return False
+
+        self.stats[result.level] += 1
+        if self.aggregate is not None:
+            self.aggregate.result(result, os.path.splitext(result.path)[1])
+        return self.limits.keep(r, result)
+
+    def needles(self, extension):
+        """Returns the byte strings of which a file must contain one for a
+        rule to match, or None if any file may match."""
+
+        if extension not in self._needles:
+            # Expanded topics may get matching elements from snippets.
+            expands = self.snippets is not None and extension in rule.TOPICS
+            tags = rule.tags(extension) if self.prefilter and not expands else None
+            self._needles[extension] = None if tags is None else _needles(tags)
+        return self._needles[extension]
+
+def _needles(tags):
+    """Returns the byte strings that start the elements with these tag
+    names.  A prefixed name may have any prefix in the file."""
+
+    found = set()
+    for t in tags:
+        if t == '*' or not t:
+            return None
+        prefix, colon, local = t.rpartition(':')
+        found.add((':' if colon else '<').encode('utf-8') + local.encode('utf-8'))
+    return sorted(found)
+
+# Byte order marks of encodings that the needles are not written in.
+_OTHER_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+def _mayapply(path, needles):
+    """Returns False if the file contains none of the needles, so that no
+    rule can match any of its elements.  Searches a memory map of the
+    file without decoding it."""
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if m[:2] in _OTHER_BOMS:
+                return True
+            return any(_hastag(m, n) for n in needles)
+
+# The bytes that may follow a tag name in a start tag.
+_AFTER_TAG = frozenset(b' \t\r\n/>')
+
+def _hastag(data, needle):
+    """Returns True if the needle occurs in data followed by the end of a
+    tag name, so that "<Shape" does not match "<Shapes"."""
+
+    start = data.find(needle)
+    while start != -1:
+        end = start + len(needle)
+        if end >= len(data) or data[end] in _AFTER_TAG:
+            return True
+        start = data.find(needle, start + 1)
+    return False
+
+# The key for counting a paragraph for readability only once.
+_READABILITY = 'readability'
+
+def _once(r, key, reported):
+    """Returns True the first time that rule r finds something about the
+    element key, for reporting snippet content, or content that
+    several targets include, only once.  The reported argument is the
+    set of what was found so far."""
+
+    if key is None:
+        return True
+    if (r, key) in reported:
+        return False
+    reported.add((r, key))
+    return True
+
+def _applyrules(rules, path, node, scan, key=None, reported=None):
+    reported = scan.reported if reported is None else reported
     allResults = []
     for r in rules:
+        if r.collects:
+            if not scan.projectrules:
+                continue
+            entry = r.collect(path, node)
+            if entry is not None and _once(r, key, reported):
+                scan.collected.setdefault(r, []).append(entry)
+            continue
         result = r.apply(path, node)
-        if result:
-            stats[result.level] += 1
-            allResults.append(result)
+        if result and _once(r, key, reported):
+            if scan.add(r, result):
+                allResults.append(result)
+            if scan.limits.stopped:
+                break
 
     return allResults
 
-def _apply_rules_to_file(path, filename, projectlang, stats, verbose=False):
+def _applytree(rules, path, root, scan, seen=None):
+    """Applies rules to each node of a parsed file. Returns the results
+    and the number of nodes visited.  To report each element of a file
+    once across its views for several targets, give the same seen set
+    for each view.
 
-    extension = os.path.splitext(filename)[1]
-    rules = rule.getrules(extension)
-    if rules is None:
-        return []
+    Along the way, the scan's aggregate counts the paragraphs of topics
+    and snippets for readability, each once.
+    """
 
-    fullPath = os.path.join(path, filename)
-    if verbose:
-        print(' ', fullPath)
+    results = []
+    limits = scan.limits
+    elements = 0
+    measure = scan.aggregate is not None and os.path.splitext(path)[1] in rule.TOPICS_AND_SNIPPETS
+
+    for node in root.iter():
+        elements += 1
+        # Snippet content is reported against the snippet.
+        origin = node.origin()
+        if measure and origin is None and node.name() == 'p' \
+                and (seen is None or _once(_READABILITY, node.original(), seen)):
+            scan.aggregate.paragraph(path, readability.of(node))
+        if origin is None and seen is not None:
+            results.extend(_applyrules(limits.rules(rules), path, node, scan,
+                                       node.original(), seen))
+        elif origin is None:
+            results.extend(_applyrules(limits.rules(rules), path, node, scan))
+        else:
+            results.extend(_applyrules(limits.rules(rules), origin[0], node, scan, origin[1]))
+        if limits.stopped:
+            break
+
+    return results, elements
+
+def _parseerror(path, error, scan):
+    """Returns the results for a file that is not well-formed XML."""
+
+    if scan.aggregate is not None:
+        scan.aggregate.parsefailures += 1
+    badXML = rule.Result(
+        path,
+        resources.ERROR_LEVEL,
+        flarenode.EMPTY,
+        resources.PARSE_ERROR,
+        rule.PARSE_ERROR_ID)
+    badXML.line, badXML.column = getattr(error, 'position', (0, 0))
+    return [badXML] if scan.add(None, badXML) else []
+
+def _tree(path, scan):
+    """Returns the root node that rules judge for a file, and the nodes
+    of snippets that refer to themselves.  With snippets expanded,
+    topics are expanded and snippets come from the scan's cache."""
+
+    extension = os.path.splitext(path)[1]
+    if scan.snippets is not None and extension in rule.SNIPPETS:
+        return scan.snippets.parse(path), []
+
+    root = scan.parse(path, scan.projectlang)
+    if scan.snippets is not None and extension in rule.TOPICS:
+        return scan.snippets.expand(root, path)
+    return root, []
+
+def _cycles(nodes, scan):
+    """Returns the results for snippets that refer to themselves."""
 
     results = []
+    for n in nodes:
+        path, key = n.origin()
+        if _once(rule.SNIPPET_CYCLE_ID, key, scan.reported):
+            result = rule.Result(path, resources.ERROR_LEVEL, n, resources.SNIPPET_CYCLE,
+                                 rule.SNIPPET_CYCLE_ID)
+            if scan.add(None, result):
+                results.append(result)
+    return results
+
+def _views(root, scan):
+    """Returns the distinct root nodes that rules judge for a file: the
+    root itself or, with targets, the content that each target
+    includes."""
+
+    if not scan.targets:
+        return [root]
+
+    views = []
+    for target in scan.targets:
+        view = conditions.view(root, target)
+        if view is not None and not any(view.element() is v.element() for v in views):
+            views.append(view)
+    return views
+
+def _lintfile(fullPath, scan):
+    """Applies the rules for its extension to a file. Returns the
+    results."""
+
+    rules = rule.getrules(os.path.splitext(fullPath)[1])
+    if rules is None:
+        return []
 
+    needles = scan.needles(os.path.splitext(fullPath)[1])
     try:
-        flareNodes = flarenode.parse(fullPath, projectlang)
-        for node in flareNodes.iter():
-            results.extend(_applyrules(rules, fullPath, node, stats))
-    except ET.ParseError:
-        badXML = rule.Result(
-            fullPath,
-            resources.ERROR_LEVEL,
-            flarenode.EMPTY,
-            resources.PARSE_ERROR)
-        results = [badXML]
-        stats[badXML.level] += 1
+        if needles is not None and not _mayapply(fullPath, needles):
+            # No rule matches, but a file that is not well-formed still
+            # gets its parse error.
+            flarenode.wellformed(fullPath)
+            scan.skipped += 1
+            if scan.aggregate is not None:
+                scan.aggregate.skipped += 1
+            return []
+    except OSError:
+        pass
+    except ET.ParseError as e:
+        return _parseerror(fullPath, e, scan)
+
+    if scan.verbose:
+        print(' ', fullPath)
 
+    elements = 0
+    try:
+        root, cycles = _tree(fullPath, scan)
+        views = _views(root, scan)
+        seen = set() if len(views) > 1 else None
+        results = []
+        for view in views:
+            found, visited = _applytree(rules, fullPath, view, scan, seen)
+            results.extend(found)
+            elements += visited
+            if scan.limits.stopped:
+                break
+        if seen is not None:
+            results.sort(key=lambda r: (r.line, r.column))
+        results.extend(_cycles(cycles, scan))
+    except ET.ParseError as e:
+        results = _parseerror(fullPath, e, scan)
+
+    if scan.aggregate is not None:
+        scan.aggregate.file(elements)
     return results
 
-def _scandirectory(directory, projectlang, stats, verbose=False):
-    results = []
-    for dirpath, dirnames, filenames in os.walk(directory):
-        for f in filenames:
-            fileresults = _apply_rules_to_file(dirpath, f, projectlang, stats, verbose)
-            results.extend(fileresults)
+def _emit(path, results, scan):
+    """Passes the results for a file to each output."""
 
-    return results
+    start = time.perf_counter()
+    for o in scan.outputs:
+        o.file(path, results)
+    scan.timings['format'] += time.perf_counter() - start
 
-def build(projectpath, reportpath, verbose=False):
-    """Given a path to a Flare project and a path to a report, read the
-    Flare project and store the resulting report."""
+def _files(directory):
+    """Yields the files in a directory that have rules, in order of
+    their names."""
 
-    projectDir = os.path.dirname(projectpath)
+    extensions = rule.extensions()
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort(key=str.lower)
+        for f in sorted(filenames, key=str.lower):
+            if os.path.splitext(f)[1] in extensions:
+                yield os.path.join(dirpath, f)
+
+def projectfiles(projectpath):
+    """Yields the files of a project that have rules, in the order that
+    a scan visits them.  Call rule.load() first."""
 
-    statistics = {resources.ERROR_LEVEL : 0,
-                  resources.WARNING_LEVEL : 0}
+    projectDir = os.path.dirname(projectpath)
+    for subDir in ['Content', 'Project']:
+        yield from _files(os.path.join(projectDir, subDir))
+
+def _finish(scan):
+    """Returns the results of the project rules, after the scan, as a
+    dictionary of paths and their results."""
+
+    byfile = {}
+    for r, entries in scan.collected.items():
+        for result in r.finish(entries):
+            if scan.add(r, result):
+                byfile.setdefault(result.path, []).append(result)
+            if scan.limits.stopped:
+                break
+    scan.collected = {}
+
+    return byfile
+
+def _scanfiles(files, scan):
+    """Applies rules to files and emits the results of each file as soon
+    as it is done."""
+
+    for f in files:
+        fileresults = _lintfile(f, scan)
+        if fileresults:
+            # With snippets expanded, some results are for snippets.
+            byfile = {f: []}
+            for r in fileresults:
+                byfile.setdefault(r.path, []).append(r)
+            for path, results in byfile.items():
+                if results:
+                    _emit(path, results, scan)
+        if scan.limits.stopped:
+            print(resources.PROGRESS_STOPPED)
+            return
+
+def build(projectpath, reportpath, verbose=False, limits=None, timings=None, outputs=(),
+          baseline=None, aggregate=None, prefilter=True, expandsnippets=False, targets=None):
+    """Given a path to a Flare project and a path to a report, read the
+    Flare project and store the resulting report.  Returns the
+    statistics: the count of results for each level.
+
+    If reportpath is None, build does not write the HTML report.  The
+    optional outputs argument is a list of other outputs, such as
+    those from formats.open_output(), that also receive the results.
+
+    The optional limits argument is a Limits object that stops the
+    scan early.  If timings is a dictionary, build stores the
+    duration in seconds of each phase in it: scan, format, and write.
+    Because the report is written as the scan goes, format is the time
+    spent formatting and writing results during the scan, and write is
+    the time to finish the report.
+
+    The optional baseline argument is a baseline.Baseline object.
+    Results that it knows are left out of the report and the
+    statistics.
+
+    The optional aggregate argument is a metrics.Aggregate object, which
+    build fills with detailed statistics, the readability of topics,
+    and the timings.  The HTML report then lists the reading ease of
+    each topic.  Without it, build does not count readability.
+
+    Unless prefilter is False, build skips files that contain none of
+    the elements that their rules can match, after only checking that
+    they are well-formed.
+
+    If expandsnippets is True, rules judge topics with the content of
+    their snippets in place; see snippets.py.
+
+    The optional targets argument is a list of conditions.Target
+    objects.  With targets, rules judge only the content that at least
+    one of them includes, and report each issue once.  Each file is
+    parsed once for all of the targets.  Project rules, which need all
+    of the content, are not applied.
+    """
+
+    if limits is None:
+        limits = Limits()
+    if timings is None:
+        timings = {}
+    timings['format'] = 0.0
 
     print(resources.PROGRESS_SCANNING)
+    start = time.perf_counter()
     lang = flarenode.get_project_lang(projectpath)
-
-    issues = []
-    for subDir in ['Content', 'Project']:
-        path = os.path.join(projectDir, subDir)
-        issues.extend(_scandirectory(path, lang, statistics, verbose))
+    outputs = list(outputs)
+    if reportpath is not None:
+        outputs.append(HtmlReport(reportpath, projectpath,
+                                  aggregate.readability if aggregate is not None else None))
+
+    scan = _Scan(lang, verbose, limits, outputs, timings, baseline, aggregate,
+                 prefilter=prefilter, projectrules=not targets)
+    if expandsnippets:
+        scan.snippets = snippets.Snippets(lang)
+    if targets:
+        scan.targets = targets
+        print(resources.PROGRESS_TARGETS.format(', '.join(t.name for t in targets)))
+    statistics = scan.stats
+
+    _scanfiles(projectfiles(projectpath), scan)
+    if not limits.stopped:
+        # Results of project rules come after the files they are in.
+        for path, results in sorted(_finish(scan).items()):
+            _emit(path, results, scan)
+        if limits.stopped:
+            print(resources.PROGRESS_STOPPED)
+
+    timings['scan'] = time.perf_counter() - start - timings['format']
 
     print(resources.PROGRESS_FORMATTING)
-
-    reportText = string.Template(resources.REPORT_TEMPLATE).substitute(
-        errorLabel=resources.ERROR_LEVEL,
-        warningLabel=resources.WARNING_LEVEL,
-        project=projectpath,
-        date=datetime.datetime.now().strftime(resources.DATE_FORMAT),
-        user=os.environ['USERNAME'],
-        errorCount=str(statistics[resources.ERROR_LEVEL]),
-        warningCount=str(statistics[resources.WARNING_LEVEL]),
-        results=_formatresults(issues) if issues else resources.REPORT_NO_ISSUES)
+    start = time.perf_counter()
+    for o in outputs:
+        o.close(statistics)
+    timings['write'] = time.perf_counter() - start
+    if aggregate is not None:
+        aggregate.timings.update(timings)
 
     print(resources.PROGRESS_TALLY.format(
         statistics[resources.ERROR_LEVEL],
         statistics[resources.WARNING_LEVEL]))
+    if baseline is not None:
+        print(resources.PROGRESS_BASELINE.format(baseline.skipped))
+    if scan.skipped:
+        print(resources.PROGRESS_PREFILTER.format(scan.skipped))
 
-    report = ET.fromstring(reportText)
-    with open(reportpath, 'bw') as f:
-        f.write(b'<!DOCTYPE html>\n')
-        ET.ElementTree(report).write(f, encoding="UTF-8", method="xml")
+    return statistics
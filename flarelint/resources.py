@@ -32,7 +32,14 @@ lint off your sweater, only more fun.
 
 Usage: 
 
-  python -m flarelint [project] [-v] [--help]
+  python -m flarelint [project] [-v] [--help] [--fail-fast]
+                      [--max-results N] [--max-results-per-rule N]
+                      [--exact-counts] [--select RULES]
+                      [--ignore RULES] [--level LEVEL]
+                      [--format FORMAT] [--output PATH] [--no-html]
+                      [--sharded] [--baseline FILE] [--baseline-write]
+                      [--stats FILE] [--metrics FILE] [--no-prefilter]
+                      [--expand-snippets] [--target NAMES]
 
 Options:
 
@@ -43,6 +50,124 @@ Options:
 
   --help   Print this help information then quit.
 
+  --fail-fast
+           Stop at the first error.
+
+  --max-results N
+           Stop after reporting N results.
+
+  --max-results-per-rule N
+           Stop evaluating a rule after it reports N results.
+
+  --exact-counts
+           With --max-results or --max-results-per-rule, keep
+           evaluating capped rules so that the error and warning
+           counts are exact. Slower.
+
+  --select RULES
+           Apply only these rules. RULES is a comma-separated list
+           of rule IDs or rule module names, for example
+           flarelint_h1_missing,flarelint_list_punctuation:2.  Use
+           * as a wildcard, as in flarelint_list_*.
+
+  --ignore RULES
+           Do not apply these rules. RULES is as for --select.
+
+  --level LEVEL
+           Apply only rules at this level or above: error or
+           warning. The default is warning.
+
+  --format FORMAT
+           Also write the results in a machine-readable format, as
+           each file is scanned: jsonl (JSON Lines), sarif, or junit.
+
+  --output PATH
+           Where to write the --format output. The default, -, is
+           standard output, in which case progress information goes
+           to standard error.
+
+  --no-html
+           Do not write the HTML report or open it in a web browser.
+
+  --sharded
+           Write the HTML report as a folder, FlareLintReport, with a
+           small index page that loads results only as you open each
+           file.  For projects with very many results.
+
+  --baseline FILE
+           Report only new issues: leave out the issues recorded in
+           this baseline file.
+
+  --baseline-write
+           Record all of the issues found in a baseline file: the
+           --baseline FILE, or FlareLintBaseline.json in the project
+           folder.
+
+  --stats FILE
+           Write detailed statistics as JSON: results by rule, level,
+           extension and folder, files and elements scanned, parse
+           failures, the time taken by each phase, and readability:
+           percentiles of sentence, paragraph, and topic lengths, and
+           the reading ease of each topic. The HTML report also lists
+           the reading ease of each topic.
+
+  --metrics FILE
+           Write the same statistics in OpenMetrics text format, for
+           example for the node exporter's textfile collector. Like
+           --stats, adds the reading ease of each topic to the HTML
+           report.
+
+  --expand-snippets
+           Apply rules to topics with the content of their snippets
+           in place, as readers see them. Issues in snippet content
+           are reported once, against the snippet file.
+
+  --target NAMES
+           Apply rules only to the content that these targets
+           include, as their condition tag expressions say. NAMES is
+           a comma-separated list of the names of .fltar files in
+           Project/Targets, without the extension. Content that no
+           target includes is skipped, and an issue in content that
+           several targets include is reported once.
+
+  --no-prefilter
+           Parse every file. By default, FlareLint skips files that
+           contain no element that a rule applies to, so it does not
+           report when those files are not well-formed XML.
+
+To keep the rules and parsed files in memory for an editor or build
+tool that lints often, start a lint server instead:
+
+  python -m flarelint serve [project] [--socket PATH | --port N]
+                            [--workers N]
+
+  --socket PATH
+           Listen on a Unix domain socket that only you can use. If
+           PATH exists, it must be an old socket, which is replaced.
+
+  --port N Listen on port N of localhost. The default, 0, picks a free
+           port. Each request must carry the token that the server
+           prints when it starts.
+
+  --workers N
+           Handle up to N requests at once. The default is 4.
+
+The server takes one JSON request per line. See flarelint/server.py.
+
+For lint results as you type, start a Language Server Protocol server
+from your editor:
+
+  python -m flarelint lsp [--debounce MS]
+
+  --debounce MS
+           Lint a changed document once edits pause for MS
+           milliseconds. The default is 150.
+
+With --fail-fast, --max-results, or --max-results-per-rule, FlareLint
+does not open the report in a web browser, and the exit status is 0
+when there are no issues, 2 when there are errors, or 3 when there are
+only warnings.
+
 For full documentation, see the doc folder.
 
 """
@@ -51,15 +176,57 @@ BAD_ARG = """Error: Unrecognized option. Try 'python flarelint --help' (without
 quotes).
 """
 
+BAD_COUNT = """Error: Option {0} needs a whole number that is 0 or more.
+"""
+
+BAD_LEVEL = """Error: Option --level needs one of: error, warning.
+"""
+
+BAD_FORMAT = """Error: Option --format needs one of: {0}.
+"""
+
+SERVER_LISTENING = """FlareLint server listening on {0}"""
+
+SERVER_LISTENING_TOKEN = """FlareLint server listening on {0} with token {1}"""
+
+SERVER_BAD_TOKEN = """Unauthorized: the request needs the token that the server printed."""
+
+SERVER_OUTSIDE_PROJECT = """Not in the project's folder: {0}"""
+
+SERVER_NOT_SOCKET = """Error: {0} exists and is not a socket.
+"""
+
+SERVER_BAD_REQUEST = """Bad request: expected a JSON object with a method and its params."""
+
+SERVER_BAD_METHOD = """Unknown method: {0}"""
+
+LSP_LINT_FAILED = """Could not lint {0}:
+{1}"""
+
+BAD_BASELINE = """Error: Could not read the baseline file {0}.
+"""
+
+BAD_TARGET = """Error: No target named {0} in the project's Project/Targets folder.
+"""
+
+BAD_TARGET_EXPRESSION = """Error: Could not read the condition tag expression of target {0}.
+"""
+
+NO_RULES = """Error: No rules left to apply. Check the --select, --ignore and
+--level options.
+"""
+
 MISSING_PROJECT = """Error: Could not find a project to scan. Either you did not specify
 a Flare project to lint or there is no project in this folder.
 """
 
 REPORT_FILE = 'FlareLintReport.html'
 
+BASELINE_FILE = 'FlareLintBaseline.json'
+
 DATE_FORMAT = "%b %d, %Y %I:%M%p"
 
-REPORT_TEMPLATE = """<!DOCTYPE html>
+REPORT_HEADER = """<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta http-equiv="Content-Type" content="text/html;charset=utf-8" />
@@ -149,8 +316,9 @@ p {
 <p><b>Errors:</b> ${errorCount}</p>
 <p><b>Warnings:</b> ${warningCount}</p>
 
-${results}
+"""
 
+REPORT_FOOTER = """
 </body>
 </html>
 """
@@ -162,20 +330,229 @@ FILE_TEMPLATE = """<div class="file">
 """
 
 RESULT_TEMPLATE = """  <div class="${level}">
-    <p>${level}: <code>${tag}</code> ${context}</p>
+    <p>${level}: <code>${tag}</code> ${context} ${position}</p>
     <p>${message}</p>
   </div>"""
 
+SHARDED_DIR = 'FlareLintReport'
+SHARDED_INDEX_FILE = 'index.html'
+
+# The index page of a sharded report.  It loads data/index.js, which
+# calls FlareLint.index() with the counts and the list of files, then
+# loads each data/chunk-N.js on demand, which calls FlareLint.chunk()
+# with the results of a few files.  Loading data with script elements
+# works for reports opened from the file system, where browsers block
+# XMLHttpRequest and fetch.
+SHARDED_INDEX = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta http-equiv="Content-Type" content="text/html;charset=utf-8" />
+  <meta name="generator" content="FlareLint """ + VERSION + """" />
+  <style type='text/css'>
+body { font-family: Verdana, sans-serif; line-height: 1.5; margin: 0 auto; width: 60em; }
+code { font-family: Consolas, monospace, serif; }
+table { border-collapse: collapse; margin-bottom: 1em; }
+td, th { padding: 0 1em 0 0; text-align: left; }
+td.n { text-align: right; }
+tr.pick { cursor: pointer; }
+tr.pick:hover { background-color: #f8f8f8; }
+details { border-top: 1px solid #888; padding: 0.25em 0; }
+summary { cursor: pointer; }
+.Warning { border-left: 0.25em solid #fc0; padding-left: 0.5em; margin: 0.5em 0 0.5em 1em; }
+.Error { border-left: 0.25em solid #c44; padding-left: 0.5em; margin: 0.5em 0 0.5em 1em; }
+</style>
+  <title>FlareLint Report</title>
+</head>
+<body>
+
+<h1>FlareLint Report</h1>
+
+<div id="summary"><p>Loading...</p></div>
+
+<p>
+  <label>Rule: <select id="rule"><option value="">All</option></select></label>
+  <label>Level: <select id="level"><option value="">All</option></select></label>
+  <label>Path: <input id="path" type="search" /></label>
+</p>
+
+<h2>Files</h2>
+<div id="files"></div>
+<p><button id="more" hidden="hidden">Show more</button></p>
+
+<h2>Rules</h2>
+<table id="rules"><tr><th>Rule</th><th>Level</th><th>Results</th></tr></table>
+
+<h2>Folders</h2>
+<table id="dirs"><tr><th>Folder</th><th>Errors</th><th>Warnings</th></tr></table>
+
+<script>
+var FlareLint = (function () {
+  var PAGE = 200;
+  var data = null, chunks = {}, waiting = {}, matches = [], shown = 0;
+
+  function $(id) { return document.getElementById(id); }
+
+  function el(tag, text, cls) {
+    var e = document.createElement(tag);
+    if (text !== undefined) e.textContent = text;
+    if (cls) e.className = cls;
+    return e;
+  }
+
+  function row(table, cells, onclick) {
+    var tr = el('tr');
+    cells.forEach(function (c, i) { tr.appendChild(el('td', String(c), i ? 'n' : '')); });
+    if (onclick) { tr.className = 'pick'; tr.onclick = onclick; }
+    table.appendChild(tr);
+  }
+
+  function filters() {
+    return { rule: $('rule').value === '' ? -1 : +$('rule').value,
+             level: $('level').value === '' ? -1 : +$('level').value,
+             path: $('path').value.toLowerCase() };
+  }
+
+  function filematches(f, q) {
+    if (q.path && (data.dirs[f[0]] + '/' + f[1]).toLowerCase().indexOf(q.path) < 0) return false;
+    if (q.rule < 0 && q.level < 0) return true;
+    return f[5].some(function (rc) {
+      return (q.rule < 0 || rc[0] === q.rule) && (q.level < 0 || data.ruleLevels[rc[0]] === q.level);
+    });
+  }
+
+  function render(details, id) {
+    var q = filters(), results = chunks[details.dataset.chunk][id];
+    results.forEach(function (r) {
+      if ((q.rule >= 0 && r[1] !== q.rule) || (q.level >= 0 && r[0] !== q.level)) return;
+      var level = data.levels[r[0]], div = el('div', undefined, level), p = el('p');
+      p.appendChild(el('span', level + ': '));
+      p.appendChild(el('code', r[3]));
+      if (r[4]) p.appendChild(el(r[5] ? 'span' : 'code', r[5] ? ' “' + r[4] + '…”' : ' ' + r[4]));
+      if (r[6]) p.appendChild(el('span', ' (line ' + r[6] + ')'));
+      div.appendChild(p);
+      var m = el('p');
+      m.innerHTML = data.messages[r[2]];
+      div.appendChild(m);
+      details.appendChild(div);
+    });
+  }
+
+  function open(details) {
+    if (details.dataset.done) return;
+    details.dataset.done = '1';
+    var c = details.dataset.chunk, id = +details.dataset.file;
+    if (chunks[c]) { render(details, id); return; }
+    if (!waiting[c]) {
+      waiting[c] = [];
+      var s = document.createElement('script');
+      s.src = 'data/chunk-' + c + '.js';
+      document.body.appendChild(s);
+    }
+    waiting[c].push(function () { render(details, id); });
+  }
+
+  function showmore() {
+    var list = $('files');
+    matches.slice(shown, shown + PAGE).forEach(function (i) {
+      var f = data.files[i], d = el('details');
+      d.dataset.file = i;
+      d.dataset.chunk = f[4];
+      var s = el('summary');
+      var a = el('a', data.dirs[f[0]] + '/' + f[1]);
+      a.href = f[2]; a.target = '_blank';
+      s.appendChild(a);
+      s.appendChild(el('span', ' — ' + f[3][0] + ' errors, ' + f[3][1] + ' warnings'));
+      d.appendChild(s);
+      d.addEventListener('toggle', function () { if (d.open) open(d); });
+      list.appendChild(d);
+    });
+    shown = Math.min(shown + PAGE, matches.length);
+    $('more').hidden = shown >= matches.length;
+  }
+
+  function update() {
+    var q = filters();
+    matches = [];
+    data.files.forEach(function (f, i) { if (filematches(f, q)) matches.push(i); });
+    $('files').textContent = matches.length ? '' : 'No matching files.';
+    shown = 0;
+    showmore();
+  }
+
+  return {
+    index: function (d) {
+      data = d;
+      var s = $('summary');
+      s.textContent = '';
+      [['Project', d.project], ['Date', d.date], ['Generated by', d.user],
+       ['Errors', d.errors], ['Warnings', d.warnings], ['Files with results', d.files.length]
+      ].forEach(function (kv) {
+        var p = el('p'); p.appendChild(el('b', kv[0] + ': ')); p.appendChild(el('span', String(kv[1])));
+        s.appendChild(p);
+      });
+      d.levels.forEach(function (l, i) { var o = el('option', l); o.value = i; $('level').appendChild(o); });
+      d.rules.forEach(function (r, i) {
+        var o = el('option', r); o.value = i; $('rule').appendChild(o);
+        row($('rules'), [r, d.levels[d.ruleLevels[i]], d.ruleCounts[i]],
+            function () { $('rule').value = i; update(); window.scrollTo(0, 0); });
+      });
+      d.dirs.forEach(function (dir, i) {
+        row($('dirs'), [dir || '.', d.dirCounts[i][0], d.dirCounts[i][1]],
+            function () { $('path').value = dir; update(); window.scrollTo(0, 0); });
+      });
+      ['rule', 'level'].forEach(function (id) { $(id).onchange = update; });
+      $('path').oninput = update;
+      $('more').onclick = showmore;
+      update();
+    },
+    chunk: function (c, results) {
+      chunks[c] = results;
+      (waiting[c] || []).forEach(function (f) { f(); });
+      delete waiting[c];
+    }
+  };
+})();
+</script>
+<script src="data/index.js"></script>
+</body>
+</html>
+"""
+
+POSITION = "(line {0})"
+
 REPORT_NO_ISSUES = """<p>Congratulations! No issues found.</p>"""
 
+# The readability of topics, at the end of the HTML report, hardest
+# to read first.
+READABILITY_TEMPLATE = """<div class="readability">
+  <h2>Readability</h2>
+  <p><b>Topics:</b> ${topics}</p>
+  <p><b>Median reading ease:</b> ${median}</p>
+  <table>
+    <tr><th>Topic</th><th>Words</th><th>Sentences</th><th>Reading ease</th></tr>
+${rows}
+  </table>
+</div>
+"""
+
+READABILITY_ROW_TEMPLATE = """    <tr><td><code>${path}</code></td><td>${words}</td><td>${sentences}</td><td>${ease}</td></tr>"""
+
 PARSE_ERROR = """Could not read the Flare source file because it is not well-formed
 XML. To fix, use MadCap Flare or a text editor to correct the file."""
 
+SNIPPET_CYCLE = """Snippet includes itself, directly or through other snippets, so
+Flare cannot build output from it. To fix, remove the snippet
+reference that leads back to this snippet."""
+
 PROGRESS_RULES_LOAD = """\nLoading rules modules: {0}"""
 PROGRESS_RULES_DEFAULT = """\nInstalling default rule modules."""
 PROGRESS_SCANNING = """\nApplying rules to files."""
+PROGRESS_STOPPED = """\nStopped early because of --fail-fast or --max-results."""
 PROGRESS_FORMATTING = """\nFormatting report."""
 PROGRESS_TALLY = """\nErrors: {0}\nWarnings: {1}"""
+PROGRESS_BASELINE = """Known issues left out: {0}"""
+PROGRESS_TARGETS = """Content of targets: {0}"""
+PROGRESS_PREFILTER = """Files skipped because no rule applies to them: {0}"""
 PROGRESS_REPORT = """Report: {0}"""
 PROGRESS_PROJECT = """Directory: {0}\nProject: {1}"""
 PROGRESS_DONE = "\nDone."
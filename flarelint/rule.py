@@ -93,26 +93,134 @@ functions end up looking like this:
       test=lambda n: False,
       message="Hard-coded styles are not permitted.")
 
+Each rule has an ID, which users give to the --select and --ignore
+options.  By default, the ID is the name of the rule's module followed
+by the rule's place in that module, for example
+"flarelint_list_punctuation:2" for the second rule in
+flarelint_list_punctuation.py.  To keep an ID stable when you reorder
+or insert rules in a module, give it explicitly:
+
+  rule.Error(
+      id='no-hard-styles',
+      ...)
+
+To say more about a particular element than the message can, like
+which of many texts it found, give a note function.  It gets the Node
+that broke the rule and returns text to add to the message, or None:
+
+  rule.Error(
+      note=lambda n: 'Found in `{0}`.'.format(n.attribute('class')),
+      ...)
+
+Most rules judge an element by itself and its file. To compare
+elements across all of the files of a project, create a ProjectError
+or ProjectWarning with a key function and a finish function instead of
+a test function.  See class _ProjectRule and
+flarelint_title_duplicate.py.
+
+Tip: Before parsing a file, FlareLint looks for the start tags of the
+elements that its rules can match, and skips the file if there are
+none.  It can do this only if every rule for the file's extension
+says which elements its match function can match.  A match function
+from flarenode.whenself() says so itself; for other match functions,
+list the tag names:
+
+  rule.Error(
+      extensions=['.props'],
+      match=lambda n: n.iselement('Shape') and n.attribute('FontSize'),
+      tags=['Shape'],
+      ...)
+
 """
 
 import os
 import glob
+import fnmatch
+import contextlib
 import shutil
+import marshal
+import types
+import xml.etree.ElementTree as ET
 import importlib.util
 
+from flarelint import flarenode
 from flarelint import resources
 
+def _firstfewwords(text):
+    return (' '.join(text.split()[0:8]))[0:50]
+
 class Result():
-    """Contains an message from a broken rule and related information."""
+    """Contains an message from a broken rule and related information.
+
+    A result is a small snapshot of the element that broke the rule,
+    taken when the rule is applied, so that it does not keep the
+    parsed file in memory. The snapshot is the element's tag and the
+    tags of its ancestors, a bit of context to help the user find it,
+    and its position in the file.
 
-    def __init__(self, path, level, node, message):
+    The context is the first few words of the element's text or one of
+    its descriptive attributes, in which case quoted is True, or else
+    a link or file name from one of its attributes.
+    """
+
+    __slots__ = ['path', 'level', 'message', 'ruleid', 'tag', 'tagpath', 'context',
+                 'quoted', 'line', 'column']
+
+    def __init__(self, path, level, node, message, ruleid=None):
         self.path = path
         self.level = level
-        self.node = node
         self.message = message
+        self.ruleid = ruleid
+        self.tag = node.name()
+        self.tagpath = node.tagpath()
+        self.line, self.column = node.sourceposition()
+
+        context = node.valueof().strip() \
+                  or node.attribute('alt').strip() \
+                  or node.attribute('title').strip() \
+                  or node.attribute('Title').strip() \
+                  or node.attribute('Comment').strip()
+        self.quoted = bool(context)
+
+        if context:
+            self.context = _firstfewwords(context)
+        else:
+            self.context = node.attribute('href').strip() \
+                           or node.attribute('src').strip() \
+                           or node.attribute('Link').strip()
+
+# The rule ID of results for files that are not well-formed XML.
+PARSE_ERROR_ID = 'flarelint_parse_error'
+
+# The rule ID of results for snippets that include themselves, when
+# snippets are expanded.
+SNIPPET_CYCLE_ID = 'flarelint_snippet_cycle'
 
 _rulebook = {}
 
+# The name of the rule module being loaded and how many rules it has
+# created so far, for assigning default rule IDs.
+_loading = {'module': '__main__', 'count': 0}
+
+def clear():
+    """Removes all rules."""
+
+    _rulebook.clear()
+
+@contextlib.contextmanager
+def rulemodule(name):
+    """A context in which new rules get the IDs of the rules of a module
+    named name: name:1, name:2, and so on, as when load() runs the
+    module.  Useful for rules made elsewhere, like in tests."""
+
+    _loading['module'] = name
+    _loading['count'] = 0
+    try:
+        yield
+    finally:
+        _loading['module'] = '__main__'
+        _loading['count'] = 0
+
 def _addrule(extensions, rule):
     for e in extensions:
         if e not in _rulebook:
@@ -125,15 +233,30 @@ def _rulesdir():
 class _Rule:
     _LEVEL = 'Instantiate from rule.Error or rule.Warning instead.'
 
-    def __init__(self, extensions, match, test, message):
+    # Whether the scan calls collect() instead of apply().
+    collects = False
+
+    def __init__(self, extensions, match, test, message, id=None, tags=None, note=None):
         self.match = match
         self.test = test
         self.message = message
+        self.note = note
+        self.tags = tags if tags is not None else getattr(match, 'tags', None)
+        _loading['count'] += 1
+        self.module = _loading['module']
+        self.id = id or '{0}:{1}'.format(self.module, _loading['count'])
         _addrule(extensions, self)
 
+    def level(self):
+        return self._LEVEL
+
     def apply(self, path, node):
         if self.match(node) and not self.test(node):
-            return Result(path, self._LEVEL, node, self.message)
+            result = Result(path, self._LEVEL, node, self.message, self.id)
+            note = self.note(node) if self.note else None
+            if note:
+                result.message = self.message + '\n\n' + note
+            return result
 
         return None
 
@@ -143,13 +266,92 @@ class Error(_Rule):
 class Warning(_Rule):
     _LEVEL = resources.WARNING_LEVEL
 
+class _ProjectRule(_Rule):
+    """A rule that compares elements across the files of a scan.
+
+    Instead of a test function, a project rule has a key function,
+    which returns what the rule needs to know about a matching element,
+    or None to ignore it, and a finish function.  After the scan, the
+    finish function gets a list of (key, path) pairs, one for each
+    element that the rule collected, and yields (index, note) pairs for
+    the elements that break the rule.  The note, if not empty, is added
+    to the message of that result.  For an issue with a file as a
+    whole, like a stylesheet, the finish function yields (path, note)
+    instead.
+    """
+
+    collects = True
+
+    def __init__(self, extensions, match, key, finish, message, id=None, tags=None):
+        super().__init__(extensions, match, lambda n: True, message, id, tags)
+        self.key = key
+        self.finishitems = finish
+
+    def collect(self, path, node):
+        """Returns the key, path, and source position of an element, or
+        None.  A project rule may collect most elements of a project, so
+        it keeps no result for them; finish() finds again the few that
+        break the rule."""
+
+        if self.match(node):
+            value = self.key(node)
+            if value is not None:
+                return value, path, node.sourceposition()
+
+        return None
+
+    def finish(self, entries):
+        """Yields the results for the collected (key, path, position)
+        entries that break the rule."""
+
+        broken = list(self.finishitems([(value, path) for value, path, position in entries]))
+        nodes = _find(entries[i][1:] for i, note in broken if not isinstance(i, str))
+        for i, note in broken:
+            if isinstance(i, str):
+                result = Result(i, self._LEVEL, flarenode.EMPTY, self.message, self.id)
+            else:
+                path, position = entries[i][1:]
+                node = nodes.get((path, position), flarenode.EMPTY)
+                result = Result(path, self._LEVEL, node, self.message, self.id)
+                result.line, result.column = position
+            if note:
+                result.message = self.message + '\n\n' + note
+            yield result
+
+def _find(locations):
+    """Returns a dictionary of (path, position) pairs and the nodes at
+    those positions, parsing each file once.  A file that cannot be
+    read again is left out."""
+
+    wanted = {}
+    for path, position in locations:
+        wanted.setdefault(path, set()).add(position)
+
+    found = {}
+    for path, positions in wanted.items():
+        try:
+            root = flarenode.parse(path)
+        except (ET.ParseError, OSError):
+            continue
+        for node in root.iter():
+            if node.sourceposition() in positions:
+                found[(path, node.sourceposition())] = node
+    return found
+
+class ProjectError(_ProjectRule):
+    _LEVEL = resources.ERROR_LEVEL
+
+class ProjectWarning(_ProjectRule):
+    _LEVEL = resources.WARNING_LEVEL
+
 LDQUO = '&#8220;'
 RDQUO = '&#8221;'
 HELLIP = '&#8230;'
 NBSP = '&#160;'
 
 TOPICS = ['.htm', '.html']
-TOPICS_AND_SNIPPETS = TOPICS + ['.flsnp']
+SNIPPETS = ['.flsnp']
+TOPICS_AND_SNIPPETS = TOPICS + SNIPPETS
 TOCS = ['.fltoc']
 TARGETS = ['.fltar']
 CAPTURE_GRAPHICS = ['.props']
@@ -157,12 +359,55 @@ IMPORTS = ['.flimpfl']
 
 _RULE_MODULE_PATTERN = "[!_][!_]*.py"
 
+def tags(extension):
+    """Returns the tag names of the elements that the rules for an
+    extension can match, or None if any of the rules can match other
+    elements or does not say.  Call load() first.
+
+    A rule says which elements its match function can match with the
+    tags argument, like tags=['Shape'].  Match functions from
+    flarenode.whenself() say so themselves.
+    """
+
+    names = set()
+    for r in _rulebook.get(extension, []):
+        if r.tags is None:
+            return None
+        names.update(r.tags)
+    return names
+
 def getrules(extension):
     """Returns the rule objects for a specific file name extension. Call
     load() first."""
 
     return _rulebook.get(extension, None)
 
+def extensions():
+    """Returns the file name extensions that have rules. Call load()
+    first."""
+
+    return set(_rulebook)
+
+def _matches(r, patterns):
+    return any(fnmatch.fnmatchcase(name, p)
+               for p in patterns for name in (r.module, r.id))
+
+def _selected(r, select, ignore, level):
+    if select and not _matches(r, select):
+        return False
+    if ignore and _matches(r, ignore):
+        return False
+    return level is None or level == resources.WARNING_LEVEL or r.level() == level
+
+def _prune(select, ignore, level):
+    """Remove unselected rules from the rulebook, and extensions that are
+    left without rules."""
+
+    for e in list(_rulebook):
+        _rulebook[e] = [r for r in _rulebook[e] if _selected(r, select, ignore, level)]
+        if not _rulebook[e]:
+            del _rulebook[e]
+
 def _check(user, default, verbose=False):
     """If there are no rules in the user's personal rule folder, copy the
     default rules."""
@@ -176,23 +421,94 @@ def _check(user, default, verbose=False):
 
     assert os.path.isdir(user)
 
-def load(verbose=False):
-    """Load rule modules from the user's personal folder."""
-
-    userpath = os.path.join(os.environ["APPDATA"], "FlareLint")
-    defaultpath = os.path.join(os.path.split(__file__)[0], "rules")
-    
-    _check(userpath, defaultpath, verbose)
+# Compiled rule modules are cached in a single file in the user's rule
+# folder, keyed on each module's modification time and size, so that
+# unchanged rules load without reading or compiling their source.
+_BUNDLE_FILE = os.path.join('__pycache__', 'flarelint-rules.bundle')
+
+def _readbundle(path):
+    try:
+        with open(path, 'rb') as f:
+            magic, modules = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+
+    return modules if magic == importlib.util.MAGIC_NUMBER else {}
+
+def _writebundle(path, modules):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            marshal.dump((importlib.util.MAGIC_NUMBER, modules), f)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+
+def _compile(entry, bundle):
+    """Returns the code for a rule module, from the bundle if the source
+    has not changed since it was compiled."""
+
+    stat = entry.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = bundle.get(entry.name)
+    if cached is not None and cached[0] == key:
+        return key, cached[1]
+
+    with open(entry.path, 'rb') as f:
+        return key, compile(f.read(), entry.path, 'exec')
+
+def defaultfolder():
+    """Returns the folder of the rule modules that come with FlareLint."""
+
+    return os.path.join(os.path.split(__file__)[0], "rules")
+
+def load(verbose=False, select=None, ignore=None, level=None, folder=None, bundle=True):
+    """Load rule modules from the user's personal folder.
+
+    To load only some rules, give select or ignore as lists of rule
+    IDs or module names, which may contain shell-style wildcards, and
+    level as resources.ERROR_LEVEL to load only errors.  Afterwards,
+    extensions() is empty if no rule was selected.
+
+    To load the rule modules of another folder instead, such as
+    defaultfolder(), give its path as folder.  The user's folder and
+    the environment are then left alone.
+
+    Unless bundle is False, the compiled modules are cached in a file
+    in the folder, so that the next load is quicker.  Callers that must
+    not write to the folder, like the API, turn it off.
+    """
+
+    if folder is None:
+        userpath = os.path.join(os.environ["APPDATA"], "FlareLint")
+        _check(userpath, defaultfolder(), verbose)
+    else:
+        userpath = folder
     if verbose:
         print(resources.PROGRESS_RULES_LOAD.format(userpath))
 
-    rulemodules = glob.glob(os.path.join(userpath, _RULE_MODULE_PATTERN))
-    for f in rulemodules:
-        modulefile = os.path.basename(f)
-        modulename = os.path.splitext(modulefile)[0]
+    bundlepath = os.path.join(userpath, _BUNDLE_FILE) if bundle else None
+    cached = _readbundle(bundlepath) if bundle else {}
+    loaded = {}
+    clear()
+
+    with os.scandir(userpath) as entries:
+        rulemodules = sorted((e for e in entries
+                              if fnmatch.fnmatch(e.name, _RULE_MODULE_PATTERN) and e.is_file()),
+                             key=lambda e: e.name)
+    for entry in rulemodules:
         if verbose:
-            print(' ', modulefile)
-        spec = importlib.util.spec_from_file_location(modulename, os.path.join(userpath, modulefile))
-        spec.loader.exec_module(importlib.util.module_from_spec(spec))
+            print(' ', entry.name)
+        key, code = _compile(entry, cached)
+        loaded[entry.name] = (key, code)
+        module = types.ModuleType(os.path.splitext(entry.name)[0])
+        module.__file__ = entry.path
+        with rulemodule(module.__name__):
+            exec(code, module.__dict__)
+
+    if bundle and (loaded.keys() != cached.keys()
+                   or any(loaded[m][0] != cached[m][0] for m in loaded)):
+        _writebundle(bundlepath, loaded)
 
     assert _rulebook
+    _prune(select, ignore, level)
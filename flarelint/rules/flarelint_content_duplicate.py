@@ -0,0 +1,84 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import links
+from flarelint import minhash
+import os
+
+# The blocks of text to compare: paragraphs, and whole lists.
+_BLOCKS = ['p', 'ul', 'ol']
+
+# Shorter blocks, like "Click OK.", are alike by chance.
+_MIN_WORDS = 12
+
+# The share of three-word runs that two blocks must have in common.
+_SIMILARITY = 0.7
+
+# How many other files to name in a result.
+_MAX_NAMED = 3
+
+def _isblock(n):
+    # Paragraphs in lists are compared as part of their list.
+    return n.name() in _BLOCKS and not n.ancestor('li')
+
+def _signature(n):
+    words = minhash.words(n.valueof())
+    return minhash.signature(words) if len(words) >= _MIN_WORDS else None
+
+def _relative(path):
+    projectdir = links.projectdir(path)
+    return os.path.relpath(path, projectdir).replace(os.sep, '/') if projectdir else path
+
+def _clusters(items):
+    """Yields the blocks that are nearly the same as blocks in other
+    files, each with a note that names those files."""
+
+    for group in minhash.clusters([sig for sig, path in items], _SIMILARITY):
+        paths = sorted(set(items[i][1] for i in group))
+        if len(paths) < 2:
+            continue
+        for i in group:
+            others = [p for p in paths if p != items[i][1]]
+            named = ', '.join('`{0}`'.format(_relative(p)) for p in others[:_MAX_NAMED])
+            more = len(others) - _MAX_NAMED
+            yield i, 'Also in: ' + named + (' and {0} more.'.format(more) if more > 0 else '.')
+
+rule.ProjectWarning(
+    id = 'flarelint_content_duplicate:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = _isblock,
+
+    tags = _BLOCKS,
+
+    key = _signature,
+
+    finish = _clusters,
+
+    message = """Text that is nearly the same as text in other files.  Copies
+    of the same text drift apart as writers revise some of them and not
+    others.  To fix, move the text into a snippet and insert the
+    snippet wherever the text is needed."""
+)
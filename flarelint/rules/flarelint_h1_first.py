@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Error(
+    id = 'flarelint_h1_first:1',
+
     extensions = rule.TOPICS,
 
     # Match only the first title, ignore others. Multiple h1 elements
@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Error(
+    id = 'flarelint_h1_single:1',
+
     extensions = rule.TOPICS,
                  
     match = flarenode.whenself('h1'),
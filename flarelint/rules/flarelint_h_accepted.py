@@ -27,6 +27,8 @@ _HEADINGS_ACCEPTED = set(['h1', 'h2'])
 _HEADINGS_ALL = set(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
 
 rule.Error(
+    id = 'flarelint_h_accepted:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     # This match function is also the test, so the test function always fails.
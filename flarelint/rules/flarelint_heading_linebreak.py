@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Warning(
+    id = 'flarelint_heading_linebreak:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
                  
     match = lambda n: n.name() in ["h1", "h2", "h3", "h4", "h5", "h6"],
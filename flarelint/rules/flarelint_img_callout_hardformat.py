@@ -27,6 +27,8 @@ import os
 _ACCEPTED_FONT_SIZE = '16pt'
 
 rule.Warning(
+    id = 'flarelint_img_callout_hardformat:1',
+
     extensions = rule.CAPTURE_GRAPHICS,
 
     match = flarenode.whenself('Shape'),
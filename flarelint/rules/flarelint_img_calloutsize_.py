@@ -27,10 +27,14 @@ import os
 _ACCEPTED_FONT_SIZE = '16pt'
 
 rule.Error(
+    id = 'flarelint_img_calloutsize_:1',
+
     extensions = rule.CAPTURE_GRAPHICS,
 
     match = lambda n: n.iselement('Shape') and n.attribute('FontSize'),
 
+    tags = ['Shape'],
+
     test = lambda n: n.attribute('FontSize') == _ACCEPTED_FONT_SIZE,
 
     message = """Incorrect font size for a callout.  To fix, in Capture, set the
@@ -0,0 +1,49 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import flarenode
+from flarelint import images
+import os
+
+_FORMATS = {'.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg', '.gif': 'gif', '.svg': 'svg'}
+
+def _matchesname(n):
+    image = images.of(n)
+    expected = _FORMATS.get(os.path.splitext(n.attribute('src'))[1].lower())
+    return image is None or image.format is None or expected in (None, image.format)
+
+rule.Error(
+    id = 'flarelint_img_content:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = flarenode.whenself('img'),
+
+    test = _matchesname,
+
+    message = """Graphics file is not in the format that its name says. For
+    example, a file named `.png` holds a GIF image. Some outputs cannot
+    show such files. To fix, convert the file to the format of its
+    name, or rename it and revise the link."""
+)
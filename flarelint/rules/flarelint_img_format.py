@@ -27,6 +27,8 @@ import os
 _ACCEPTED_FORMATS = ['.png', '.jpg', '.jpeg']
 
 rule.Error(
+    id = 'flarelint_img_format:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = flarenode.whenself('img'),
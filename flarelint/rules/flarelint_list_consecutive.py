@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Warning(
+    id = 'flarelint_list_consecutive:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = flarenode.whenself('ul'),
@@ -26,6 +26,8 @@ from flarelint import flarenode
 _ACCEPTED_EMPTY_LI = ['img', 'iframe', 'MadCap:snippetText', 'MadCap:variable']
 
 rule.Error(
+    id = 'flarelint_list_emptyitem:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
                  
     match = lambda n: n.iselement('li') and n.valueof().strip() == '',
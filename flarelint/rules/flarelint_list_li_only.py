@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Error(
+    id = 'flarelint_list_li_only:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     # This match function is also the test. We do this to make sure
@@ -34,6 +34,8 @@ _RE_FR = r'{0}\s*$'.format("".join("[{0}]".format(x) for x in _ACCEPTED_ENDING_F
 _RE_LAST_FR = r'{0}\s*$'.format("".join("[{0}]".format(x) for x in _ACCEPTED_ENDING_LAST_FR))
 
 rule.Error(
+    id = 'flarelint_list_punctuation:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = lambda n: n.iselement('li') and n.parent('ul') and n.lang('en'),
@@ -54,6 +56,8 @@ rule.Error(
 )
 
 rule.Error(
+    id = 'flarelint_list_punctuation:2',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = lambda n: n.iselement('li') and n.nextsibling('li') and n.parent('ul') and n.lang('fr'),
@@ -68,6 +72,8 @@ rule.Error(
 )
 
 rule.Error(
+    id = 'flarelint_list_punctuation:3',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = lambda n: n.iselement('li') and (not n.nextsibling('li')) and n.parent('ul') and n.lang('fr'),
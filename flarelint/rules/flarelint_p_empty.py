@@ -27,6 +27,8 @@ _ACCEPTED_EMPTY_P_DESC = ['img', 'iframe', 'MadCap:snippetText', 'MadCap:variabl
 _ACCEPTED_EMPTY_P_ANC = ['td']
 
 rule.Error(
+    id = 'flarelint_p_empty:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
                  
     match = lambda n: n.iselement('p') and n.valueof().strip() == '',
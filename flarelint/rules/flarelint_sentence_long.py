@@ -0,0 +1,45 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+from flarelint import rule
+from flarelint import flarenode
+from flarelint import readability
+
+# The most words that a sentence can have.
+_MAX_WORDS = 40
+
+rule.Warning(
+    id = 'flarelint_sentence_long:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = flarenode.whenself('p'),
+
+    test = lambda n: readability.of(n).longest <= _MAX_WORDS,
+
+    note = lambda n: 'Longest sentence: {0} words.'.format(readability.of(n).longest),
+
+    message = """Sentence that is too long.  A sentence of more than
+    """ + str(_MAX_WORDS) + """ words is hard to follow, and harder
+    to translate.  To fix, split the sentence, or make a list of its
+    parts."""
+)
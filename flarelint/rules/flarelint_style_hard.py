@@ -26,6 +26,8 @@ from flarelint import flarenode
 _HARDCODE_STYLES = ['b', 'u', 'i']
 
 rule.Error(
+    id = 'flarelint_style_hard:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = lambda n: n.name() in _HARDCODE_STYLES,
@@ -0,0 +1,58 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import stylesheets
+
+# Classes that Flare generates, for table styles, rather than
+# stylesheets.
+_GENERATED = ('TableStyle-',)
+
+def _undefined(n):
+    """Returns the classes of an element that no stylesheet defines for
+    its tag."""
+
+    index = stylesheets.of(n)
+    if index is None or not len(index):
+        return []
+    return [c for c in n.attribute('class').split()
+            if not c.startswith(_GENERATED) and not index.defined(n.name(), c)
+            and not (index.tableclass(c) and n.ancestor_or_self('table'))]
+
+rule.Warning(
+    id = 'flarelint_style_undefined:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = lambda n: n.attribute('class'),
+
+    test = lambda n: not _undefined(n),
+
+    note = lambda n: 'Not defined: ' + ', '.join(
+        '`{0}.{1}`'.format(n.name(), c) for c in _undefined(n)) + '.',
+
+    message = """Style that no stylesheet defines.  The element looks like
+    plain text, and it is probably a typo or a style that was removed.
+    To fix, choose a style from the Styles window, or add the style to
+    a stylesheet in `Content/Resources/Stylesheets`."""
+)
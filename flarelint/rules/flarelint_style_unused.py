@@ -0,0 +1,78 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import stylesheets
+
+# The files whose elements use styles: master pages and page layouts
+# too, not only topics and snippets.
+_EXTENSIONS = rule.TOPICS_AND_SNIPPETS + ['.flmsp', '.flpgl']
+
+# How many styles to name in a result.
+_MAX_NAMED = 20
+
+def _used(n):
+    classes = n.attribute('class').split()
+    return (n.name().lower(), tuple(classes)) if classes else None
+
+def _unused(items):
+    """Yields a result for each stylesheet with styles that none of the
+    elements use.  A class alone, like ".Note", is used by any element
+    with the class."""
+
+    used = set()
+    for (tag, classes), path in items:
+        used.update((tag, c) for c in classes)
+        used.update(('', c) for c in classes)
+
+    index = stylesheets.forpath(items[0][1]) if items else None
+    if index is None:
+        return
+
+    unused = {}
+    for path, tag, cls in index.styles():
+        if (tag, cls) not in used:
+            unused.setdefault(path, []).append('{0}.{1}'.format(tag, cls))
+
+    for path, styles in sorted(unused.items()):
+        named = ', '.join('`{0}`'.format(s) for s in styles[:_MAX_NAMED])
+        more = len(styles) - _MAX_NAMED
+        yield path, 'Not used: ' + named + (' and {0} more.'.format(more) if more > 0 else '.')
+
+rule.ProjectWarning(
+    id = 'flarelint_style_unused:1',
+
+    extensions = _EXTENSIONS,
+
+    match = lambda n: n.attribute('class'),
+
+    key = _used,
+
+    finish = _unused,
+
+    message = """Stylesheet with styles that no topic, snippet, master page, or
+    page layout uses.  Unused styles make the Styles window harder to
+    use and the stylesheet harder to maintain.  To fix, remove the
+    styles, or ignore this warning if other content, like a script,
+    uses them."""
+)
@@ -22,8 +22,26 @@
 
 from flarelint import rule
 from flarelint import flarenode
+from flarelint import stylesheets
+import os
+import re
+
+_TABLE_STYLE = re.compile(r'''mc-table-style\s*:\s*url\(\s*['"]?([^'")]+)''')
+
+def _tablestyle(n):
+    """Returns True unless the table's style refers to a table
+    stylesheet that the project does not have."""
+
+    m = _TABLE_STYLE.search(n.attribute('style'))
+    path = n.resolve(m.group(1).strip()) if m else None
+    if path is None:
+        return True
+    index = stylesheets.of(n)
+    return (index is not None and index.tablestyle(path)) or os.path.isfile(path)
 
 rule.Error(
+    id = 'flarelint_table_style:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = flarenode.whenself('table'),
@@ -34,3 +52,16 @@ rule.Error(
     right-click the table, choose a style from Table Style."""
 )
 
+rule.Error(
+    id = 'flarelint_table_style:2',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = flarenode.whenself('table'),
+
+    test = _tablestyle,
+
+    message = """Missing table style.  The table refers to a table stylesheet
+    that is not in the project, so the table has no style.  To fix,
+    right-click the table, choose a style from Table Style."""
+)
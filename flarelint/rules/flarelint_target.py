@@ -24,16 +24,20 @@ import os
 from flarelint import rule
 from flarelint import flarenode
 
-def targeterror(test, message, outputType = None):
+def targeterror(id, test, message, outputType = None):
     rule.Error(
+        id = id,
         extensions = rule.TARGETS,
         match = lambda n: n.iselement('CatapultTarget')
         and (n.attribute('Type') == outputType or outputType is None),
+        tags = ['CatapultTarget'],
         test = test,
         message = message
     )
 
 targeterror(
+    id = 'flarelint_target:1',
+
     outputType = 'PDF',
     
     test = lambda n: n.attribute('PatchHeadingLevels') == 'true',
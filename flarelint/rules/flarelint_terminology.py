@@ -0,0 +1,70 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+import os
+
+from flarelint import rule
+from flarelint import terminology
+
+_ACCEPTED_ANCESTORS_TERM = ['MadCap:variable', 'code', 'pre']
+
+# Terms from termlist(), compiled into one search for each language
+# when first used.
+_terms = terminology.Terminology()
+
+def termlist(path):
+    """Adds the terms of a CSV or TSV term list to the terms that the rule
+    below looks for.  A relative path is relative to the folder of this
+    file.  See terminology.py for the columns of a term list."""
+
+    _terms.read(os.path.join(os.path.dirname(os.path.abspath(__file__)), path))
+
+def _note(n):
+    hits = []
+    for text, preferred in _terms.find(n):
+        hit = """Use """ + rule.LDQUO + """`""" + preferred + """`""" + rule.RDQUO + \
+            """ instead of """ + rule.LDQUO + """`""" + text + """`""" + rule.RDQUO + """."""
+        if hit not in hits:
+            hits.append(hit)
+    return ' '.join(hits)
+
+rule.Warning(
+    id = 'flarelint_terminology:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = lambda n: _terms.find(n) \
+            and not n.ancestor_or_self('*', lambda a: a.name() in _ACCEPTED_ANCESTORS_TERM),
+
+    test = lambda n: False,
+
+    note = _note,
+
+    message = """Term to avoid.  The text has a term that the
+    terminology lists replace with a preferred term.  We keep our
+    documentation consistent by always using the same term for the
+    same thing.  To fix, replace the term with the preferred term."""
+)
+
+# Add your term lists here:
+#
+# termlist('terminology.csv')
@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Error(
+    id = 'flarelint_textbox_hard_style:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
     
     match = flarenode.whenself('div'),
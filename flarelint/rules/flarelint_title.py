@@ -24,6 +24,8 @@ from flarelint import rule
 from flarelint import flarenode
 
 rule.Warning(
+    id = 'flarelint_title:1',
+
     extensions = rule.TOPICS,
 
     match = flarenode.whenself('title'),
@@ -0,0 +1,131 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import links
+import os
+import unicodedata
+
+# The headings to compare across topics. Add 'h2' to compare section
+# headings too.
+_HEADINGS = ['h1']
+
+# How many other files to name in a result.
+_MAX_NAMED = 3
+
+def _exact(n):
+    text = ' '.join(n.valueof().split())
+    return (n.name(), text) if text else None
+
+def _loose(text):
+    """Letter case, punctuation, and spacing removed."""
+
+    kept = ''.join(c if not unicodedata.category(c).startswith('P') else ' '
+                   for c in text.casefold())
+    return ' '.join(kept.split())
+
+def _groups(items, keyof):
+    """Groups the items whose keys are the same in more than one file.
+    Of the headings of one file, only the first of each key counts: a
+    topic with two of the same heading does not duplicate itself."""
+
+    groups = {}
+    for i, (key, path) in enumerate(items):
+        groups.setdefault(keyof(key), {}).setdefault(path, i)
+    return [list(g.values()) for g in groups.values() if len(g) > 1]
+
+def _name(path):
+    projectdir = links.projectdir(path)
+    return os.path.relpath(path, projectdir).replace(os.sep, '/') if projectdir else path
+
+def _note(paths, total):
+    """Names a few of the other files, so notes stay short for big
+    groups."""
+
+    named = ', '.join('`{0}`'.format(_name(p)) for p in paths[:_MAX_NAMED])
+    more = total - len(paths[:_MAX_NAMED])
+    return 'Also in: ' + named + (' and {0} more.'.format(more) if more > 0 else '.')
+
+def _duplicates(items):
+    for group in _groups(items, lambda key: key):
+        first = group[:_MAX_NAMED]
+        # The same note for each file but the first few.
+        common = _note([items[j][1] for j in first], len(group) - 1)
+        for i in group:
+            if i in first:
+                others = [items[j][1] for j in group[:_MAX_NAMED + 1] if j != i]
+                yield i, _note(others, len(group) - 1)
+            else:
+                yield i, common
+
+def _nearduplicates(items):
+    for group in _groups(items, lambda key: (key[0], _loose(key[1]))):
+        bykey = {}
+        for i in group:
+            bykey.setdefault(items[i][0], []).append(i)
+        # Exact duplicates are reported by the rule above.
+        if len(bykey) < 2:
+            continue
+        for key, members in bykey.items():
+            others = [items[j][1] for k, m in bykey.items() if k != key
+                      for j in m[:_MAX_NAMED]]
+            note = _note(others, len(group) - len(members))
+            for i in members:
+                yield i, note
+
+rule.ProjectWarning(
+    id = 'flarelint_title_duplicate:1',
+
+    extensions = rule.TOPICS,
+
+    match = lambda n: n.name() in _HEADINGS,
+
+    tags = _HEADINGS,
+
+    key = _exact,
+
+    finish = _duplicates,
+
+    message = """Duplicate title. Another topic has the same title, so readers
+    cannot tell the topics apart in search results. To fix, make each
+    title describe what is unique about its topic."""
+)
+
+rule.ProjectWarning(
+    id = 'flarelint_title_duplicate:2',
+
+    extensions = rule.TOPICS,
+
+    match = lambda n: n.name() in _HEADINGS,
+
+    tags = _HEADINGS,
+
+    key = _exact,
+
+    finish = _nearduplicates,
+
+    message = """Nearly duplicate title. Another topic has a title that differs
+    only in letter case, punctuation, or spacing, so readers cannot tell
+    the topics apart in search results. To fix, make each title
+    describe what is unique about its topic."""
+)
@@ -0,0 +1,40 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import flarenode
+from flarelint import toc
+
+rule.Warning(
+    id = 'flarelint_toc_duplicate:1',
+
+    extensions = rule.TOCS,
+
+    match = flarenode.whenself('TocEntry'),
+
+    test = lambda n: toc.entry(n).first,
+
+    message = """TOC entry links to the same file as an earlier entry. A topic
+    should appear only once in a TOC. To fix, remove one of the
+    entries, or link it to another topic."""
+)
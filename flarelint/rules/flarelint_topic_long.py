@@ -0,0 +1,67 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+from flarelint import rule
+from flarelint import flarenode
+from flarelint import readability
+
+# The most words that the paragraphs of a topic can have.
+_MAX_WORDS = 2500
+
+def _counts(n):
+    """Returns the words, sentences, and syllables of the paragraphs in
+    a topic."""
+
+    words = sentences = syllables = 0
+    for p in n.iter():
+        if p.name() == 'p':
+            c = readability.of(p)
+            words += c.words
+            sentences += len(c.sentences)
+            syllables += c.syllables
+    return words, sentences, syllables
+
+def _note(n):
+    words, sentences, syllables = _counts(n)
+    return 'Words: {0}.  Reading ease: {1:.0f}.'.format(
+        words, readability.readingease(words, sentences, syllables))
+
+rule.Warning(
+    id = 'flarelint_topic_long:1',
+
+    extensions = rule.TOPICS,
+
+    match = flarenode.whenself('html'),
+
+    test = lambda n: _counts(n)[0] <= _MAX_WORDS,
+
+    note = _note,
+
+    message = """Topic that is too long.  The paragraphs of the topic
+    have more than """ + str(_MAX_WORDS) + """ words, which is more
+    than readers take in at once, and makes the topic hard to find
+    from search.  To fix, split the topic into topics that each cover
+    one task or idea.
+
+    The reading ease is the Flesch reading ease score of the topic.
+    Higher is easier: plain English scores 60 to 70."""
+)
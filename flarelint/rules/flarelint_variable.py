@@ -20,43 +20,77 @@
 #
 # CDDL HEADER END
 
+
 from flarelint import rule
-from flarelint import flarenode
+from flarelint import textmatch
+from flarelint import variables
 
-_ACCEPTED_ANCESTORS_VAR = ['MadCap:xref', 'code', 'pre']
+_ACCEPTED_ANCESTORS_VAR = ['MadCap:xref', 'MadCap:variable', 'code', 'pre']
 
 CASE_SENSITIVE = True
 
+# Texts from variablerule(), by case sensitivity, and one matcher for
+# all of them, compiled when first used.
+_texts = {True: {}, False: {}}
+_matchers = []
+
 def variablerule(text, variable, caseSensitive = False):
-    """Generates an error rule that checks to see if an element contains
-    a piece of text that should really be a Flare variable."""
-
-    if caseSensitive:
-        normalizedText = ' '.join(text.split())
-        normalizedTest = lambda n: normalizedText not in ' '.join(n.text().split())
-    else:
-        normalizedText = ' '.join(text.split()).casefold()
-        normalizedTest = lambda n: normalizedText not in ' '.join(n.text().split()).casefold()
-
-    rule.Error(
-        extensions = rule.TOPICS_AND_SNIPPETS,
-        
-        match = lambda n: not n.ancestor_or_self('*', lambda n: n.name() in _ACCEPTED_ANCESTORS_VAR),
-        
-        test = normalizedTest,
-        
-        message = """The text """
-        + rule.LDQUO + """`"""
-        + text + """`""" + rule.RDQUO 
-        + """ instead of its variable.  We ensure consistency and simplify
-        maintenance by using a variable for this text instead. To fix,
-        replace this text with variable `""" + variable + """`."""
+    """Adds a piece of text that should really be a Flare variable to the
+    texts that the rule below looks for, along with the values of the
+    project's variable sets."""
+
+    _texts[bool(caseSensitive)].setdefault(text, []).append(variable)
+
+def _textmatchers():
+    if not _matchers and (_texts[True] or _texts[False]):
+        _matchers.append(textmatch.Matcher(_texts[True], True, _texts[False]))
+    return _matchers
+
+def _found(n):
+    """Returns the first text in the element that should be a variable,
+    and the names of its variables, or None."""
+
+    text = n.text()
+    if not text or text.isspace():
+        return None
+
+    index = variables.of(n)
+    matchers = ([index.matcher()] if index is not None else []) + _textmatchers()
+    for m in matchers:
+        hit = m.search(text)
+        if hit is not None:
+            return ' '.join(text[hit[0]:hit[1]].split()), hit[2]
+
+    return None
+
+def _note(n):
+    text, names = _found(n)
+    return """Replace """ + rule.LDQUO + """`""" + text + """`""" + rule.RDQUO + \
+        """ with variable """ + """ or """.join('`{0}`'.format(v) for v in names) + """."""
+
+rule.Error(
+    id = 'flarelint_variable:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = lambda n: _found(n) is not None \
+            and not n.ancestor_or_self('*', lambda a: a.name() in _ACCEPTED_ANCESTORS_VAR),
+
+    test = lambda n: False,
+
+    note = _note,
+
+    message = """Text instead of its variable.  The text is the value of
+    a variable in the project's variable sets, or a text that must be
+    a variable.  We ensure consistency and simplify maintenance by using
+    a variable for this text instead. To fix, replace this text with
+    the variable."""
 )
 
-# Add your variable rules here:
+# Add your variable rules here, for texts that are not the values of
+# variables in the project's variable sets:
 #
 # variablerule('text-that-should-be-a-variable', 'variable-file.variable-name', [optional: CASE_SENSITIVE])
 
 variablerule('FlareLint', 'Var.FlareLint', CASE_SENSITIVE)
 variablerule('Flare Lint', 'Var.FlareLint', CASE_SENSITIVE)
-
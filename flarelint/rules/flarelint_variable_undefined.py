@@ -0,0 +1,47 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+from flarelint import rule
+from flarelint import flarenode
+from flarelint import variables
+
+def _defined(n):
+    index = variables.of(n)
+    return index is None or index.defined(n.attribute('name'))
+
+rule.Error(
+    id = 'flarelint_variable_undefined:1',
+
+    extensions = rule.TOPICS_AND_SNIPPETS,
+
+    match = flarenode.whenself('MadCap:variable'),
+
+    test = _defined,
+
+    note = lambda n: 'Unknown variable: `{0}`.'.format(n.attribute('name')),
+
+    message = """Variable that is not in the project's variable sets.
+    Flare shows the variable's name instead of its value, or nothing.
+    To fix, correct the name of the variable, or add the variable to
+    a variable set in the `Project/VariableSets` folder."""
+)
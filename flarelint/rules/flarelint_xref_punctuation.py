@@ -28,6 +28,8 @@ _PUNCTUATION = '!?.'
 _RE = r'[{0}]\s*$'.format(_PUNCTUATION)
 
 rule.Warning(
+    id = 'flarelint_xref_punctuation:1',
+
     extensions = rule.TOPICS_AND_SNIPPETS,
 
     match = flarenode.whenself('MadCap:xref'),
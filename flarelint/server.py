@@ -0,0 +1,343 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""A lint server that keeps rules and parsed files in memory.
+
+Starting Python and loading the rules takes longer than linting a
+topic, so editors and build tools that lint often can start a server
+once and send it requests instead:
+
+  python -m flarelint serve [project] [--socket PATH | --port N]
+                            [--workers N]
+
+The server listens on a Unix domain socket, which only the user who
+started it can use, or on a TCP port of localhost.  Any local user can
+connect to the port, so the server then prints a random token when it
+starts, and each request must carry it.  Each request is a line of
+JSON:
+
+  {"id": 1, "method": "lintFile", "params": {"path": "..."}, "token": "..."}
+
+and each response is a line of JSON with the same id and either a
+result or an error:
+
+  {"id": 1, "result": {"results": [...], "errors": 1, "warnings": 0}}
+  {"id": 1, "error": {"message": "..."}}
+
+The methods are:
+
+  lintFile      Lint a file of the project.  Params: path, which must
+                be in the project's folder.
+  lintBuffer    Lint the unsaved contents of a file.  Params: path and
+                text.  The path chooses the rules and appears in the
+                results.
+  lintProject   Lint every file of the project.  No params.
+  invalidate    Forget what the server knows about a file, or with no
+                path, about every file, and look for new files.
+                Params: path (optional).
+  shutdown      Stop the server.
+
+Each result is a dictionary, as from formats.record().  A client may
+send several requests without waiting; a pool of worker threads
+handles them, and responses may come back in any order.
+
+The server keeps the parsed tree of recently linted files, and uses a
+tree again until the file's modification time or size changes.  It
+also keeps the project's language and list of files, so lintProject
+does not walk the project folder again until invalidate.  Facts
+about other files that rules find through a tree, like whether the
+target of a TOC link exists, are kept with the tree, so after adding
+or deleting files, send invalidate.
+"""
+
+import collections
+import concurrent.futures
+import hmac
+import json
+import os
+import secrets
+import socketserver
+import stat
+import threading
+
+from flarelint import flarenode
+from flarelint import formats
+from flarelint import images
+from flarelint import report
+from flarelint import resources
+from flarelint import rule
+from flarelint import stylesheets
+from flarelint import variables
+
+# Parsed files to keep in memory.
+_CACHE_FILES = 2048
+
+class TreeCache:
+    """The parsed trees of recently linted files, least recently used
+    first.  Its parse() method stands in for flarenode.parse()."""
+
+    def __init__(self, size=_CACHE_FILES):
+        self._size = size
+        self._trees = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, path, projectlang):
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._trees.get(path)
+            if cached is not None and cached[0] == stamp:
+                self._trees.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        # Parse outside the lock so that workers parse in parallel.  A
+        # file that does not parse is not cached.
+        tree = flarenode.parse(path, projectlang)
+        with self._lock:
+            self._trees[path] = (stamp, tree)
+            self._trees.move_to_end(path)
+            while len(self._trees) > self._size:
+                self._trees.popitem(last=False)
+        return tree
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._trees.clear()
+            else:
+                self._trees.pop(path, None)
+
+class Linter:
+    """Lints the files of one project with the rules already loaded by
+    rule.load().  Without a project, files are in the default language
+    and paths must be absolute."""
+
+    def __init__(self, projectpath, cachesize=_CACHE_FILES):
+        self.projectpath = projectpath and os.path.abspath(projectpath)
+        self.cache = TreeCache(cachesize)
+        self._lock = threading.Lock()
+        self._lang = None
+        self._files = None
+
+    def _index(self):
+        """Returns the project's language and files, finding them the
+        first time."""
+
+        with self._lock:
+            if self._files is None and self.projectpath is None:
+                self._lang = flarenode._FLARE_LANG_DEFAULT
+                self._files = []
+            elif self._files is None:
+                self._lang = flarenode.get_project_lang(self.projectpath)
+                self._files = list(report.projectfiles(self.projectpath))
+            return self._lang, self._files
+
+    def _path(self, path):
+        """Returns the full path of a file of the project.  Raises
+        ValueError for a file outside the project's folder, so that a
+        client cannot read other files through the results."""
+
+        full = os.path.join(os.path.dirname(self.projectpath or ''), path)
+        if self.projectpath is not None:
+            projectdir = os.path.normcase(os.path.realpath(os.path.dirname(self.projectpath)))
+            real = os.path.normcase(os.path.realpath(full))
+            if os.path.commonpath([projectdir, real]) != projectdir:
+                raise ValueError(resources.SERVER_OUTSIDE_PROJECT.format(path))
+        return full
+
+    def _scan(self, parse=None, projectrules=False):
+        # The prefilter reads the file on disk, so not for buffers.
+        lang = self._index()[0]
+        return report._Scan(lang, parse=parse or self.cache.parse, prefilter=parse is None,
+                            projectrules=projectrules)
+
+    def _response(self, scan, results):
+        results = list(results)
+        for found in report._finish(scan).values():
+            results.extend(found)
+        return {
+            'results': [formats.record(r) for r in results],
+            'errors': scan.stats[resources.ERROR_LEVEL],
+            'warnings': scan.stats[resources.WARNING_LEVEL],
+        }
+
+    def lintfile(self, path):
+        scan = self._scan()
+        return self._response(scan, report._lintfile(self._path(path), scan))
+
+    def lintbuffer(self, path, text):
+        scan = self._scan(lambda p, lang: flarenode.fromstring(text, lang, p))
+        return self._response(scan, report._lintfile(self._path(path), scan))
+
+    def lintproject(self):
+        scan = self._scan(projectrules=True)
+        results = []
+        for f in self._index()[1]:
+            results.extend(report._lintfile(f, scan))
+        return self._response(scan, results)
+
+    def invalidate(self, path=None):
+        self.cache.invalidate(self._path(path) if path else None)
+        if path is None or os.path.splitext(path)[1].lower() in images.EXTENSIONS:
+            images.invalidate()
+        if path is None or os.path.splitext(path)[1].lower() == '.flvar':
+            variables.invalidate()
+        if path is None or os.path.splitext(path)[1].lower() == '.css':
+            stylesheets.invalidate()
+        if path is None:
+            with self._lock:
+                self._files = None
+        return {}
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Reads the requests of one connection and hands them to the
+    worker pool."""
+
+    def handle(self):
+        lock = threading.Lock()
+
+        def respond(response):
+            data = (json.dumps(response) + '\n').encode('utf-8')
+            with lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    pass
+
+        pending = []
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                method = request['method']
+            except (ValueError, KeyError, TypeError):
+                respond({'id': None, 'error': {'message': resources.SERVER_BAD_REQUEST}})
+                continue
+            token = self.server.token
+            if token is not None and not hmac.compare_digest(str(request.get('token')), token):
+                respond({'id': request.get('id'), 'error': {'message': resources.SERVER_BAD_TOKEN}})
+                continue
+
+            if method == 'shutdown':
+                concurrent.futures.wait(pending)
+                respond({'id': request.get('id'), 'result': {}})
+                threading.Thread(target=self.server.shutdown).start()
+                return
+
+            pending = [f for f in pending if not f.done()]
+            pending.append(self.server.pool.submit(self.server.call, request, respond))
+
+        concurrent.futures.wait(pending)
+
+class _ServerMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def setup(self, linter, workers):
+        self.linter = linter
+        self.pool = concurrent.futures.ThreadPoolExecutor(workers)
+
+    def call(self, request, respond):
+        """Handles a request in a worker thread."""
+
+        linter = self.linter
+        methods = {
+            'lintFile': lambda p: linter.lintfile(p['path']),
+            'lintBuffer': lambda p: linter.lintbuffer(p['path'], p['text']),
+            'lintProject': lambda p: linter.lintproject(),
+            'invalidate': lambda p: linter.invalidate(p.get('path')),
+        }
+
+        rid = request.get('id')
+        method = methods.get(request['method'])
+        if method is None:
+            respond({'id': rid, 'error': {'message': resources.SERVER_BAD_METHOD.format(request['method'])}})
+            return
+        try:
+            respond({'id': rid, 'result': method(request.get('params') or {})})
+        except (KeyError, TypeError):
+            respond({'id': rid, 'error': {'message': resources.SERVER_BAD_REQUEST}})
+        except Exception as e:
+            # A failing rule or file must not leave the client waiting.
+            respond({'id': rid, 'error': {'message': str(e) or type(e).__name__}})
+
+class _TCPServer(_ServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(_ServerMixin, socketserver.ThreadingUnixStreamServer):
+        pass
+
+def create(linter, socketpath=None, port=0, workers=4):
+    """Returns a server for a Linter, listening on a Unix domain socket
+    if socketpath is given, or else on a port of localhost.  Port 0
+    picks a free port; see server_address.  Requests on a port must
+    carry the server's token.  Call serve_forever().
+
+    Raises ValueError if socketpath is a file other than a socket."""
+
+    if socketpath is not None:
+        try:
+            mode = os.lstat(socketpath).st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None and not stat.S_ISSOCK(mode):
+            raise ValueError(resources.SERVER_NOT_SOCKET.format(socketpath))
+        if mode is not None:
+            os.remove(socketpath)
+        # Only the user may connect, from the moment the socket exists.
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(socketpath, _Handler)
+        finally:
+            os.umask(umask)
+        server.token = None
+    else:
+        server = _TCPServer(('127.0.0.1', port), _Handler)
+        server.token = secrets.token_hex(16)
+    server.setup(linter, workers)
+    return server
+
+def serve(projectpath, socketpath=None, port=0, workers=4):
+    """Loads the rules then serves requests until a shutdown request."""
+
+    rule.load()
+    server = create(Linter(projectpath), socketpath, port, workers)
+    if socketpath is not None:
+        print(resources.SERVER_LISTENING.format(socketpath), flush=True)
+    else:
+        address = '{0}:{1}'.format(*server.server_address)
+        print(resources.SERVER_LISTENING_TOKEN.format(address, server.token), flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.pool.shutdown()
+        if socketpath is not None and os.path.exists(socketpath):
+            os.remove(socketpath)
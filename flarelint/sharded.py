@@ -0,0 +1,163 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""An HTML report split into a small index page and chunks of results.
+
+A single HTML page with a hundred thousand results takes a browser a
+long time to open.  A sharded report is a folder instead:
+
+  index.html          The page to open. Same for every project.
+  data/index.js       Counts by rule and folder, and for each file
+                      with results, its path, its counts by rule, and
+                      the chunk that holds its results.
+  data/chunk-N.js     The results of a few files.
+
+The index page loads data/index.js and lists, filters, and counts
+from it alone.  It loads a chunk only when the user opens one of the
+files in that chunk.
+
+Like report.HtmlReport, this output writes each chunk as the scan
+goes, so the results are not kept in memory.  Only the index is.
+"""
+
+import datetime
+import json
+import os
+import pathlib
+
+from flarelint import report
+from flarelint import resources
+
+# Start a new chunk once the current one has this many results.
+_CHUNK_RESULTS = 500
+
+class ShardedReport:
+    """Writes a sharded report to a folder."""
+
+    def __init__(self, reportdir, projectpath):
+        self._dir = reportdir
+        self._projectdir = os.path.dirname(projectpath)
+        self._levels = [resources.ERROR_LEVEL, resources.WARNING_LEVEL]
+
+        self._header = {
+            'project': projectpath,
+            'date': datetime.datetime.now().strftime(resources.DATE_FORMAT),
+            'user': os.environ['USERNAME'],
+        }
+
+        # Tables of distinct values, and each value's index in them.
+        self._rules = {}
+        self._rulelevels = []
+        self._rulecounts = []
+        self._messages = {}
+        self._dirs = {}
+        self._dircounts = []
+
+        self._files = []
+        self._chunk = {}
+        self._chunkresults = 0
+        self._chunkcount = 0
+
+        os.makedirs(os.path.join(self._dir, 'data'), exist_ok=True)
+        with open(os.path.join(self._dir, resources.SHARDED_INDEX_FILE), 'w', encoding='utf-8') as f:
+            f.write(resources.SHARDED_INDEX)
+
+    def _index(self, table, key):
+        i = table.get(key)
+        if i is None:
+            i = table[key] = len(table)
+        return i
+
+    def _rule(self, r):
+        i = self._index(self._rules, r.ruleid)
+        if i == len(self._rulecounts):
+            self._rulelevels.append(self._levels.index(r.level))
+            self._rulecounts.append(0)
+        self._rulecounts[i] += 1
+        return i
+
+    def _writechunk(self):
+        if not self._chunk:
+            return
+
+        path = os.path.join(self._dir, 'data', 'chunk-{0}.js'.format(self._chunkcount))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('FlareLint.chunk({0}, {1});\n'.format(
+                self._chunkcount, json.dumps(self._chunk, separators=(',', ':'))))
+
+        self._chunk = {}
+        self._chunkresults = 0
+        self._chunkcount += 1
+
+    def file(self, path, results):
+        """Adds the results for a file."""
+
+        directory, name = os.path.split(os.path.relpath(path, self._projectdir))
+        d = self._index(self._dirs, directory.replace(os.sep, '/'))
+        if d == len(self._dircounts):
+            self._dircounts.append([0, 0])
+
+        counts = [0, 0]
+        rulecounts = {}
+        rows = []
+        for r in results:
+            level = self._levels.index(r.level)
+            rule = self._rule(r)
+            message = self._index(self._messages, report._formattedmessage(r.message))
+            counts[level] += 1
+            rulecounts[rule] = rulecounts.get(rule, 0) + 1
+            rows.append([level, rule, message, r.tag, r.context, 1 if r.quoted else 0, r.line])
+
+        self._dircounts[d][0] += counts[0]
+        self._dircounts[d][1] += counts[1]
+
+        fileid = len(self._files)
+        self._files.append([d, name, pathlib.Path(os.path.abspath(path)).as_uri(), counts,
+                            self._chunkcount, sorted(rulecounts.items())])
+        self._chunk[fileid] = rows
+        self._chunkresults += len(rows)
+        if self._chunkresults >= _CHUNK_RESULTS:
+            self._writechunk()
+
+    def close(self, statistics):
+        """Writes the last chunk and the index."""
+
+        self._writechunk()
+
+        index = dict(self._header)
+        index.update({
+            'errors': statistics[resources.ERROR_LEVEL],
+            'warnings': statistics[resources.WARNING_LEVEL],
+            'levels': self._levels,
+            'rules': list(self._rules),
+            'ruleLevels': self._rulelevels,
+            'ruleCounts': self._rulecounts,
+            'messages': list(self._messages),
+            'dirs': list(self._dirs),
+            'dirCounts': self._dircounts,
+            'files': self._files,
+        })
+
+        with open(os.path.join(self._dir, 'data', 'index.js'), 'w', encoding='utf-8') as f:
+            f.write('FlareLint.index(')
+            json.dump(index, f, separators=(',', ':'))
+            f.write(');\n')
@@ -0,0 +1,178 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Topics with their snippets expanded, for rules that judge a topic
+as readers see it.
+
+A topic that pulls in content with MadCap:snippetBlock or
+MadCap:snippetText elements looks different to rules than to readers:
+a topic whose h1 is in a snippet seems to have no h1.  With snippets
+expanded, the scan applies rules to a copy of each topic in which the
+content of each snippet replaces the element that refers to it, as
+deep as snippets refer to other snippets.
+
+Each snippet is parsed once per scan, and its tree is shared by every
+topic that uses it.  Each element of an expanded tree knows where it
+came from through Node.origin(), so results for snippet content name
+the snippet file and its lines.  A snippet that refers to itself,
+directly or through other snippets, is not expanded again.
+"""
+
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+from flarelint import flarenode
+from flarelint import links
+
+_MADCAP = '{http://www.madcapsoftware.com/Schemas/MadCap.xsd}'
+_BLOCK = _MADCAP + 'snippetBlock'
+_TEXT = _MADCAP + 'snippetText'
+
+def _localname(tag):
+    return tag.rpartition('}')[2]
+
+class Snippets:
+    """The parsed snippets of a scan, and the expansion of topics."""
+
+    def __init__(self, projectlang):
+        self._projectlang = projectlang
+        self._trees = {}
+        self._lock = threading.Lock()
+
+    def parse(self, path, projectlang=None):
+        """Returns the root node of a snippet, parsing it the first time.
+        Raises ET.ParseError or OSError like flarenode.parse()."""
+
+        key = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            found = self._trees.get(key)
+        if found is None:
+            try:
+                root = flarenode.parse(path, projectlang or self._projectlang)
+                # A snippet's elements come from the snippet itself.
+                root.document()['origins'] = {e: (path, e) for e in root.element().iter()}
+                found = root
+            except (ET.ParseError, OSError) as e:
+                found = e
+            with self._lock:
+                found = self._trees.setdefault(key, found)
+        if isinstance(found, Exception):
+            raise found
+        return found
+
+    def _snippet(self, path):
+        try:
+            return self.parse(path)
+        except (ET.ParseError, OSError):
+            return None
+
+    def expand(self, root, path):
+        """Returns the expanded copy of a topic's root node, and the nodes
+        of the snippet elements that were not expanded because they
+        would repeat forever."""
+
+        origins = {}
+        sources = {}
+        cycles = []
+        newroot = _Expansion(self, origins, sources, cycles).copy(
+            root.element(), path, root, False, [])
+
+        node = root.copy(newroot, sources, {'path': path, 'origins': origins})
+        if not cycles:
+            return node, []
+        cycles = set(cycles)
+        return node, [n for n in node.iter() if n.element() in cycles]
+
+class _Expansion:
+    """The state of one topic's expansion."""
+
+    def __init__(self, snippets, origins, sources, cycles):
+        self._snippets = snippets
+        self._origins = origins
+        self._sources = sources
+        self._cycles = cycles
+
+    def copy(self, elem, path, source, fromsnippet, stack):
+        """Returns a copy of elem, from the file at path, with snippets
+        expanded.  The source is a node of elem's document.  The stack
+        holds the snippets being expanded."""
+
+        new = ET.Element(elem.tag, elem.attrib)
+        new.text = elem.text
+        new.tail = elem.tail
+        self._sources[new] = (source, elem)
+        if fromsnippet:
+            self._origins[new] = (path, elem)
+
+        self.extend(new, elem, path, source, fromsnippet, stack)
+        return new
+
+    def extend(self, new, elem, path, source, fromsnippet, stack):
+        """Appends copies of the children of elem to new, putting the
+        content of each snippet where the element that refers to it
+        was."""
+
+        for child in elem:
+            content = None
+            if child.tag in (_BLOCK, _TEXT):
+                target = links.resolve(child.get('src'), path)
+                key = os.path.normcase(target) if target else None
+                snippet = self._snippets._snippet(target) if target else None
+                if snippet is not None and key in stack:
+                    copy = self.copy(child, path, source, fromsnippet, stack)
+                    self._cycles.append(copy)
+                    new.append(copy)
+                    continue
+                if snippet is not None:
+                    content = _content(snippet.element(), child.tag == _TEXT)
+
+            if content is None:
+                new.append(self.copy(child, path, source, fromsnippet, stack))
+                continue
+
+            _addtext(new, content.text)
+            stack.append(key)
+            self.extend(new, content, target, snippet, True, stack)
+            stack.pop()
+            _addtext(new, child.tail)
+
+def _content(root, inline):
+    """Returns the element of a snippet whose children and text replace
+    the element that refers to the snippet: the body, or for
+    MadCap:snippetText, the body's first element."""
+
+    body = next((e for e in root.iter() if _localname(e.tag) == 'body'), None)
+    if body is not None and inline and len(body):
+        return body[0]
+    return body
+
+def _addtext(parent, text):
+    """Adds text at the end of an element's content."""
+
+    if not text:
+        return
+    if len(parent):
+        parent[-1].tail = (parent[-1].tail or '') + text
+    else:
+        parent.text = (parent.text or '') + text
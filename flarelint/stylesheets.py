@@ -0,0 +1,224 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""An index of the styles that a project's stylesheets define.
+
+Node.style() tells whether an element has a style, but not whether
+any stylesheet defines that style.  of() returns the Index of the
+project that a node's document belongs to, built from the
+CSS files under Content/Resources/Stylesheets and
+Content/Resources/TableStyles.
+
+A style is a tag and a class, as in "p.Note", or a class alone, as in
+".Note", which applies to any tag.  Each selector of a rule defines
+the styles of its compound selectors, so "div.Box p.Note" defines both
+div.Box and p.Note.  Tag names are compared without letter case, and
+"MadCap|xref" in CSS is the tag "MadCap:xref" in a topic.
+
+Stylesheets are read when a rule first asks about a project's styles,
+and read again when they change, as projectcache.py describes.
+"""
+
+import os
+import re
+
+from flarelint import projectcache
+
+# The folders under Content/Resources with stylesheets and table styles.
+_STYLESHEETS = 'Stylesheets'
+_TABLESTYLES = 'TableStyles'
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+
+# A compound selector with at least one class: an optional tag and
+# its classes, ignoring attribute selectors and pseudo-classes.
+_COMPOUND = re.compile(r'(?<![\w|.#-])([A-Za-z*][\w*-]*(?:\|[A-Za-z*][\w-]*)?)?((?:\.-?[A-Za-z_][\w-]*)+)')
+# Attribute and ID selectors, which do not change the style.
+_IGNORED = re.compile(r'\[[^\]]*\]|#[\w-]+')
+
+# At-rules whose blocks hold more rules, rather than declarations.
+_NESTING = ('@media', '@supports', '@document')
+
+def _blocks(text):
+    """Yields the (prelude, body) of each block at the top level of CSS
+    text, like ("p.Note", "color: red;")."""
+
+    pos = 0
+    while True:
+        start = text.find('{', pos)
+        if start == -1:
+            return
+        # A statement like @import ends with a semicolon, not a block.
+        prelude = text[pos:start].rpartition(';')[2]
+        depth = 1
+        end = start + 1
+        while depth and end < len(text):
+            if text[end] == '{':
+                depth += 1
+            elif text[end] == '}':
+                depth -= 1
+            end += 1
+        yield prelude.strip(), text[start + 1:end - 1]
+        pos = end
+
+def parse(text):
+    """Returns the set of (tag, class) styles that CSS text defines.  The
+    tag is lowercase, or '' for a class alone."""
+
+    styles = set()
+    pending = [_COMMENT.sub(' ', text)]
+    while pending:
+        for prelude, body in _blocks(pending.pop()):
+            if prelude.startswith('@'):
+                if prelude.lower().startswith(_NESTING):
+                    pending.append(body)
+                continue
+            for m in _COMPOUND.finditer(_IGNORED.sub('', prelude)):
+                tag = (m.group(1) or '').replace('|', ':').lower()
+                tag = '' if tag == '*' else tag
+                for cls in m.group(2).split('.')[1:]:
+                    styles.add((tag, cls))
+    return styles
+
+def readstyles(path):
+    """Returns the styles that a CSS file defines, or an empty set if the
+    file cannot be read."""
+
+    try:
+        with open(path, encoding='utf-8-sig', errors='replace') as f:
+            return parse(f.read())
+    except OSError:
+        return set()
+
+class Index(projectcache.ProjectCache):
+    """The styles of a project's stylesheets, and its table styles."""
+
+    def __init__(self, projectdir):
+        super().__init__(projectdir)
+        resourcesdir = os.path.join(projectdir, 'Content', 'Resources')
+        self._dirs = [os.path.join(resourcesdir, _STYLESHEETS),
+                      os.path.join(resourcesdir, _TABLESTYLES)]
+        self._files = {}
+        self._classes = {}
+        self._tableclasses = frozenset()
+        self._tablestyles = frozenset()
+
+    def refresh(self):
+        """Reads the stylesheets that are new or changed."""
+
+        files = {}
+        tablestyles = set()
+        for d in self._dirs:
+            for dirpath, dirnames, filenames in os.walk(d):
+                for f in filenames:
+                    if os.path.splitext(f)[1].lower() != '.css':
+                        continue
+                    path = os.path.join(dirpath, f)
+                    key = projectcache.key(path)
+                    if d is self._dirs[1]:
+                        tablestyles.add(key)
+                    stamp = projectcache.stamp(path)
+                    cached = self._files.get(key)
+                    files[key] = cached if cached is not None and cached[0] == stamp \
+                                 else (stamp, path, readstyles(path))
+
+        # Each class, and the tags that it has styles for.  The classes
+        # of table styles are for the rows, columns, and cells of tables.
+        classes = {}
+        tableclasses = set()
+        for key, (stamp, path, styles) in files.items():
+            for tag, cls in styles:
+                if key in tablestyles:
+                    tableclasses.add(cls)
+                else:
+                    classes.setdefault(cls, set()).add(tag)
+
+        self._files = files
+        self._classes = classes
+        self._tableclasses = frozenset(tableclasses)
+        self._tablestyles = frozenset(tablestyles)
+
+    def defined(self, tag, cls):
+        """Returns True if a stylesheet defines a style for the class on
+        elements with the tag, like ('p', 'Note'), or for the class on
+        any element."""
+
+        self.current()
+        tags = self._classes.get(cls)
+        return tags is not None and ('' in tags or tag.lower() in tags)
+
+    def tableclass(self, cls):
+        """Returns True if a table stylesheet defines the class, for the
+        rows, columns, or cells of tables with that table style."""
+
+        self.current()
+        return cls in self._tableclasses
+
+    def tablestyle(self, path):
+        """Returns True if the file is a table stylesheet of the project."""
+
+        self.current()
+        return projectcache.key(path) in self._tablestyles
+
+    def styles(self):
+        """Yields the (path, tag, class) of each style of each
+        stylesheet, not including table styles, in order of path."""
+
+        self.current()
+        for key, (stamp, path, styles) in sorted(self._files.items()):
+            if key not in self._tablestyles:
+                for tag, cls in sorted(styles):
+                    yield path, tag, cls
+
+    def __len__(self):
+        self.current()
+        return len(self._files)
+
+_indexes = projectcache.Registry(Index)
+
+def index(projectdir):
+    """Returns the Index of a project, the same one each time."""
+
+    return _indexes.get(projectdir)
+
+def invalidate():
+    """Makes each index look for new and changed stylesheets the next
+    time it is used."""
+
+    _indexes.invalidate()
+
+def forpath(path):
+    """Returns the Index of the project of the file at path, or None if
+    the file is not in a project."""
+
+    return _indexes.forpath(path)
+
+def of(node):
+    """Returns the Index of the project that a flarenode.Node's document
+    belongs to, or None if the document's path is unknown or not in a
+    project."""
+
+    document = node.document()
+    if 'stylesheets' not in document:
+        document['stylesheets'] = forpath(node.path())
+    return document['stylesheets']
@@ -0,0 +1,143 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+r"""Term lists: terms to avoid, and the terms to use instead.
+
+A term list is a CSV file, or a TSV file if its name ends in .tsv or
+.tab, with these columns:
+
+  term        The term to avoid.
+  preferred   The term to use instead.
+  lang        Optional.  The language of the term, like "en" or
+              "fr-ca", which matches like Node.lang().  Empty for a
+              term of every language.
+  case        Optional.  "yes" if the term matches only in the letter
+              case that the list gives.  Otherwise any case matches.
+
+A first row that names the columns can give them in any order.
+Without it, the columns are in the order above.
+
+A Terminology compiles the terms of each language into a single
+textmatch.Matcher when first searched, so an element's text is
+searched once for each language whatever the number of terms.
+"""
+
+import csv
+import os
+import threading
+
+from flarelint import textmatch
+
+_COLUMNS = ['term', 'preferred', 'lang', 'case']
+
+_YES = frozenset(['yes', 'y', 'true', '1', 'x'])
+
+class Term:
+    """A term to avoid, and the term to use instead."""
+
+    __slots__ = ['term', 'preferred', 'lang', 'casesensitive']
+
+    def __init__(self, term, preferred, lang='', casesensitive=False):
+        self.term = term
+        self.preferred = preferred
+        self.lang = lang
+        self.casesensitive = casesensitive
+
+def readlist(path):
+    """Returns the list of Terms in a term list file."""
+
+    delimiter = '\t' if os.path.splitext(path)[1].lower() in ('.tsv', '.tab') else ','
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = [[cell.strip() for cell in row] for row in csv.reader(f, delimiter=delimiter)]
+
+    columns = _COLUMNS
+    if rows and rows[0] and rows[0][0].lower() in _COLUMNS:
+        columns = [cell.lower() for cell in rows.pop(0)]
+
+    terms = []
+    for row in rows:
+        fields = dict(zip(columns, row))
+        term = fields.get('term')
+        if not term:
+            continue
+        terms.append(Term(term, fields.get('preferred', ''), fields.get('lang', ''),
+                          fields.get('case', '').lower() in _YES))
+
+    return terms
+
+class Terminology:
+    """The terms of one or more term lists, by language."""
+
+    def __init__(self):
+        self._terms = {}
+        self._matchers = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(t[0]) + len(t[1]) for t in self._terms.values())
+
+    def add(self, terms):
+        """Adds Terms.  A term already added keeps its first preferred
+        term."""
+
+        with self._lock:
+            for t in terms:
+                sensitive, caseless = self._terms.setdefault(t.lang.casefold(), ({}, {}))
+                (sensitive if t.casesensitive else caseless).setdefault(t.term, t.preferred)
+            self._matchers = None
+
+    def read(self, path):
+        """Adds the terms of a term list file."""
+
+        self.add(readlist(path))
+
+    def _compiled(self):
+        matchers = self._matchers
+        if matchers is None:
+            with self._lock:
+                if self._matchers is None:
+                    self._matchers = [(lang, textmatch.Matcher(sensitive, True, caseless))
+                                      for lang, (sensitive, caseless) in sorted(self._terms.items())]
+                matchers = self._matchers
+        return matchers
+
+    def find(self, n):
+        """Returns a list of (text, preferred) for the terms in a node's own
+        text, in the order they appear, for the node's language."""
+
+        if not self._terms:
+            return []
+
+        text = n.text()
+        if not text or text.isspace():
+            return []
+
+        # Like Node.lang(), but the node's language is looked up only once.
+        language = n.language().casefold()
+        hits = []
+        for lang, matcher in self._compiled():
+            if not language.startswith(lang):
+                continue
+            hits.extend(matcher.finditer(text))
+        hits.sort()
+
+        return [(' '.join(text[start:end].split()), preferred) for start, end, preferred in hits]
@@ -0,0 +1,138 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""Find any of many phrases in text with one regular expression.
+
+A rule that looks for each of a list of phrases in every element
+searches the text once per phrase.  A Matcher searches once for all of
+them: it compiles the phrases into a single regular expression shaped
+like a trie, so phrases that start the same share the work, like
+
+  Flare(?:Lint|\s+Lint)?
+
+Phrases match whole words only, and a space in a phrase matches any
+run of white space in the text, so a phrase still matches across a
+line break.
+"""
+
+import re
+
+def _normalize(phrase, casesensitive):
+    phrase = ' '.join(phrase.split())
+    return phrase if casesensitive else phrase.casefold()
+
+def _spellings(phrase, casesensitive):
+    """Returns the spellings of a phrase to put in the trie.  The regular
+    expression ignores case one character at a time, so a caseless
+    phrase goes in both lowercase and casefolded: "Straße" must match
+    "Straße" and "STRASSE", though its key is "strasse"."""
+
+    phrase = ' '.join(phrase.split())
+    if casesensitive:
+        return [phrase]
+    return sorted({phrase.lower(), phrase.casefold()})
+
+def _pattern(node):
+    """Returns the pattern for a trie node: a dictionary of characters
+    and child nodes, in which the key '' marks the end of a phrase."""
+
+    parts = []
+    for char in sorted(c for c in node if c):
+        child = node[char]
+        prefix = r'\s+' if char == ' ' else re.escape(char)
+        # Follow a chain of single children without a group.
+        while len(child) == 1 and '' not in child:
+            char, child = next(iter(child.items()))
+            prefix += r'\s+' if char == ' ' else re.escape(char)
+        parts.append(prefix + _pattern(child) if len(child) > 1 or '' not in child else prefix)
+
+    if not parts:
+        return ''
+    group = parts[0] if len(parts) == 1 else '(?:' + '|'.join(parts) + ')'
+    if '' in node:
+        # A phrase ends here, so the longer ones are optional.
+        return (group if len(parts) > 1 else '(?:' + group + ')') + '?'
+    return group
+
+class Matcher:
+    """Finds the phrases of a dictionary in text.  The dictionary maps
+    each phrase to a value, which search() and finditer() return with
+    each match.  The phrases of the optional dictionary caseless match
+    in any letter case, whatever casesensitive says, so one search finds
+    both kinds."""
+
+    def __init__(self, phrases, casesensitive=True, caseless=None):
+        self._exact = {}
+        self._folded = {}
+        tries = [{}, {}]
+        groups = [(phrases, casesensitive), (caseless or {}, False)]
+        for phrases, sensitive in groups:
+            values = self._exact if sensitive else self._folded
+            trie = tries[0 if sensitive else 1]
+            for phrase, value in phrases.items():
+                key = _normalize(phrase, sensitive)
+                if not key:
+                    continue
+                values.setdefault(key, value)
+                for spelling in _spellings(phrase, sensitive):
+                    node = trie
+                    for char in spelling:
+                        node = node.setdefault(char, {})
+                    node[''] = {}
+
+        patterns = []
+        if self._exact:
+            patterns.append(_pattern(tries[0]))
+        if self._folded:
+            patterns.append('(?i:' + _pattern(tries[1]) + ')')
+
+        if patterns:
+            self._regex = re.compile(r'(?<!\w)(?:' + '|'.join(patterns) + r')(?!\w)')
+        else:
+            self._regex = None
+
+    def __len__(self):
+        return len(self._exact) + len(self._folded)
+
+    def _match(self, m):
+        text = m.group()
+        value = self._exact.get(_normalize(text, True))
+        if value is None:
+            value = self._folded.get(_normalize(text, False))
+        return None if value is None else (m.start(), m.end(), value)
+
+    def finditer(self, text):
+        """Yields (start, end, value) for each phrase in the text."""
+
+        if self._regex is None:
+            return
+        for m in self._regex.finditer(text):
+            found = self._match(m)
+            if found is not None:
+                yield found
+
+    def search(self, text):
+        """Returns (start, end, value) for the first phrase in the text, or
+        None."""
+
+        return next(self.finditer(text), None)
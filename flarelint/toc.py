@@ -0,0 +1,126 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""A model of a Flare TOC (.fltoc), built once per file.
+
+Rules about TOC entries often need facts that depend on the whole
+TOC, like an entry's depth or whether another entry links to the same
+file.  Finding these facts by walking the tree for each entry costs
+time in proportion to the number of entries times the depth of the
+TOC, or worse.  Instead, Toc visits each element once and records,
+for each TocEntry element:
+
+  depth     0 for the top level.
+  path      The Title attributes of the entry's ancestors and the
+            entry, from the top.
+  ordinal   The position of the entry among all of the TOC's entries,
+            in document order, counting from 0.
+  link      The Link attribute.
+  target    The file that the link refers to, or None if it is not a
+            link to a file of the project.
+  first     False if an earlier entry links to the same target.
+
+Rules get the entry of a node with entry().  See the flarelint_toc_*
+rule modules.
+"""
+
+import os
+
+from flarelint import links
+
+_TOC = 'CatapultToc'
+_ENTRY = 'TocEntry'
+
+class Entry:
+    """The facts about one TocEntry element."""
+
+    __slots__ = ['depth', 'path', 'ordinal', 'link', 'target', 'first', '_toc']
+
+    def __init__(self, toc, depth, path, ordinal, link, target, first):
+        self._toc = toc
+        self.depth = depth
+        self.path = path
+        self.ordinal = ordinal
+        self.link = link
+        self.target = target
+        self.first = first
+
+    def exists(self):
+        """Returns False if the entry links to a file of the project that
+        does not exist, and True otherwise."""
+
+        return self.target is None or self._toc.isfile(self.target)
+
+class Toc:
+    """The entries of a TOC, by element."""
+
+    def __init__(self, root, path=None):
+        """The root argument is the root Element of the TOC, and path is
+        the TOC's file, to resolve links.  Without a path, links have no
+        target."""
+
+        self.entries = {}
+        self._isfile = {}
+        projdir = links.projectdir(path) if path else None
+        seen = set()
+
+        # Depth-first, in document order, without recursion.
+        stack = [(root, -1, ())]
+        while stack:
+            element, depth, titles = stack.pop()
+            if element.tag == _ENTRY:
+                depth += 1
+                titles = titles + (element.get('Title', ''),)
+                link = element.get('Link', '')
+                target = links.resolve(link, path, projdir) if projdir else None
+                key = os.path.normcase(target) if target else None
+                self.entries[element] = Entry(self, depth, titles, len(self.entries), link,
+                                              target, key is None or key not in seen)
+                seen.add(key)
+            for child in reversed(element):
+                stack.append((child, depth, titles))
+
+    def isfile(self, path):
+        """Returns True if the file exists, checking each file only once."""
+
+        found = self._isfile.get(path)
+        if found is None:
+            found = self._isfile[path] = os.path.isfile(path)
+        return found
+
+def of(node):
+    """Returns the Toc of a flarenode.Node's document, built the first
+    time."""
+
+    document = node.document()
+    model = document.get('toc')
+    if model is None:
+        model = document['toc'] = Toc(node.root().element(), document.get('path'))
+    return model
+
+def entry(node):
+    """Returns the Entry of a TocEntry node, or None for other nodes."""
+
+    if node.element() is None:
+        return None
+    return of(node).entries.get(node.element())
@@ -0,0 +1,184 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+r"""An index of a project's variables, from its variable sets.
+
+Flare keeps variables in variable set files, Project/VariableSets/*.flvar:
+
+  <CatapultVariableSet>
+    <Variable Name="ProductName" EvaluatedDefinition="FlareLint">FlareLint</Variable>
+  </CatapultVariableSet>
+
+A topic refers to a variable by the name of its set and its own name,
+like <MadCap:variable name="General.ProductName" />.  of() returns
+the Index of the project that a node's document belongs to.
+
+The index reads all of a project's variable sets when first used,
+and afterwards only the sets that change; projectcache.py says when it
+looks for changes.
+"""
+
+import glob
+import os
+import xml.etree.ElementTree as ET
+
+from flarelint import projectcache
+from flarelint import textmatch
+
+# Values that text can hold by chance are not worth a variable, so
+# matcher() leaves out values shorter than this or without letters.
+_MIN_MATCH = 3
+
+# Variable types whose values Flare computes at build time.
+_COMPUTED = frozenset(['DateTime'])
+
+class Variable:
+    """A variable of a variable set."""
+
+    __slots__ = ['name', 'value', 'type']
+
+    def __init__(self, name, value, type):
+        self.name = name
+        self.value = value
+        self.type = type
+
+    def __repr__(self):
+        return 'Variable({0!r}, {1!r}, {2!r})'.format(self.name, self.value, self.type)
+
+def readset(path):
+    """Returns the variables of a variable set file, by their full names,
+    like "General.ProductName".  Returns an empty dictionary if the
+    file cannot be read."""
+
+    setname = os.path.splitext(os.path.basename(path))[0]
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return {}
+
+    variables = {}
+    for e in root.iter('Variable'):
+        name = e.get('Name')
+        if not name:
+            continue
+        value = e.text if e.text and e.text.strip() else e.get('EvaluatedDefinition', '')
+        fullname = setname + '.' + name
+        variables[fullname] = Variable(fullname, ' '.join(value.split()), e.get('Type', 'Text'))
+    return variables
+
+class Index(projectcache.ProjectCache):
+    """The variables of a project, by their full names."""
+
+    def __init__(self, projectdir):
+        super().__init__(projectdir)
+        self._dir = os.path.join(projectdir, 'Project', 'VariableSets')
+        self._sets = {}
+        self._variables = {}
+        self._matcher = None
+
+    def refresh(self):
+        """Reads the variable sets that are new or changed."""
+
+        sets = {}
+        for path in sorted(glob.glob(os.path.join(glob.escape(self._dir), '*.flvar'))):
+            stamp = projectcache.stamp(path)
+            cached = self._sets.get(path)
+            sets[path] = cached if cached is not None and cached[0] == stamp \
+                         else (stamp, readset(path))
+
+        if sets.keys() != self._sets.keys() or \
+           any(sets[p] is not self._sets[p] for p in sets):
+            self._variables = {name: v for stamp, variables in sets.values()
+                               for name, v in variables.items()}
+            self._matcher = None
+        self._sets = sets
+
+    def _current(self):
+        self.current()
+        return self._variables
+
+    def get(self, name):
+        """Returns the Variable with a full name, or None."""
+
+        return self._current().get(name)
+
+    def defined(self, name):
+        """Returns True if the project defines a variable with the full
+        name, like "General.ProductName"."""
+
+        return name in self._current()
+
+    def __len__(self):
+        return len(self._current())
+
+    def __iter__(self):
+        return iter(list(self._current().values()))
+
+    def matcher(self):
+        """Returns a textmatch.Matcher that finds the values of the
+        variables in text, and gives the sorted names of the variables
+        with each value.  The matcher leaves out values that Flare
+        computes, and values too short or without letters to stand out."""
+
+        variables = self._current()
+        with self._lock:
+            if self._matcher is None:
+                names = {}
+                for v in variables.values():
+                    if v.type not in _COMPUTED and len(v.value) >= _MIN_MATCH \
+                       and any(c.isalpha() for c in v.value):
+                        names.setdefault(v.value, []).append(v.name)
+                self._matcher = textmatch.Matcher({value: sorted(n) for value, n in names.items()})
+            return self._matcher
+
+_indexes = projectcache.Registry(Index)
+
+def index(projectdir):
+    """Returns the Index of a project, the same one each time."""
+
+    return _indexes.get(projectdir)
+
+def invalidate():
+    """Makes each index look for new and changed variable sets the next
+    time it is used."""
+
+    _indexes.invalidate()
+
+def forpath(path):
+    """Returns the Index of the project of the file at path, or None if
+    the file is not in a project."""
+
+    return _indexes.forpath(path)
+
+def of(node):
+    """Returns the Index of the project that a flarenode.Node's document
+    belongs to, or None if the document's path is unknown or not in a
+    project."""
+
+    origin = node.origin()
+    if origin:
+        return forpath(origin[0])
+    document = node.document()
+    if 'variables' not in document:
+        document['variables'] = forpath(document.get('path'))
+    return document['variables']
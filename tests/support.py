@@ -0,0 +1,95 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Helpers shared by the tests."""
+
+import contextlib
+import io
+import os
+import tempfile
+
+from flarelint import report
+from flarelint import rule
+
+# The module name of the rules that tests make.
+MODULE = 'flarelint_x'
+
+@contextlib.contextmanager
+def rules(testcase):
+    """A context in which a test makes its rules, in place of any others.
+    They get the IDs of the rules of a module named MODULE:
+    flarelint_x:1, flarelint_x:2, and so on.  The rules are removed
+    when the test ends."""
+
+    rule.clear()
+    testcase.addCleanup(rule.clear)
+    with rule.rulemodule(MODULE):
+        yield
+
+def loadrules(testcase, source, **options):
+    """Loads a rule module, MODULE, with source as its code, through
+    rule.load() with the options.  The rules are removed when the test
+    ends."""
+
+    folder = tempfile.TemporaryDirectory()
+    testcase.addCleanup(folder.cleanup)
+    testcase.addCleanup(rule.clear)
+    with open(os.path.join(folder.name, MODULE + '.py'), 'w') as f:
+        f.write(source)
+    rule.load(folder=folder.name, bundle=False, **options)
+
+def project(folder, files, lang='en-us'):
+    """Writes a project in folder, with a dictionary of files, by their
+    paths under the Content folder with / between names, and their
+    text.  Returns the path of the project file."""
+
+    for name, text in files.items():
+        path = os.path.join(folder, 'Content', *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+    projectpath = os.path.join(folder, 'Test.flprj')
+    with open(projectpath, 'w') as f:
+        f.write('<CatapultProject xml:lang="{0}" />'.format(lang))
+    return projectpath
+
+class _Results:
+    """An output that keeps the results, for lint()."""
+
+    def __init__(self):
+        self.results = []
+
+    def file(self, path, results):
+        self.results.extend(results)
+
+    def close(self, statistics):
+        pass
+
+def lint(projectpath, **options):
+    """Lints a project with report.build() and the options of build(),
+    without the HTML report or progress messages.  Returns the
+    results."""
+
+    output = _Results()
+    with contextlib.redirect_stdout(io.StringIO()):
+        report.build(projectpath, None, outputs=[output], **options)
+    return output.results
@@ -0,0 +1,111 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the in-memory API."""
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import xml.etree.ElementTree as ET
+
+import flarelint
+from flarelint import api
+from flarelint import rule
+
+class TestApi(unittest.TestCase):
+    """Test linting content with the default rules."""
+
+    def setUp(self):
+        api._loaded['folder'] = None
+        rule.clear()
+
+    def tearDown(self):
+        api._loaded['folder'] = None
+        rule.clear()
+
+    def test_bytes_without_environment(self):
+        with mock.patch.dict(os.environ, clear=True):
+            results = list(flarelint.lint_bytes(b'<html><body><p></p></body></html>', '.htm'))
+
+        self.assertIn('flarelint_h1_missing:1', [r.ruleid for r in results])
+        self.assertEqual(results[0].path, 'untitled.htm')
+        self.assertEqual(results[0].line, 1)
+
+    def test_lazy(self):
+        results = flarelint.lint_bytes('<html><body><p></p><p></p></body></html>', '.htm')
+        self.assertEqual(next(results).tag, 'body')
+
+    def test_parse_error(self):
+        results = list(flarelint.lint_bytes('<html>', '.htm', path='a.htm'))
+        self.assertEqual([(r.path, r.ruleid) for r in results], [('a.htm', rule.PARSE_ERROR_ID)])
+
+    def test_tree(self):
+        element = ET.fromstring('<html><body><h1>Title</h1></body></html>')
+        self.assertEqual(list(flarelint.lint_tree(element, '.htm')), [])
+        self.assertEqual(list(flarelint.lint_tree(element, '.unknown')), [])
+
+    def test_buffer_in_project(self):
+        # Project rules need the whole project, so a buffer of it gets
+        # only results of its own.
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'doc',
+                            'Content', 'Topics', 'New.htm')
+        data = ('<html><head><link href="../Resources/Stylesheets/Styles.css" '
+                'rel="stylesheet" /></head><body><h1>Title</h1><p class="Zzz">Text.</p>'
+                '</body></html>')
+        results = list(flarelint.lint_bytes(data, '.htm', path=path))
+        self.assertTrue(results)
+        self.assertEqual(set(r.path for r in results), {path})
+
+    def test_load_rules_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for src in glob.glob(os.path.join(rule.defaultfolder(), '*.py')):
+                shutil.copy(src, folder)
+            before = sorted(os.listdir(folder))
+            flarelint.load_rules(folder)
+            self.assertEqual(sorted(os.listdir(folder)), before)
+            self.assertTrue(rule.extensions())
+
+    def test_title_duplicate(self):
+        topics = {'a.htm': '<h1>Same</h1><h1>Same</h1>', 'b.htm': '<h1>Other</h1>',
+                  'c.htm': '<h1>Other</h1>'}
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'Content'))
+            projectpath = os.path.join(tmp, 'p.flprj')
+            with open(projectpath, 'w') as f:
+                f.write('<CatapultProject />')
+            for name, body in topics.items():
+                with open(os.path.join(tmp, 'Content', name), 'w') as f:
+                    f.write('<html><body>{0}<p>Text.</p></body></html>'.format(body))
+            results = [r for r in flarelint.lint_project(projectpath)
+                       if r.ruleid.startswith('flarelint_title_duplicate')]
+
+        # A topic with the same title twice does not duplicate itself.
+        self.assertEqual(sorted((os.path.basename(r.path), r.ruleid) for r in results),
+                         [('b.htm', 'flarelint_title_duplicate:1'),
+                          ('c.htm', 'flarelint_title_duplicate:1')])
+
+if __name__ == '__main__':
+    unittest.main()
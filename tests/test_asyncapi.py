@@ -0,0 +1,81 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the asyncio API."""
+
+import asyncio
+import contextlib
+import os
+import tempfile
+import unittest
+
+import flarelint
+from flarelint import api
+from flarelint import rule
+
+class TestAsync(unittest.TestCase):
+    """Test linting files from asyncio with the default rules."""
+
+    def setUp(self):
+        api._loaded['folder'] = None
+        rule.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(10):
+            path = os.path.join(self.tmp.name, 't{0}.htm'.format(i))
+            with open(path, 'w') as f:
+                f.write('<html><body><p>{0}</p></body></html>'.format(i))
+            self.paths.append(path)
+
+    def tearDown(self):
+        api._loaded['folder'] = None
+        rule.clear()
+        self.tmp.cleanup()
+
+    def test_files(self):
+        async def lint():
+            return [r async for r in flarelint.lint_files_async(self.paths, concurrency=3,
+                                                                backlog=1)]
+
+        results = asyncio.run(lint())
+        self.assertEqual(sorted(r.path for r in results if r.ruleid == 'flarelint_h1_missing:1'),
+                         sorted(self.paths))
+
+    def test_close_early(self):
+        async def lint():
+            async with contextlib.aclosing(flarelint.lint_files_async(self.paths)) as results:
+                async for r in results:
+                    return r
+
+        self.assertIn(asyncio.run(lint()).path, self.paths)
+
+    def test_project(self):
+        # Results for files that the scan does not visit, like
+        # stylesheets, come last.
+        project = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'doc',
+                                               'userguide.flprj'))
+        results = asyncio.run(flarelint.lint_project_async(project))
+        self.assertTrue(all(r.path.startswith(os.path.dirname(project)) for r in results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for baselines."""
+
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from flarelint import baseline
+from flarelint import flarenode
+from flarelint import resources
+from flarelint import rule
+
+def _results(source, tag):
+    root = ET.fromstring(source)
+    parents = {c:p for p in root.iter() for c in p}
+    nodes = flarenode.Node(root, parents).iter()
+    return [rule.Result(os.path.join('proj', 'Content', 'a.htm'), resources.ERROR_LEVEL,
+                        n, 'message', 'r:1') for n in nodes if n.name() == tag]
+
+class TestBaseline(unittest.TestCase):
+    """Test fingerprints and matching."""
+
+    def test_stable(self):
+        before = _results('<body><p>One</p><ul><li>Item  One</li></ul></body>', 'li')
+        after = _results('<body><h1>New</h1><p>Two</p><ul><li>x</li><li>item one</li></ul></body>', 'li')
+        self.assertEqual(baseline.fingerprint(before[0], 'proj'),
+                         baseline.fingerprint(after[1], 'proj'))
+        self.assertNotEqual(baseline.fingerprint(before[0], 'proj'),
+                            baseline.fingerprint(after[0], 'proj'))
+
+    def test_counts(self):
+        results = _results('<body><p>Same</p><p>Same</p><p>Same</p></body>', 'p')
+        counts = {baseline.fingerprint(results[0], 'proj'): 2}
+        known = baseline.Baseline('proj', counts)
+        self.assertEqual([known.known(r) for r in results], [True, True, False])
+        self.assertEqual(known.skipped, 2)
+
+if __name__ == '__main__':
+    unittest.main()
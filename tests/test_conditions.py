@@ -0,0 +1,115 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for condition tags and targets."""
+
+import tempfile
+import unittest
+
+from flarelint import conditions
+from flarelint import flarenode
+from flarelint import rule
+
+import support
+
+_TOPIC = """<html xmlns:MadCap="http://www.madcapsoftware.com/Schemas/MadCap.xsd"><body>
+<h1 MadCap:conditions="Default.ScreenOnly">Title</h1>
+<p MadCap:conditions="Default.Internal">Secret</p> and after
+<div MadCap:conditions="Default.PrintOnly"><p></p></div>
+<p></p>
+</body></html>"""
+
+def _target(name, expression):
+    return conditions.Target(name, None, conditions.Expression(expression))
+
+class TestExpression(unittest.TestCase):
+    """Test evaluating condition tag expressions."""
+
+    def test_basic(self):
+        e = conditions.Expression('include[A.Print] exclude[A.Internal or A.Screen]')
+        self.assertTrue(e.includes(frozenset()))
+        self.assertTrue(e.includes(frozenset(['A.Print'])))
+        self.assertTrue(e.includes(frozenset(['A.Other'])))
+        self.assertFalse(e.includes(frozenset(['A.Print', 'A.Screen'])))
+        self.assertTrue(conditions.Expression('').includes(frozenset(['A.Internal'])))
+
+    def test_advanced(self):
+        e = conditions.Expression('A.Print and not (A.Internal or A.Draft)')
+        self.assertTrue(e.includes(frozenset(['A.Print'])))
+        self.assertFalse(e.includes(frozenset(['A.Print', 'A.Draft'])))
+        self.assertFalse(e.includes(frozenset(['A.Other'])))
+        self.assertTrue(e.includes(frozenset()))
+        for bad in ['not (A.Print', 'A.Print and', 'A.Print A.Web', 'include[A.Print']:
+            self.assertRaises(ValueError, conditions.Expression, bad)
+
+class TestConditions(unittest.TestCase):
+    """Test the conditions of nodes and the views of targets."""
+
+    def setUp(self):
+        self.root = flarenode.fromstring(_TOPIC)
+
+    def test_node(self):
+        div = self.root.descendant('div')
+        self.assertEqual(conditions.of(div.child('p')), frozenset(['Default.PrintOnly']))
+        self.assertTrue(div.child('p').hascondition('PrintOnly'))
+        self.assertFalse(div.child('p').hascondition('Print'))
+        self.assertEqual(conditions.of(self.root), frozenset())
+
+    def test_view(self):
+        view = conditions.view(self.root,
+                               _target('Print', 'exclude[Default.Internal or Default.ScreenOnly]'))
+        body = view.child('body')
+        self.assertEqual([n.name() for n in body.iter()], ['body', 'div', 'p', 'p'])
+        self.assertIn('and after', body.text())
+        self.assertEqual(body.child('div').sourceposition(), (4, 1))
+        self.assertIs(body.child('div').original(), self.root.descendant('div').element())
+        self.assertIs(conditions.view(self.root, _target('All', '')).element(), self.root.element())
+        internal = flarenode.fromstring('<html xmlns:MadCap="http://www.madcapsoftware.com/Schemas/MadCap.xsd" '
+                                        'MadCap:conditions="Default.Internal" />')
+        self.assertIsNone(conditions.view(internal, _target('Public', 'exclude[Default.Internal]')))
+
+class TestTargets(unittest.TestCase):
+    """Test linting the content of several targets."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.projectpath = support.project(self.tmp.name, {'a.htm': _TOPIC})
+
+        with support.rules(self):
+            rule.Error(rule.TOPICS, flarenode.whenself('p'), lambda n: n.valueof(), 'empty')
+            rule.Error(rule.TOPICS, flarenode.whenself('body'), lambda n: n.child('h1'), 'no h1')
+
+    def lint(self, *targets):
+        results = support.lint(self.projectpath, targets=list(targets))
+        return [(r.ruleid, r.line) for r in results]
+
+    def test_targets(self):
+        printed = _target('Print', 'exclude[Default.Internal or Default.ScreenOnly]')
+        web = _target('Web', 'not Default.PrintOnly and not Default.Internal')
+        self.assertEqual(self.lint(printed), [('flarelint_x:2', 1), ('flarelint_x:1', 4), ('flarelint_x:1', 5)])
+        self.assertEqual(self.lint(web), [('flarelint_x:1', 5)])
+        self.assertEqual(self.lint(printed, web), self.lint(printed))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,339 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for flarenode."""
+
+import xml.etree.ElementTree as ET
+import ast
+import io
+import unittest
+
+from flarelint import flarenode
+from flarelint.flarenode import Node, _FLARE_PREFIX, _FLARE_NAMESPACE_URI, _NAMESPACES
+from flarelint.flarenode import _parsepositions, fromstring
+
+class TestNode(unittest.TestCase):
+    """Test the Node class."""
+
+    root = ET.fromstring("<root xmlns:"
+                         + _FLARE_PREFIX
+                         + "='" + _FLARE_NAMESPACE_URI
+                         + """'>
+  <a xml:lang="fr-ca" MadCap:a = 'Alligator' b = 'Buffalo'>
+    Ant
+    <b>Bonobo</b>
+    eater
+    <b>Bee</b>
+    <b>Bandicoot</b>
+  </a>
+
+  <d>Dog</d>
+
+  <e e = 'Caterpillar'>
+  </e>
+
+  <a c = 'Crawfish'>
+    <b>Banshee<c>Cat</c><c>Crocodile</c></b>
+    <MadCap:b>Bobcat</MadCap:b>
+  </a>
+</root>
+""")
+
+    parents = {c:p for p in root.iter() for c in p}
+
+    def normalize_words(text):
+        return ' '.join(text.split())
+
+    def test_name(self):
+        n = Node(self.root, self.parents)
+        self.assertEqual(n.name(), 'root')
+
+        n = Node(self.root.find('.//MadCap:b', _NAMESPACES), self.parents)
+        self.assertEqual(n.name(), 'MadCap:b')
+
+    def test_text(self):
+        n = Node(self.root.find('.//a/b/c'), self.parents)
+        self.assertEqual(n.text(), 'Cat')
+        n = Node(self.root.find('.//a'), self.parents)
+        self.assertEqual(n.text().split(), ['Ant', 'eater'])
+        self.assertEqual(n.valueof().split(),
+                         ['Ant', 'Bonobo', 'eater', 'Bee', 'Bandicoot'])
+        n = Node(self.root.find('.//a/b'), self.parents)
+        self.assertEqual(n.parent('a').text().split(),
+                         ['Ant',  'eater'])
+        self.assertEqual(n.parent('a').valueof().split(),
+                         ['Ant', 'Bonobo', 'eater', 'Bee', 'Bandicoot'])
+
+
+    def test_tttribute(self):
+        n = Node(self.root.find('.//a'), self.parents)
+        self.assertEqual(n.attribute('MadCap:a'), 'Alligator')
+        self.assertEqual(n.attribute('b'), 'Buffalo')
+        self.assertEqual(n.attribute('c'), '')
+
+    def test_indexof(self):
+        n = Node(self.root, self.parents)
+        self.assertTrue(n.indexof() == 0)
+
+        e = n.child('z') # Empty element.
+        self.assertTrue(e.indexof() == -1)
+
+        a1 = n.child('a')
+        d2 = a1.followingsibling('d')
+        a3 = a1.followingsibling('a')
+        self.assertTrue(a1.indexof() == 0)
+        self.assertTrue(d2.indexof() == 1)
+        self.assertTrue(a3.indexof() == 3)
+
+    def test_child(self):
+        n = Node(self.root, self.parents)
+        self.assertTrue(n.child('a'))
+        self.assertFalse(n.child('b'))
+        self.assertTrue(n.child('a', lambda n: n.attribute('b') == 'Buffalo'))
+        self.assertFalse(n.child('a', lambda n: n.attribute('c') == 'Buffalo'))
+        self.assertTrue(n.child('a', lambda n: n.child('b')))
+        self.assertFalse(n.child('a', lambda n: n.child('c')))
+        self.assertEqual(n.child('*').name(), 'a')
+        self.assertTrue(n.child('a', lambda n: n.position() == 0))
+        self.assertTrue(n.child('d', lambda n: n.position() == 0))
+        self.assertTrue(n.child('a', lambda n: n.position() == 1))
+        self.assertTrue(n.child('*', lambda n: n.position() == 0 and n.name() == 'a'))
+        self.assertTrue(n.child('*', lambda n: n.position() == 1 and n.name() == 'd'))
+        self.assertTrue(n.child('*', lambda n: n.position() == 3
+                                and n.name() == 'a'))
+        self.assertTrue(n.child('a', lambda n: n.position() == 0
+                                and n.attribute('MadCap:a') == 'Alligator'))
+        self.assertTrue(n.child('a', lambda n: n.position() == 1
+                                and n.attribute('c') == 'Crawfish'))
+
+    def test_iselement(self):
+        n = Node(self.root.find('.//a'), self.parents)
+        self.assertTrue(n.iselement('a'))
+        self.assertFalse(n.iselement('b'))
+        self.assertTrue(n.iselement('a', lambda n: n.attribute('MadCap:a') == 'Alligator'))
+
+    def test_parent(self):
+        n = Node(self.root.find('.//a'), self.parents)
+
+        self.assertTrue(n.parent('root'))
+        self.assertFalse(n.parent('z'))
+
+    def test_ancestor_or_self(self):
+        n = Node(self.root.find('.//c'), self.parents)
+        self.assertTrue(n.ancestor_or_self('c'))
+        self.assertTrue(n.ancestor_or_self('b'))
+        self.assertTrue(n.ancestor_or_self('a'))
+        self.assertTrue(n.ancestor_or_self('root'))
+
+        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 0 and n.name() == 'c'))
+        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 1 and n.name() == 'b'))
+        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 2 and n.name() == 'a'))
+        self.assertTrue(n.ancestor_or_self('*', lambda n: n.position() == 3 and n.name() == 'root'))
+
+        self.assertTrue(n.ancestor_or_self('c', lambda n: n.position() == 0))
+        self.assertTrue(n.ancestor_or_self('b', lambda n: n.position() == 0))
+        self.assertFalse(n.ancestor_or_self('b', lambda n: n.position() == 1))
+        self.assertTrue(n.ancestor_or_self('a', lambda n: n.position() == 0))
+        self.assertFalse(n.ancestor_or_self('a', lambda n: n.position() == 2))
+        self.assertTrue(n.ancestor_or_self('root', lambda n: n.position() == 0))
+        self.assertFalse(n.ancestor_or_self('root', lambda n: n.position() == 3))
+        self.assertFalse(n.ancestor_or_self('d'))
+
+    def test_ancestor(self):
+        n = Node(self.root.find('.//c'), self.parents)
+        self.assertFalse(n.ancestor('c'))
+        self.assertTrue(n.ancestor('b'))
+        self.assertTrue(n.ancestor('a'))
+        self.assertTrue(n.ancestor('root'))
+
+        self.assertFalse(n.ancestor('*', lambda n: n.position() == 0 and n.name() == 'c'))
+        self.assertTrue(n.ancestor('*', lambda n: n.position() == 0 and n.name() == 'b'))
+        self.assertTrue(n.ancestor('*', lambda n: n.position() == 1 and n.name() == 'a'))
+        self.assertTrue(n.ancestor('*', lambda n: n.position() == 2 and n.name() == 'root'))
+
+        self.assertTrue(n.ancestor('b', lambda n: n.position() == 0))
+        self.assertFalse(n.ancestor('b', lambda n: n.position() == 1))
+        self.assertTrue(n.ancestor('a', lambda n: n.position() == 0))
+        self.assertFalse(n.ancestor('a', lambda n: n.position() == 2))
+        self.assertTrue(n.ancestor('root', lambda n: n.position() == 0))
+        self.assertFalse(n.ancestor('root', lambda n: n.position() == 3))
+        self.assertFalse(n.ancestor('d'))
+
+    def test_descendant_or_self(self):
+        n = Node(self.root, self.parents)
+        self.assertTrue(n.descendant_or_self('root'))
+        self.assertTrue(n.descendant_or_self('a'))
+        self.assertTrue(n.descendant_or_self('a', lambda n: n.position() == 0))
+        self.assertTrue(n.descendant_or_self('d', lambda n: n.position() == 0))
+        self.assertTrue(n.descendant_or_self('a', lambda n: n.position() == 1))
+
+        self.assertTrue(
+            n.descendant_or_self('*', lambda n: n.position() == 0 and n.name() == 'root'))
+        self.assertTrue(
+            n.descendant_or_self('*', lambda n: n.position() == 1 and n.name() == 'a'))
+        self.assertTrue(
+            n.descendant_or_self('*', lambda n: n.position() == 2 and n.name() == 'b'))
+        self.assertTrue(
+            n.descendant_or_self('*', lambda n: n.position() == 3 and n.name() == 'b'))
+        self.assertTrue(
+            n.descendant_or_self('*', lambda n: n.position() == 5 and n.name() == 'd'))
+
+    def test_descendant(self):
+        n = Node(self.root, self.parents)
+        self.assertFalse(n.descendant('root'))
+        self.assertTrue(n.descendant('a'))
+        self.assertTrue(n.descendant('a', lambda n: n.position() == 0))
+        self.assertTrue(n.descendant('a', lambda n: n.position() == 1))
+
+        self.assertTrue(n.descendant('*', lambda n: n.position() == 0 and n.name() == 'a'))
+        self.assertTrue(n.descendant('*', lambda n: n.position() == 1 and n.name() == 'b'))
+        self.assertTrue(n.descendant('*', lambda n: n.position() == 2 and n.name() == 'b'))
+        self.assertTrue(n.descendant('*', lambda n: n.position() == 4 and n.name() == 'd'))
+
+    def test_precedingsibling(self):
+        n = Node(self.root.find('.//a'), self.parents)
+        n = n.child('b', lambda n: n.position() == 2)
+        self.assertTrue(n.precedingsibling('b'))
+        self.assertTrue(
+            n.precedingsibling('b', lambda n: n.position() == 0 and n.text() == 'Bee'))
+        self.assertTrue(
+            n.precedingsibling('b', lambda n: n.position() == 1 and n.text() == 'Bonobo'))
+        self.assertFalse(n.precedingsibling('a'))
+
+        n = Node(self.root.find('.//d'), self.parents)
+        self.assertTrue(n.precedingsibling('a'))
+        self.assertFalse(n.precedingsibling('root'))
+
+    def test_previousandnextsibling(self):
+        n = Node(self.root.find('.//e'), self.parents)
+        self.assertTrue(n.previoussibling('d'))
+        self.assertTrue(n.nextsibling('a', lambda n: n.attribute('c') == 'Crawfish'))
+
+    def test_followingsibling(self):
+        n = Node(self.root.find('.//a'), self.parents)
+        self.assertTrue(n.followingsibling('d'))
+        self.assertTrue(n.followingsibling('a'))
+        self.assertFalse(n.followingsibling('b'))
+
+        self.assertTrue(n.followingsibling('*', lambda n: n.iselement('d') and n.position() == 0))
+        self.assertTrue(n.followingsibling('*', lambda n: n.iselement('a') and n.position() == 2))
+
+    def test_chaining(self):
+        n = Node(self.root, self.parents)
+        self.assertTrue(n.iselement('root').child('a'))
+        self.assertFalse(n.iselement('z').child('a'))
+        self.assertFalse(n.iselement('z').iselement('a'))
+        self.assertFalse(n.iselement('z').ancestor_or_self('a'))
+        self.assertFalse(n.iselement('z').ancestor('a'))
+        self.assertFalse(n.iselement('z').descendant_or_self('a'))
+        self.assertFalse(n.iselement('z').descendant('a'))
+        self.assertFalse(n.iselement('z').followingsibling('a'))
+        self.assertFalse(n.iselement('z').precedingsibling('a'))
+        self.assertFalse(n.iselement('z').parent('*'))
+        self.assertFalse(n.iselement('z').name())
+        self.assertFalse(n.iselement('z').text())
+        self.assertFalse(n.iselement('z').attribute('a'))
+        self.assertFalse(n.iselement('z').position())
+        self.assertTrue(n.iselement('z').indexof() == -1)
+
+    def test_lang(self):
+        n = Node(self.root, self.parents)
+        self.assertTrue(n.lang('en-us'))
+        self.assertTrue(n.lang('en'))
+        self.assertTrue(n.lang('EN'))
+        self.assertTrue(n.child('a').lang('fr'))
+        self.assertFalse(n.child('a').lang('en-us'))
+        self.assertTrue(n.child('a').child('b').lang('fr-ca'))
+        self.assertFalse(n.child('a').child('b').lang('fr-ca-DURP'))
+        self.assertFalse(n.child('a').child('b').lang('en'))
+
+    def test_project_lang(self):
+        # Every node of a document has the project's language, not only
+        # the root.
+        n = Node(self.root, self.parents, 'fr-fr')
+        self.assertTrue(n.lang('fr'))
+        self.assertTrue(n.child('d').lang('fr'))
+        self.assertFalse(n.child('d').lang('en'))
+        self.assertTrue(n.child('a').lang('fr-ca'))
+
+class TestParse(unittest.TestCase):
+    """Test parsing with source positions."""
+
+    source = b"""<?xml version="1.0" encoding="utf-8"?>
+<html xmlns:MadCap="http://www.madcapsoftware.com/Schemas/MadCap.xsd">
+  <body>
+    <p xml:lang="fr-ca">Text <MadCap:xref href="a.htm">link</MadCap:xref></p>
+  </body>
+</html>
+"""
+
+    def test_same_tree(self):
+        root, positions = _parsepositions(io.BytesIO(self.source))
+        self.assertEqual(ET.tostring(root), ET.tostring(ET.fromstring(self.source)))
+
+    def test_positions(self):
+        root, positions = _parsepositions(io.BytesIO(self.source))
+        n = Node(root, {c:p for p in root.iter() for c in p}, 'en-us', positions)
+        self.assertEqual(n.sourceposition(), (2, 1))
+        self.assertEqual(n.descendant('p').sourceposition(), (4, 5))
+        self.assertEqual(n.descendant('MadCap:xref').sourceposition(), (4, 30))
+        self.assertEqual(n.child('z').sourceposition(), (0, 0))
+
+    def test_error(self):
+        with self.assertRaises(ET.ParseError) as cm:
+            _parsepositions(io.BytesIO(b"<a>\n<b></a>"))
+        self.assertEqual(cm.exception.position[0], 2)
+        with self.assertRaises(ET.ParseError) as again:
+            fromstring(b"<a>\n<b></a>")
+        self.assertEqual(again.exception.position, cm.exception.position)
+
+    def test_lazy_positions(self):
+        n = fromstring(self.source)
+        self.assertIsNone(n._positions._found)
+        self.assertEqual(n.descendant('p').sourceposition(), (4, 5))
+        self.assertEqual(n.descendant('MadCap:xref').sourceposition(), (4, 30))
+        self.assertEqual(n.sourceposition(), (2, 1))
+
+    def test_copy(self):
+        n = fromstring(self.source, path='a.htm')
+        p = n.descendant('p')
+        self.assertIs(p.root().element(), n.element())
+        self.assertEqual(p.path(), 'a.htm')
+        self.assertIs(p.document(), n.document())
+
+        new = ET.Element('p')
+        copy = n.copy(new, {new: (p, p.element())}, {'originals': {new: p.element()}})
+        self.assertEqual(copy.sourceposition(), (4, 5))
+        self.assertIs(copy.original(), p.element())
+        self.assertIsNone(copy.path())
+
+    def test_imports(self):
+        # Rules get the facts of features like variables from their own
+        # modules, which the core of the rule interface does not need.
+        with open(flarenode.__file__, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        imported = [a.name for n in ast.walk(tree) if isinstance(n, ast.ImportFrom)
+                    and n.module == 'flarelint' for a in n.names]
+        self.assertEqual(imported, ['links'])
+
+if __name__ == '__main__':
+    unittest.main()
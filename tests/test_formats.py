@@ -0,0 +1,87 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for the machine-readable outputs."""
+
+import io
+import json
+import unittest
+import xml.etree.ElementTree as ET
+
+from flarelint import flarenode
+from flarelint import formats
+from flarelint import resources
+from flarelint import rule
+
+class TestFormats(unittest.TestCase):
+    """Test that each output is well-formed."""
+
+    message = """Use a `p` element &#8220;here&#8221;.
+    Really.
+
+    *Note:* Or not."""
+
+    def results(self):
+        root = flarenode.Node(flarenode.ET.fromstring('<body><p>Some text</p></body>'), {})
+        return [rule.Result('/tmp/a.htm', resources.ERROR_LEVEL, root, self.message, 'x:1'),
+                rule.Result('/tmp/a.htm', resources.WARNING_LEVEL, flarenode.EMPTY, self.message)]
+
+    def write(self, cls):
+        stream = io.StringIO()
+        output = cls(stream)
+        output.file('/tmp/a.htm', self.results())
+        output.file('/tmp/b.htm', [])
+        output.file('/tmp/c.htm', self.results()[:1])
+        output.close({resources.ERROR_LEVEL: 2, resources.WARNING_LEVEL: 1})
+        return stream.getvalue()
+
+    def test_plainmessage(self):
+        self.assertEqual(formats.plainmessage(self.message),
+                         'Use a `p` element “here”. Really.\n\n*Note:* Or not.')
+
+    def test_jsonl(self):
+        lines = [json.loads(l) for l in self.write(formats.JsonLines).splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]['rule'], 'x:1')
+        self.assertEqual(lines[0]['context'], 'Some text')
+
+    def test_sarif(self):
+        log = json.loads(self.write(formats.Sarif))
+        run = log['runs'][0]
+        self.assertEqual([r['level'] for r in run['results']], ['error', 'warning', 'error'])
+        self.assertEqual(len(run['tool']['driver']['rules']), 2)
+
+    def test_relative_path(self):
+        stream = io.StringIO()
+        output = formats.Sarif(stream)
+        output.file('a.htm', [rule.Result('a.htm', resources.ERROR_LEVEL, flarenode.EMPTY, 'm')])
+        output.close({resources.ERROR_LEVEL: 1, resources.WARNING_LEVEL: 0})
+        location = json.loads(stream.getvalue())['runs'][0]['results'][0]['locations'][0]
+        self.assertTrue(location['physicalLocation']['artifactLocation']['uri'].startswith('file:'))
+
+    def test_junit(self):
+        root = ET.fromstring(self.write(formats.JUnit))
+        self.assertEqual(len(root.findall('testsuite')), 2)
+        self.assertEqual(len(root.findall('.//failure')), 3)
+
+if __name__ == '__main__':
+    unittest.main()
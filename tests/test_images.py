@@ -0,0 +1,118 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the image inventory."""
+
+import os
+import struct
+import tempfile
+import time
+import unittest
+from unittest import mock
+import zlib
+
+from flarelint import flarenode
+from flarelint import images
+from flarelint import projectcache
+
+def _png(width, height, dpi=None):
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    data = b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    if dpi:
+        ppm = round(dpi / 0.0254)
+        data += chunk(b'pHYs', struct.pack('>IIB', ppm, ppm, 1))
+    return data + chunk(b'IDAT', b'') + chunk(b'IEND', b'')
+
+_JPEG = (b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00\x48\x00\x48\x00\x00'
+         b'\xff\xc0\x00\x0b\x08\x01\x2c\x01\x90\x03' + b'\x00' * 6)
+
+_GIF = b'GIF89a' + struct.pack('<HH', 10, 20) + b'\x00' * 10
+
+_SVG = b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 50"/>'
+
+class TestImages(unittest.TestCase):
+    """Test probing headers and finding the image of an img element."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.imagedir = os.path.join(self.tmp.name, 'Content', 'Resources', 'Images')
+        os.makedirs(self.imagedir)
+        os.makedirs(os.path.join(self.tmp.name, 'Content', 'Topics'))
+        for name, data in [('a.png', _png(640, 480, 96)), ('b.jpg', _JPEG),
+                           ('c.gif', _GIF), ('d.svg', _SVG), ('e.png', _GIF)]:
+            self.write(name, data)
+
+    def tearDown(self):
+        images._inventories.forget(self.tmp.name)
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        with open(os.path.join(self.imagedir, name), 'wb') as f:
+            f.write(data)
+
+    def facts(self, name):
+        i = images.probe(os.path.join(self.imagedir, name))
+        return i.format, i.width, i.height, i.dpi
+
+    def test_probe(self):
+        self.assertEqual(self.facts('a.png'), ('png', 640, 480, 96))
+        self.assertEqual(self.facts('b.jpg'), ('jpeg', 400, 300, 72))
+        self.assertEqual(self.facts('c.gif'), ('gif', 10, 20, None))
+        self.assertEqual(self.facts('d.svg'), ('svg', 100, 50, None))
+        self.write('f.png', b'\x89PNG')
+        self.assertEqual(self.facts('f.png'), (None, None, None, None))
+
+    def test_node(self):
+        topic = os.path.join(self.tmp.name, 'Content', 'Topics', 't.htm')
+        root = flarenode.fromstring('<p><img src="../Resources/Images/e.png" />'
+                                    '<img src="/Content/Resources/Images/a.png" />'
+                                    '<img src="missing.png" /></p>', path=topic)
+        found = [images.of(n) for n in root.iter() if n.iselement('img')]
+        self.assertEqual(found[0].format, 'gif')
+        self.assertEqual(found[1].width, 640)
+        self.assertIsNone(found[2])
+
+        self.write('a.png', _png(20, 10) + b'longer')
+        images.invalidate()
+        self.assertEqual(images.of(root.child('img', lambda n: 'a.png' in n.attribute('src'))).width, 20)
+
+    def test_inventory_key(self):
+        inv = images.inventory(self.tmp.name)
+        path = os.path.join(self.imagedir, 'a.png')
+        relative = os.path.relpath(path)
+        self.assertIs(inv.get(relative), inv.get(path))
+        self.assertIs(inv.get(os.path.join(self.imagedir, '..', 'Images', 'a.png')), inv.get(path))
+
+    def test_recheck(self):
+        inv = images.inventory(self.tmp.name)
+        path = os.path.join(self.imagedir, 'c.gif')
+        self.assertEqual(inv.get(path).format, 'gif')
+        self.write('c.gif', _png(1, 2) + b'longer')
+        with mock.patch.object(projectcache, 'RECHECK', 0.0):
+            time.sleep(0.001)
+            self.assertEqual(inv.get(path).format, 'png')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the Language Server Protocol server."""
+
+import io
+import json
+import time
+import unittest
+from unittest import mock
+
+from flarelint import lsp
+from flarelint import resources
+from flarelint import rule
+from flarelint import server
+
+import support
+
+class TestLanguageServer(unittest.TestCase):
+    """Test diagnostics for an open document."""
+
+    def setUp(self):
+        with support.rules(self):
+            rule.Warning(['.htm'], lambda n: n.iselement('p'), lambda n: n.text() != 'bad', 'bad text')
+
+        self.output = io.BytesIO()
+        self.ls = lsp.LanguageServer(self.output, debounce=0.01)
+        self.ls._linter = server.Linter(None)
+
+    def messages(self):
+        data = self.output.getvalue()
+        found = []
+        while data:
+            header, _, data = data.partition(b'\r\n\r\n')
+            length = int(header.split(b':')[1])
+            found.append(json.loads(data[:length]))
+            data = data[length:]
+        return found
+
+    def test_diagnostic_range(self):
+        record = {'line': 2, 'column': 3, 'tag': 'p', 'level': resources.ERROR_LEVEL,
+                  'rule': 'x:1', 'message': 'm'}
+        d = lsp.diagnostic(record, ['', '\U0001F600 <p>'])
+        self.assertEqual(d['range'], {'start': {'line': 1, 'character': 3},
+                                      'end': {'line': 1, 'character': 5}})
+        self.assertEqual(d['severity'], 1)
+
+    def test_debounce(self):
+        uri = 'file:///tmp/t.htm'
+        self.ls.handle({'method': 'textDocument/didOpen', 'params': {'textDocument': {
+            'uri': uri, 'version': 1, 'text': '<body><p>good</p></body>'}}})
+        for version in [2, 3]:
+            self.ls.handle({'method': 'textDocument/didChange', 'params': {
+                'textDocument': {'uri': uri, 'version': version},
+                'contentChanges': [{'text': '<body>\n<p>bad</p></body>'}]}})
+        time.sleep(0.2)
+
+        published = [m['params'] for m in self.messages()]
+        self.assertEqual(published[-1]['version'], 3)
+        self.assertEqual(published[-1]['diagnostics'][0]['range']['start'],
+                         {'line': 1, 'character': 0})
+        # One for opening, at most, and one for both changes.
+        self.assertLessEqual(len(published), 2)
+
+    def test_lint_error(self):
+        uri = 'file:///tmp/t.htm'
+        with mock.patch.object(self.ls, '_schedule'):
+            self.ls.handle({'method': 'textDocument/didOpen', 'params': {'textDocument': {
+                'uri': uri, 'version': 1, 'text': '<body><p>bad</p></body>'}}})
+        with mock.patch.object(server.Linter, 'lintbuffer', side_effect=RuntimeError('boom')):
+            self.ls.lint(uri)
+
+        logged, published = self.messages()
+        self.assertEqual(logged['method'], 'window/logMessage')
+        self.assertIn('RuntimeError: boom', logged['params']['message'])
+        self.assertEqual(published['params'], {'uri': uri, 'diagnostics': [], 'version': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for scan statistics."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from flarelint import flarenode
+from flarelint import metrics
+from flarelint import readability
+from flarelint import report
+from flarelint import resources
+from flarelint import rule
+
+class TestAggregate(unittest.TestCase):
+    """Test counting and OpenMetrics output."""
+
+    def setUp(self):
+        self.aggregate = metrics.Aggregate(os.path.join('proj', 'p.flprj'))
+        path = os.path.join('proj', 'Content', 'Topics', 'Sub', 'a.htm')
+        for level in [resources.ERROR_LEVEL, resources.ERROR_LEVEL, resources.WARNING_LEVEL]:
+            self.aggregate.result(rule.Result(path, level, flarenode.EMPTY, 'm', 'r"1'), '.htm')
+        self.aggregate.file(10)
+        self.aggregate.paragraph(path, readability.counts('Save the topic. Close it.'))
+        self.aggregate.paragraph(path, readability.counts(''))
+
+    def test_counts(self):
+        d = self.aggregate.asdict()
+        self.assertEqual(d['levels'], {resources.ERROR_LEVEL: 2, resources.WARNING_LEVEL: 1})
+        self.assertEqual(d['directories'][0], {'directory': 'Content/Topics',
+                                               'level': resources.ERROR_LEVEL, 'count': 2})
+        self.assertEqual(d['elements'], 10)
+        self.assertEqual(d['readability']['paragraphs'], 1)
+        self.assertEqual(d['readability']['byTopic'][0]['path'], 'Content/Topics/Sub/a.htm')
+
+    def test_openmetrics(self):
+        text = metrics.openmetrics(self.aggregate)
+        self.assertTrue(text.endswith('# EOF\n'))
+        self.assertIn('flarelint_rule_results{project="proj/p.flprj",rule="r\\"1",level="Error"} 2',
+                      text.replace(os.sep, '/'))
+        self.assertIn('measure="sentenceWords",percentile="50"} 2.5', text)
+
+    def test_report(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+             mock.patch.dict(os.environ, {'USERNAME': 'tester'}):
+            reportpath = os.path.join(tmp, 'report.html')
+            html = report.HtmlReport(reportpath, 'p.flprj', self.aggregate.readability)
+            html.close({resources.ERROR_LEVEL: 0, resources.WARNING_LEVEL: 0})
+            with open(reportpath, encoding='utf-8') as f:
+                text = f.read()
+        self.assertIn('<h2>Readability</h2>', text)
+        self.assertIn('a.htm</code></td><td>5</td><td>2</td>', text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for finding nearly identical texts."""
+
+import array
+import time
+import unittest
+
+from flarelint import minhash
+
+_TEXT = """To install the product, open the downloaded package and follow
+the steps that the installer shows on each page of the wizard."""
+
+class TestMinHash(unittest.TestCase):
+    """Test signatures and clusters."""
+
+    def test_signature(self):
+        words = minhash.words(_TEXT)
+        self.assertEqual(words[:3], ['to', 'install', 'the'])
+        self.assertEqual(minhash.signature(words), minhash.signature(minhash.words(_TEXT.upper())))
+        self.assertEqual(len(minhash.signature(['one'])), minhash.SIZE)
+
+    def test_clusters(self):
+        texts = [_TEXT,
+                 'Something completely different about configuring the network settings of the server.',
+                 _TEXT.replace('shows', 'displays'),
+                 _TEXT.replace('product', 'server').replace('wizard', 'dialog box'),
+                 'Something completely different about configuring the network settings of the server.']
+        signatures = [minhash.signature(minhash.words(t)) for t in texts]
+        self.assertEqual(sorted(sorted(g) for g in minhash.clusters(signatures, 0.7)),
+                         [[0, 2], [1, 4]])
+        self.assertEqual(minhash.clusters([], 0.7), [])
+
+    def test_clusters_later_member(self):
+        # All three share the first band, but only the last two are
+        # alike, and they share no other band.
+        first = array.array('I', [0] * 4 + list(range(1, 29)))
+        second = array.array('I', [0] * 4 + list(range(100, 128)))
+        third = array.array('I', second)
+        for band in range(1, minhash.BANDS):
+            third[band * 4] += 1000
+        self.assertEqual(minhash.clusters([first, second, third], 0.7), [[1, 2]])
+
+    def test_clusters_copies(self):
+        # Boilerplate, like a footer in every topic, must not make
+        # clustering compare every pair.
+        signatures = [minhash.signature(minhash.words(_TEXT))] * 20000
+        start = time.perf_counter()
+        groups = minhash.clusters(signatures, 0.7)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual([len(g) for g in groups], [20000])
+
+if __name__ == '__main__':
+    unittest.main()
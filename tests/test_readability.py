@@ -0,0 +1,69 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for readability statistics."""
+
+import unittest
+
+from flarelint import flarenode
+from flarelint import readability
+
+class TestReadability(unittest.TestCase):
+    """Test counting paragraphs and their statistics."""
+
+    def test_counts(self):
+        c = readability.counts('Open the file, e.g. a topic.  Then save it!  "Done?" Yes.')
+        self.assertEqual(c.sentences, [6, 3, 1, 1])
+        self.assertEqual((c.words, c.longest), (11, 6))
+        self.assertEqual(readability.counts(' \n').sentences, [])
+
+        n = flarenode.fromstring('<p>Version 1.2 is <b>out</b>. Try it.</p>')
+        self.assertEqual(readability.of(n).sentences, [4, 2])
+        self.assertIs(readability.of(n), readability.of(n))
+
+        # A variable counts as its value, or its name if that is unknown.
+        n = flarenode.fromstring('<p xmlns:MadCap="http://www.madcapsoftware.com/Schemas/MadCap.xsd">'
+                                 'Save it in <MadCap:variable name="Var.Folder" />. Then close it.</p>')
+        self.assertEqual(readability.of(n).sentences, [4, 3])
+
+    def test_percentiles(self):
+        # Interpolated like numpy.percentile(), with or without NumPy.
+        self.assertEqual(readability.percentiles([1, 2, 3, 4, 10], [0, 50, 75, 100]),
+                         [1.0, 3.0, 4.0, 10.0])
+        self.assertEqual(readability.percentiles([], [50]), [None])
+
+    def test_table(self):
+        table = readability.Table()
+        for text, path in [('One two three. Four.', 'a'), ('Five six.', 'b'),
+                           ('Seven eight nine ten.', 'a')]:
+            table.add(path, readability.counts(text))
+        self.assertEqual(len(table), 3)
+        topics = table.topics()
+        self.assertEqual([t[:3] for t in topics], [('a', 8, 3), ('b', 2, 1)])
+        self.assertAlmostEqual(topics[1][3], readability.readingease(2, 1, 2))
+
+        summary = table.summary()
+        self.assertEqual((summary['topics'], summary['sentences'], summary['words']), (2, 4, 10))
+        self.assertEqual(summary['percentiles']['paragraphWords']['50'], 4.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the scan."""
+
+import codecs
+import os
+import pathlib
+import tempfile
+import unittest
+
+from flarelint import conditions
+from flarelint import flarenode
+from flarelint import metrics
+from flarelint import report
+from flarelint import rule
+
+import support
+
+class TestPrefilter(unittest.TestCase):
+    """Test skipping files that no rule can match."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.needles = report._needles(['Shape', 'MadCap:xref'])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def mayapply(self, data):
+        path = os.path.join(self.tmp.name, 'f')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return report._mayapply(path, self.needles)
+
+    def test_needles(self):
+        self.assertEqual(self.needles, [b':xref', b'<Shape'])
+        self.assertIsNone(report._needles(['p', '*']))
+
+    def test_mayapply(self):
+        self.assertFalse(self.mayapply(b'<Properties><Shapes></Shapes></Properties>'))
+        self.assertTrue(self.mayapply(b'<Shapes><Shape Text="a"/></Shapes>'))
+        self.assertTrue(self.mayapply(b'<p><M:xref>a</M:xref></p>'))
+        self.assertTrue(self.mayapply(b'<Shapes><Shape'))
+        self.assertTrue(self.mayapply(b''))
+        self.assertTrue(self.mayapply(codecs.BOM_UTF16_LE + '<x/>'.encode('utf-16-le')))
+
+    def test_skipped_parse_error(self):
+        with support.rules(self):
+            rule.Error(['.x'], flarenode.whenself('Shape'), lambda n: False, 'shape')
+        projectpath = support.project(self.tmp.name, {'good.x': '<Shapes></Shapes>',
+                                                      'bad.x': '<Shapes>\n</Shape>'})
+        aggregate = metrics.Aggregate(projectpath)
+
+        results = support.lint(projectpath, aggregate=aggregate)
+        self.assertEqual([(os.path.basename(r.path), r.ruleid, r.line) for r in results],
+                         [('bad.x', rule.PARSE_ERROR_ID, 2)])
+        self.assertEqual(aggregate.skipped, 1)
+
+class TestProjectRule(unittest.TestCase):
+    """Test rules that compare elements across files."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        def finish(items):
+            seen = {}
+            for i, (key, path) in enumerate(items):
+                if key in seen:
+                    yield i, 'Same as ' + os.path.basename(items[seen[key]][1])
+                seen.setdefault(key, i)
+            if len(seen) > 1:
+                yield 'titles.txt', ''
+
+        with support.rules(self):
+            rule.ProjectWarning(['.htm'], flarenode.whenself('h1'),
+                                lambda n: n.valueof(), finish, 'dup')
+
+    def lint(self, titles, **options):
+        files = {name: '<html>\n<body>\n  <h1>{0}</h1>\n</body>\n</html>'.format(title)
+                 for name, title in titles}
+        return support.lint(support.project(self.tmp.name, files), **options)
+
+    def test_finish(self):
+        results = self.lint([('a.htm', 'A'), ('b.htm', 'B'), ('c.htm', 'A')])
+        self.assertEqual(len(results), 2)
+        found = {os.path.basename(r.path): r for r in results}
+        self.assertEqual(sorted(found), ['c.htm', 'titles.txt'])
+        self.assertEqual(found['c.htm'].message, 'dup\n\nSame as a.htm')
+        self.assertEqual((found['titles.txt'].message, found['titles.txt'].line), ('dup', 0))
+
+    def test_finish_files(self):
+        # Results are made again from the files, with their context.
+        results = self.lint([('a.htm', 'Alpha'), ('b.htm', 'Alpha')])
+        self.assertEqual([(os.path.basename(r.path), r.tag, r.context, r.line, r.column)
+                          for r in results],
+                         [('b.htm', 'h1', 'Alpha', 3, 3)])
+
+    def test_targets(self):
+        # A scan of the content of targets does not apply project rules.
+        everything = conditions.Target('All', None, conditions.Expression(''))
+        self.assertEqual(self.lint([('a.htm', 'A'), ('b.htm', 'A')], targets=[everything]), [])
+
+class TestHtml(unittest.TestCase):
+    """Test the HTML report."""
+
+    def test_relative_path(self):
+        uri = 'href="' + pathlib.Path(os.path.abspath('a.htm')).as_uri() + '"'
+        self.assertIn(uri, report._formatfile('a.htm', []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for rule IDs and rule selection."""
+
+import os
+import unittest
+
+from flarelint import flarenode
+from flarelint import resources
+from flarelint import rule
+
+import support
+
+_RULES = """from flarelint import rule
+
+never = lambda n: False
+rule.Error(['.htm'], never, never, 'first')
+rule.Warning(['.htm', '.fltoc'], never, never, 'second')
+rule.Error(['.fltar'], never, never, 'named', id='named')
+"""
+
+def _ids(extension):
+    return [r.id for r in rule.getrules(extension) or []]
+
+class TestSelect(unittest.TestCase):
+    """Test loading some of the rules of a module."""
+
+    def test_ids(self):
+        support.loadrules(self, _RULES)
+        self.assertEqual(_ids('.htm'), ['flarelint_x:1', 'flarelint_x:2'])
+        self.assertEqual(_ids('.fltar'), ['named'])
+
+    def test_select(self):
+        support.loadrules(self, _RULES, select=['flarelint_x:2'])
+        self.assertEqual(rule.extensions(), {'.htm', '.fltoc'})
+        self.assertEqual(_ids('.htm'), ['flarelint_x:2'])
+
+    def test_ignore_wildcard(self):
+        support.loadrules(self, _RULES, ignore=['*:1', 'named'])
+        self.assertEqual(_ids('.htm'), ['flarelint_x:2'])
+        self.assertIsNone(rule.getrules('.fltar'))
+
+    def test_level(self):
+        support.loadrules(self, _RULES, level=resources.ERROR_LEVEL)
+        self.assertEqual(rule.extensions(), {'.htm', '.fltar'})
+        self.assertEqual(_ids('.htm'), ['flarelint_x:1'])
+
+class TestRule(unittest.TestCase):
+    """Test what rules match and report."""
+
+    def test_tags(self):
+        with support.rules(self):
+            rule.Warning(['.htm'], lambda n: False, lambda n: False, 'untagged')
+            rule.Warning(['.props'], flarenode.whenself('Shape'), lambda n: False, 'shape')
+            rule.Warning(['.props'], lambda n: False, lambda n: False, 'other', tags=['MadCap:x'])
+        self.assertIsNone(rule.tags('.htm'))
+        self.assertEqual(rule.tags('.props'), {'Shape', 'MadCap:x'})
+        self.assertEqual(rule.tags('.none'), set())
+
+    def test_note(self):
+        with support.rules(self):
+            r = rule.Error(['.htm'], lambda n: True, lambda n: False, 'message',
+                           note=lambda n: n.attribute('class') or None)
+        root = flarenode.fromstring('<p class="x"><b /></p>')
+        self.assertEqual(r.apply('a.htm', root).message, 'message\n\nx')
+        self.assertEqual(r.apply('a.htm', root.child('b')).message, 'message')
+
+class TestShippedRules(unittest.TestCase):
+    """Test the IDs of the rules that come with FlareLint."""
+
+    def test_ids(self):
+        self.addCleanup(rule.clear)
+        rule.load(folder=rule.defaultfolder(), bundle=False)
+        rules = {id(r): r for e in rule.extensions() for r in rule.getrules(e)}.values()
+        ids = [r.id for r in rules]
+        self.assertEqual(len(ids), len(set(ids)))
+
+        # Each ID is written in its module, so that it stays the same
+        # when rules are added or moved.
+        for r in rules:
+            with open(os.path.join(rule.defaultfolder(), r.module + '.py')) as f:
+                self.assertIn("id = '{0}'".format(r.id), f.read())
+
+if __name__ == '__main__':
+    unittest.main()
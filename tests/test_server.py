@@ -0,0 +1,136 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the lint server."""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from flarelint import resources
+from flarelint import rule
+from flarelint import server
+
+import support
+
+_PROJECT = '<CatapultProject xml:lang="fr-ca" />'
+
+class TestServer(unittest.TestCase):
+    """Test requests against a project with one topic and one rule."""
+
+    def setUp(self):
+        with support.rules(self):
+            rule.Error(['.htm'], lambda n: n.iselement('p'), lambda n: n.text() != 'bad', 'bad text')
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.projectpath = os.path.join(self.tmp.name, 'p.flprj')
+        os.makedirs(os.path.join(self.tmp.name, 'Content'))
+        with open(self.projectpath, 'w') as f:
+            f.write(_PROJECT)
+        self.topic = os.path.join(self.tmp.name, 'Content', 't.htm')
+        with open(self.topic, 'w') as f:
+            f.write('<html><body><p>bad</p></body></html>')
+        self.linter = server.Linter(self.projectpath)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cache(self):
+        first = self.linter.lintfile('Content/t.htm')
+        second = self.linter.lintfile('Content/t.htm')
+        self.assertEqual(first, second)
+        self.assertEqual(first['errors'], 1)
+        self.assertEqual(first['results'][0]['line'], 1)
+        self.assertEqual((self.linter.cache.hits, self.linter.cache.misses), (1, 1))
+
+        self.linter.invalidate('Content/t.htm')
+        self.linter.lintfile('Content/t.htm')
+        self.assertEqual(self.linter.cache.misses, 2)
+
+    def test_buffer(self):
+        response = self.linter.lintbuffer('Content/t.htm', '<html><body><p>good</p></body></html>')
+        self.assertEqual(response['results'], [])
+        response = self.linter.lintbuffer('Content/t.htm', '<html><body><p>')
+        self.assertEqual(response['results'][0]['rule'], rule.PARSE_ERROR_ID)
+
+    def test_socket(self):
+        s = server.create(self.linter, workers=2)
+        threading.Thread(target=s.serve_forever).start()
+        try:
+            with socket.create_connection(s.server_address) as c, c.makefile('rwb') as f:
+                requests = [{'id': 0, 'method': 'lintProject', 'token': s.token},
+                            {'id': 1, 'method': 'bogus', 'token': s.token},
+                            {'id': 2, 'method': 'lintProject'}]
+                for request in requests:
+                    f.write(json.dumps(request).encode() + b'\n')
+                f.flush()
+                responses = {r['id']: r for r in (json.loads(f.readline()) for i in range(3))}
+        finally:
+            s.shutdown()
+            s.server_close()
+            s.pool.shutdown()
+
+        self.assertEqual(responses[0]['result']['errors'], 1)
+        self.assertIn('error', responses[1])
+        self.assertEqual(responses[2]['error']['message'], resources.SERVER_BAD_TOKEN)
+
+    def test_outside_project(self):
+        outside = os.path.join(self.tmp.name, '..', 'a.htm')
+        for call in [lambda: self.linter.lintfile(outside),
+                     lambda: self.linter.lintfile('/etc/hostname'),
+                     lambda: self.linter.lintbuffer('../../a.htm', '<p/>')]:
+            with self.assertRaises(ValueError):
+                call()
+
+    @unittest.skipUnless(hasattr(server, '_UnixServer'), 'no Unix domain sockets')
+    def test_socket_path(self):
+        # Only an old socket is replaced, never another file.
+        with self.assertRaises(ValueError):
+            server.create(self.linter, socketpath=self.topic)
+        self.assertTrue(os.path.isfile(self.topic))
+
+        path = os.path.join(self.tmp.name, 's')
+        for i in range(2):
+            s = server.create(self.linter, socketpath=path)
+            s.server_close()
+            s.pool.shutdown()
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+
+    def test_error(self):
+        rule.Error(['.htm'], lambda n: n.iselement('body'), lambda n: 1 / 0, 'broken')
+        s = server.create(self.linter, workers=1)
+        try:
+            responses = []
+            s.call({'id': 7, 'method': 'lintFile', 'params': {'path': 'Content/t.htm'}},
+                   responses.append)
+        finally:
+            s.server_close()
+            s.pool.shutdown()
+
+        self.assertEqual(responses, [{'id': 7, 'error': {'message': 'division by zero'}}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for expanding snippets."""
+
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from flarelint import flarenode
+from flarelint import rule
+from flarelint import snippets
+
+import support
+
+_FILE = """<html xmlns:MadCap="http://www.madcapsoftware.com/Schemas/MadCap.xsd">
+<body>{0}</body></html>"""
+
+_FILES = {
+    'Topics/A.htm': '<MadCap:snippetBlock src="../Snippets/Title.flsnp" />'
+                    '<p>Say <MadCap:snippetText src="../Snippets/Inline.flsnp" />.</p>',
+    'Topics/B.htm': '<MadCap:snippetBlock src="../Snippets/Title.flsnp" />',
+    'Snippets/Title.flsnp': '<h1>Title</h1><p></p><MadCap:snippetBlock src="Loop.flsnp" />',
+    'Snippets/Inline.flsnp': '<p>hello <b>you</b></p>',
+    'Snippets/Loop.flsnp': '<p>loop</p><MadCap:snippetBlock src="Title.flsnp" />',
+}
+
+class TestSnippets(unittest.TestCase):
+    """Test expanded topics and where their results go."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.content = os.path.join(self.tmp.name, 'Content')
+        self.projectpath = support.project(
+            self.tmp.name, {name: _FILE.format(body) for name, body in _FILES.items()})
+
+        with support.rules(self):
+            rule.Error(rule.TOPICS_AND_SNIPPETS, flarenode.whenself('p'), lambda n: n.valueof(), 'empty')
+            rule.Error(rule.TOPICS, flarenode.whenself('body'), lambda n: n.child('h1'), 'no h1')
+
+    def path(self, name):
+        return os.path.join(self.content, *name.split('/'))
+
+    def test_expand(self):
+        path = self.path('Topics/A.htm')
+        root, cycles = snippets.Snippets('en-us').expand(flarenode.parse(path), path)
+        body = root.child('body')
+        self.assertEqual([n.name() for n in body.iter()][1:5], ['h1', 'p', 'p', 'MadCap:snippetBlock'])
+        self.assertEqual(ET.tostring(body.element()[-1], encoding='unicode'), '<p>Say hello <b>you</b>.</p>')
+        self.assertEqual(body.child('h1').origin()[0], self.path('Snippets/Title.flsnp'))
+        self.assertIsNone(body.origin())
+        self.assertEqual([c.origin()[0] for c in cycles], [self.path('Snippets/Loop.flsnp')])
+
+    def test_results_once(self):
+        results = support.lint(self.projectpath, expandsnippets=True)
+
+        found = sorted((os.path.basename(r.path), r.ruleid) for r in results)
+        self.assertEqual(found, [('Loop.flsnp', rule.SNIPPET_CYCLE_ID),
+                                 ('Title.flsnp', 'flarelint_x:1')])
+
+if __name__ == '__main__':
+    unittest.main()
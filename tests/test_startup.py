@@ -0,0 +1,72 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests that the command line starts without importing what it does
+not need.  See also benchmarks/startup.py."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that a plain lint must not import, because they take long to
+# import or only some options need them.
+_UNNEEDED = ['asyncio', 'concurrent.futures', 'urllib.request', 'xml.sax.saxutils',
+             'flarelint.api', 'flarelint.asyncapi', 'flarelint.baseline',
+             'flarelint.formats', 'flarelint.metrics', 'flarelint.sharded']
+
+_CODE = """
+import sys
+import flarelint
+try:
+    flarelint.main([{project!r}, '--no-html', '--max-results', '1'])
+except SystemExit:
+    pass
+print(' '.join(sys.modules), file=sys.stderr)
+"""
+
+class TestStartup(unittest.TestCase):
+    """Test the modules that a lint imports."""
+
+    def test_imports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'Content'))
+            with open(os.path.join(tmp, 'Content', 'Topic.htm'), 'w') as f:
+                f.write('<html><body><h1>Title</h1></body></html>')
+            project = os.path.join(tmp, 'Startup.flprj')
+            with open(project, 'w') as f:
+                f.write('<CatapultProject />')
+
+            env = dict(os.environ, APPDATA=os.path.join(tmp, 'AppData'), USERNAME='test')
+            out = subprocess.run([sys.executable, '-c', _CODE.format(project=project)],
+                                 env=env, cwd=_ROOT, stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.PIPE, check=True)
+
+        modules = set(out.stderr.decode().split())
+        self.assertIn('flarelint.report', modules)
+        self.assertEqual([m for m in _UNNEEDED if m in modules], [])
+
+if __name__ == '__main__':
+    unittest.main()
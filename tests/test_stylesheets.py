@@ -0,0 +1,96 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the stylesheet index."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from flarelint import flarenode
+from flarelint import projectcache
+from flarelint import stylesheets
+
+_CSS = """/* p.Comment {} */
+p.Note, div.Box p.Tip:hover, .Warn, MadCap|xref.Plain a[href='x.y'] { color: red; }
+@media print { h1.PrintOnly { page-break-before: always; } }
+@font-face { font-family: x.y; }
+img#logo.Small { }
+"""
+
+class TestStylesheets(unittest.TestCase):
+    """Test parsing stylesheets and finding styles."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        resources = os.path.join(self.tmp.name, 'Content', 'Resources')
+        self.write(os.path.join(resources, 'Stylesheets', 'Styles.css'), _CSS)
+        self.table = os.path.join(resources, 'TableStyles', 'Basic.css')
+        self.write(self.table, '.TableStyle-Basic .Body-Body1 { }')
+
+    def tearDown(self):
+        stylesheets._indexes.forget(self.tmp.name)
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def test_parse(self):
+        self.assertEqual(stylesheets.parse(_CSS), {
+            ('p', 'Note'), ('div', 'Box'), ('p', 'Tip'), ('', 'Warn'), ('madcap:xref', 'Plain'),
+            ('h1', 'PrintOnly'), ('img', 'Small')})
+
+    def test_index(self):
+        index = stylesheets.index(self.tmp.name)
+        self.assertTrue(index.defined('p', 'Note'))
+        self.assertTrue(index.defined('MadCap:xref', 'Plain'))
+        self.assertTrue(index.defined('li', 'Warn'))
+        self.assertFalse(index.defined('li', 'Note'))
+        self.assertFalse(index.defined('p', 'Body-Body1'))
+        self.assertTrue(index.tableclass('Body-Body1'))
+        self.assertTrue(index.tablestyle(self.table))
+        self.assertEqual(len(list(index.styles())), 7)
+
+    def test_node(self):
+        topic = os.path.join(self.tmp.name, 'Content', 'Topics', 'a.htm')
+        root = flarenode.fromstring('<p />', path=topic)
+        self.assertIs(stylesheets.of(root), stylesheets.index(self.tmp.name))
+        self.assertEqual(root.resolve('../Resources/TableStyles/Basic.css'), self.table)
+        self.assertIsNone(stylesheets.of(flarenode.fromstring('<p />')))
+
+    def test_recheck(self):
+        index = stylesheets.index(self.tmp.name)
+        self.assertFalse(index.defined('p', 'New'))
+        self.write(os.path.join(self.tmp.name, 'Content', 'Resources', 'Stylesheets', 'More.css'),
+                   'p.New { }')
+        with mock.patch.object(projectcache, 'RECHECK', 0.0):
+            time.sleep(0.001)
+            self.assertTrue(index.defined('p', 'New'))
+            self.assertTrue(index.tablestyle(os.path.relpath(self.table)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+"""Tests for term lists."""
+
+import os
+import tempfile
+import unittest
+
+from flarelint import flarenode
+from flarelint import terminology
+
+_CSV = """﻿Term,Preferred,Lang,Case
+log-in,log in,,
+e-mail,email,en,
+courriel électronique,courriel,fr,
+OK,OK button,,yes
+"""
+
+class TestTerminology(unittest.TestCase):
+    """Test reading term lists and finding their terms."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_readlist(self):
+        terms = terminology.readlist(self.write('terms.csv', _CSV))
+        self.assertEqual([t.term for t in terms], ['log-in', 'e-mail', 'courriel électronique', 'OK'])
+        self.assertEqual(terms[1].lang, 'en')
+        self.assertEqual([t.casesensitive for t in terms], [False, False, False, True])
+
+        terms = terminology.readlist(self.write('terms.tsv', 'setup\tset up\n\n'))
+        self.assertEqual([(t.term, t.preferred, t.lang) for t in terms], [('setup', 'set up', '')])
+
+    def test_find(self):
+        terms = terminology.Terminology()
+        terms.read(self.write('terms.csv', _CSV))
+        self.assertEqual(len(terms), 4)
+
+        root = flarenode.fromstring('<html><p>Log-in, then E-mail us. Ok or OK?</p>'
+                                    '<p xml:lang="fr-ca">Un courriel\n électronique, log-in.</p></html>')
+        en = root.child('p')
+        fr = en.nextsibling('p')
+        self.assertEqual(terms.find(en), [('Log-in', 'log in'), ('E-mail', 'email'), ('OK', 'OK button')])
+        self.assertEqual(terms.find(fr), [('courriel électronique', 'courriel'), ('log-in', 'log in')])
+        self.assertEqual(terms.find(root), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the TOC model."""
+
+import os
+import tempfile
+import unittest
+
+from flarelint import flarenode
+from flarelint import toc
+
+_TOC = """<CatapultToc>
+  <TocEntry Title="A" Link="/Content/a.htm">
+    <TocEntry Title="B" Link="../../Content/b%20c.htm#top" />
+    <TocEntry Title="C" Link="/Content/a.htm" />
+  </TocEntry>
+  <TocEntry Title="D" Link="http://example.com/" />
+</CatapultToc>"""
+
+class TestToc(unittest.TestCase):
+    """Test the facts about each entry."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, 'Content'))
+        os.makedirs(os.path.join(self.tmp.name, 'Project', 'TOCs'))
+        with open(os.path.join(self.tmp.name, 'Content', 'a.htm'), 'w'):
+            pass
+        self.path = os.path.join(self.tmp.name, 'Project', 'TOCs', 'Main.fltoc')
+        self.entries = [toc.entry(n) for n in flarenode.fromstring(_TOC, path=self.path).iter()
+                        if n.iselement('TocEntry')]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_structure(self):
+        self.assertEqual([e.depth for e in self.entries], [0, 1, 1, 0])
+        self.assertEqual([e.ordinal for e in self.entries], [0, 1, 2, 3])
+        self.assertEqual(self.entries[2].path, ('A', 'C'))
+
+    def test_links(self):
+        content = os.path.join(self.tmp.name, 'Content')
+        self.assertEqual(self.entries[1].target, os.path.join(content, 'b c.htm'))
+        self.assertIsNone(self.entries[3].target)
+        self.assertEqual([e.exists() for e in self.entries], [True, False, True, True])
+        self.assertEqual([e.first for e in self.entries], [True, True, False, True])
+
+    def test_toclevel(self):
+        root = flarenode.fromstring(_TOC)
+        self.assertEqual([n.toclevel() for n in root.iter() if n.iselement('TocEntry')],
+                         [0, 1, 1, 0])
+        self.assertIsNone(toc.entry(root))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# CDDL HEADER START
+#
+# Copyright 2016-2017 Intelerad Medical Systems Incorporated.  All
+# rights reserved.
+#
+# The contents of this file are subject to the terms of the
+# Common Development and Distribution License, Version 1.0 only
+# (the "License").  You may not use this file except in compliance
+# with the License.
+#
+# The full text of the License is in LICENSE.txt.  See the License
+# for the specific language governing permissions and limitations
+# under the License.
+#
+# When distributing Covered Software, include this CDDL HEADER in
+# each file and include LICENSE.txt.  If applicable, add the
+# following below this CDDL HEADER, with the fields enclosed by
+# brackets "[]" replaced with your own identifying information:
+# Portions Copyright [yyyy] [name of copyright owner]
+#
+# CDDL HEADER END
+
+
+"""Tests for the variable index and the phrase matcher."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from flarelint import flarenode
+from flarelint import projectcache
+from flarelint import textmatch
+from flarelint import variables
+
+_SET = """<?xml version="1.0" encoding="utf-8"?>
+<CatapultVariableSet>
+  <Variable Name="Company" EvaluatedDefinition="Acme Widgets">Acme Widgets</Variable>
+  <Variable Name="Short" EvaluatedDefinition="AW">AW</Variable>
+  <Variable Name="Year" Type="DateTime" EvaluatedDefinition="2026">2026</Variable>
+  <Variable Name="Product" EvaluatedDefinition="Widget Pro"></Variable>
+  <Variable Name="Maker" EvaluatedDefinition="Acme Widgets" />
+</CatapultVariableSet>"""
+
+class TestMatcher(unittest.TestCase):
+    """Test finding many phrases at once."""
+
+    def test_finditer(self):
+        m = textmatch.Matcher({'FlareLint': 1, 'Flare Lint': 2, 'Flare': 3, 'C++': 4})
+        self.assertEqual(list(m.finditer('Use FlareLint, Flare\n  Lint, or C++.')),
+                         [(4, 13, 1), (15, 27, 2), (32, 35, 4)])
+        self.assertEqual(list(m.finditer('Flares and FlareLinting')), [])
+        self.assertEqual(m.search('MadCap Flare Lints'), (7, 12, 3))
+
+    def test_case(self):
+        m = textmatch.Matcher({'FlareLint': 1}, casesensitive=False)
+        self.assertEqual(m.search('flarelint'), (0, 9, 1))
+        self.assertIsNone(textmatch.Matcher({'FlareLint': 1}).search('flarelint'))
+        self.assertIsNone(textmatch.Matcher({}).search('text'))
+
+    def test_case_non_ascii(self):
+        m = textmatch.Matcher({'Straße': 1, 'Élan': 2}, casesensitive=False)
+        self.assertEqual(m.search('Die Straße'), (4, 10, 1))
+        self.assertEqual(m.search('DIE STRASSE'), (4, 11, 1))
+        self.assertEqual(m.search('élan'), (0, 4, 2))
+        m = textmatch.Matcher({'Zoë': 1}, True, {'straße': 2})
+        self.assertEqual(list(m.finditer('Zoë, STRASSE, zoë')), [(0, 3, 1), (5, 12, 2)])
+
+class TestVariables(unittest.TestCase):
+    """Test reading variable sets."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.setdir = os.path.join(self.tmp.name, 'Project', 'VariableSets')
+        os.makedirs(self.setdir)
+        self.write('General', _SET)
+
+    def tearDown(self):
+        variables._indexes.forget(self.tmp.name)
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        with open(os.path.join(self.setdir, name + '.flvar'), 'w') as f:
+            f.write(text)
+
+    def test_index(self):
+        index = variables.index(self.tmp.name)
+        self.assertTrue(index.defined('General.Company'))
+        self.assertFalse(index.defined('Company'))
+        self.assertEqual(index.get('General.Product').value, 'Widget Pro')
+        self.assertEqual(len(index), 5)
+
+        m = index.matcher()
+        self.assertEqual(len(m), 2)
+        self.assertEqual(m.search('By Acme Widgets')[2], ['General.Company', 'General.Maker'])
+        self.assertIsNone(m.search('AW in 2026'))
+
+    def test_node(self):
+        topic = os.path.join(self.tmp.name, 'Content', 'a.htm')
+        root = flarenode.fromstring('<p />', path=topic)
+        self.assertIs(variables.of(root), variables.index(self.tmp.name))
+        self.assertIsNone(variables.of(flarenode.fromstring('<p />')))
+        self.assertTrue(variables.of(root).defined('General.Short'))
+
+        self.write('Other', '<CatapultVariableSet><Variable Name="A">Alpha</Variable></CatapultVariableSet>')
+        self.assertFalse(variables.of(root).defined('Other.A'))
+        variables.invalidate()
+        self.assertTrue(variables.of(root).defined('Other.A'))
+        self.assertEqual(variables.of(root).matcher().search('Alpha')[2], ['Other.A'])
+
+    def test_recheck(self):
+        # Without invalidate(), changes show once the last look is old.
+        index = variables.index(self.tmp.name)
+        self.assertFalse(index.defined('Other.A'))
+        self.write('Other', '<CatapultVariableSet><Variable Name="A">Alpha</Variable></CatapultVariableSet>')
+        with mock.patch.object(projectcache, 'RECHECK', 0.0):
+            time.sleep(0.001)
+            self.assertTrue(index.defined('Other.A'))
+
+if __name__ == '__main__':
+    unittest.main()